@@ -132,6 +132,13 @@ def get_arguments() -> argparse.Namespace:
     parser.add_argument(
         "--log-no-color", action="store_true", help="Disable color logs"
     )
+    parser.add_argument(
+        "--setup-timings",
+        metavar="path_to_trace_file",
+        default=None,
+        help="Write the time spent setting up each integration to a file in the"
+        " Chrome trace format",
+    )
     parser.add_argument(
         "--runner",
         action="store_true",
@@ -253,6 +260,7 @@ async def setup_and_run_hass(config_dir: str, args: argparse.Namespace) -> int:
         log_no_color=args.log_no_color,
         skip_pip=args.skip_pip,
         safe_mode=args.safe_mode,
+        setup_timings_file=args.setup_timings,
     )
 
     if hass is None:
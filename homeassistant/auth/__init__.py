@@ -2,6 +2,7 @@
 import asyncio
 from collections import OrderedDict
 from datetime import timedelta
+import hashlib
 import logging
 from typing import Any, Dict, List, Optional, Tuple, cast
 
@@ -20,6 +21,9 @@ from .providers import AuthProvider, LoginFlow, auth_provider_from_config
 EVENT_USER_ADDED = "user_added"
 EVENT_USER_REMOVED = "user_removed"
 
+# Maximum number of validated access tokens to remember
+ACCESS_TOKEN_CACHE_SIZE = 1024
+
 _LOGGER = logging.getLogger(__name__)
 _MfaModuleDict = Dict[str, MultiFactorAuthModule]
 _ProviderKey = Tuple[str, Optional[str]]
@@ -146,6 +150,10 @@ class AuthManager:
         self._providers = providers
         self._mfa_modules = mfa_modules
         self.login_flow = AuthManagerFlowManager(hass, self)
+        # Validated access tokens, token hash -> (refresh token id, expiration)
+        self._access_token_cache: "OrderedDict[str, Tuple[str, float]]" = (
+            OrderedDict()
+        )
 
     @property
     def auth_providers(self) -> List[AuthProvider]:
@@ -278,6 +286,9 @@ class AuthManager:
         if tasks:
             await asyncio.wait(tasks)
 
+        for refresh_token in user.refresh_tokens.values():
+            self._async_invalidate_access_tokens(refresh_token)
+
         await self._store.async_remove_user(user)
 
         self.hass.bus.async_fire(EVENT_USER_REMOVED, {"user_id": user.id})
@@ -431,6 +442,7 @@ class AuthManager:
     ) -> None:
         """Delete a refresh token."""
         await self._store.async_remove_refresh_token(refresh_token)
+        self._async_invalidate_access_tokens(refresh_token)
 
     @callback
     def async_create_access_token(
@@ -454,6 +466,19 @@ class AuthManager:
         self, token: str
     ) -> Optional[models.RefreshToken]:
         """Return refresh token if an access token is valid."""
+        token_hash = hashlib.sha256(token.encode()).hexdigest()
+        cached = self._access_token_cache.get(token_hash)
+
+        if cached is not None:
+            token_id, expiration = cached
+            if dt_util.utcnow().timestamp() < expiration:
+                refresh_token = await self.async_get_refresh_token(token_id)
+                if refresh_token is not None and refresh_token.user.is_active:
+                    self._access_token_cache.move_to_end(token_hash)
+                    return refresh_token
+
+            self._access_token_cache.pop(token_hash, None)
+
         try:
             unverif_claims = jwt.decode(token, verify=False)
         except jwt.InvalidTokenError:
@@ -471,15 +496,31 @@ class AuthManager:
             issuer = refresh_token.id
 
         try:
-            jwt.decode(token, jwt_key, leeway=10, issuer=issuer, algorithms=["HS256"])
+            claims = jwt.decode(
+                token, jwt_key, leeway=10, issuer=issuer, algorithms=["HS256"]
+            )
         except jwt.InvalidTokenError:
             return None
 
         if refresh_token is None or not refresh_token.user.is_active:
             return None
 
+        if "exp" in claims:
+            self._access_token_cache[token_hash] = (refresh_token.id, claims["exp"])
+            if len(self._access_token_cache) > ACCESS_TOKEN_CACHE_SIZE:
+                self._access_token_cache.popitem(last=False)
+
         return refresh_token
 
+    @callback
+    def _async_invalidate_access_tokens(
+        self, refresh_token: models.RefreshToken
+    ) -> None:
+        """Forget the validated access tokens of a refresh token."""
+        for token_hash, (token_id, _) in list(self._access_token_cache.items()):
+            if token_id == refresh_token.id:
+                del self._access_token_cache[token_hash]
+
     @callback
     def _async_get_auth_provider(
         self, credentials: models.Credentials
@@ -2,12 +2,15 @@
 import asyncio
 from collections import OrderedDict
 from datetime import timedelta
+import hashlib
 import hmac
 from logging import getLogger
 from typing import Any, Dict, List, Optional
 
 from homeassistant.auth.const import ACCESS_TOKEN_EXPIRATION
-from homeassistant.core import HomeAssistant, callback
+from homeassistant.core import Event, HomeAssistant, callback
+from homeassistant.helpers.device_registry import EVENT_DEVICE_REGISTRY_UPDATED
+from homeassistant.helpers.entity_registry import EVENT_ENTITY_REGISTRY_UPDATED
 from homeassistant.util import dt as dt_util
 
 from . import models
@@ -37,6 +40,9 @@ class AuthStore:
         self._users: Optional[Dict[str, models.User]] = None
         self._groups: Optional[Dict[str, models.Group]] = None
         self._perm_lookup: Optional[PermissionLookup] = None
+        # Refresh tokens of all users, by id and by the hash of their token
+        self._refresh_tokens: Dict[str, models.RefreshToken] = {}
+        self._refresh_tokens_by_hash: Dict[str, models.RefreshToken] = {}
         self._store = hass.helpers.storage.Store(
             STORAGE_VERSION, STORAGE_KEY, private=True
         )
@@ -141,6 +147,8 @@ class AuthStore:
             assert self._users is not None
 
         self._users.pop(user.id)
+        for refresh_token in user.refresh_tokens.values():
+            self._async_unindex_refresh_token(refresh_token)
         self._async_schedule_save()
 
     async def async_update_user(
@@ -223,6 +231,7 @@ class AuthStore:
 
         refresh_token = models.RefreshToken(**kwargs)
         user.refresh_tokens[refresh_token.id] = refresh_token
+        self._async_index_refresh_token(refresh_token)
 
         self._async_schedule_save()
         return refresh_token
@@ -237,6 +246,7 @@ class AuthStore:
 
         for user in self._users.values():
             if user.refresh_tokens.pop(refresh_token.id, None):
+                self._async_unindex_refresh_token(refresh_token)
                 self._async_schedule_save()
                 break
 
@@ -248,12 +258,7 @@ class AuthStore:
             await self._async_load()
             assert self._users is not None
 
-        for user in self._users.values():
-            refresh_token = user.refresh_tokens.get(token_id)
-            if refresh_token is not None:
-                return refresh_token
-
-        return None
+        return self._refresh_tokens.get(token_id)
 
     async def async_get_refresh_token_by_token(
         self, token: str
@@ -263,15 +268,27 @@ class AuthStore:
             await self._async_load()
             assert self._users is not None
 
-        found = None
+        found = self._refresh_tokens_by_hash.get(_hash_token(token))
 
-        for user in self._users.values():
-            for refresh_token in user.refresh_tokens.values():
-                if hmac.compare_digest(refresh_token.token, token):
-                    found = refresh_token
+        # The hash only narrows down the candidate, the token itself is
+        # still compared in constant time.
+        if found is None or not hmac.compare_digest(found.token, token):
+            return None
 
         return found
 
+    @callback
+    def _async_index_refresh_token(self, refresh_token: models.RefreshToken) -> None:
+        """Add a refresh token to the lookup indexes."""
+        self._refresh_tokens[refresh_token.id] = refresh_token
+        self._refresh_tokens_by_hash[_hash_token(refresh_token.token)] = refresh_token
+
+    @callback
+    def _async_unindex_refresh_token(self, refresh_token: models.RefreshToken) -> None:
+        """Remove a refresh token from the lookup indexes."""
+        self._refresh_tokens.pop(refresh_token.id, None)
+        self._refresh_tokens_by_hash.pop(_hash_token(refresh_token.token), None)
+
     @callback
     def async_log_refresh_token_usage(
         self, refresh_token: models.RefreshToken, remote_ip: Optional[str] = None
@@ -303,6 +320,14 @@ class AuthStore:
 
         self._perm_lookup = perm_lookup = PermissionLookup(ent_reg, dev_reg)
 
+        # Permissions look up areas and devices in the registries
+        self.hass.bus.async_listen(
+            EVENT_ENTITY_REGISTRY_UPDATED, self._async_registry_updated
+        )
+        self.hass.bus.async_listen(
+            EVENT_DEVICE_REGISTRY_UPDATED, self._async_registry_updated
+        )
+
         if data is None:
             self._set_defaults()
             return
@@ -471,10 +496,20 @@ class AuthStore:
                 last_used_ip=rt_dict.get("last_used_ip"),
             )
             users[rt_dict["user_id"]].refresh_tokens[token.id] = token
+            self._async_index_refresh_token(token)
 
         self._groups = groups
         self._users = users
 
+    @callback
+    def _async_registry_updated(self, event: Event) -> None:
+        """Invalidate the permissions of all users."""
+        if self._users is None:
+            return
+
+        for user in self._users.values():
+            user.invalidate_permission_cache()
+
     @callback
     def _async_schedule_save(self) -> None:
         """Save users."""
@@ -568,6 +603,11 @@ class AuthStore:
         self._groups = groups
 
 
+def _hash_token(token: str) -> str:
+    """Return the hash of a token used to index it."""
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
 def _system_admin_group() -> models.Group:
     """Create system admin group."""
     return models.Group(
@@ -1,6 +1,6 @@
 """Permissions for Home Assistant."""
 import logging
-from typing import Any, Callable, Optional
+from typing import Any, Callable, Dict, Optional, Tuple
 
 import voluptuous as vol
 
@@ -52,8 +52,26 @@ class PolicyPermissions(AbstractPermissions):
         return test_all(self._policy.get(CAT_ENTITIES), key)
 
     def _entity_func(self) -> Callable[[str, str], bool]:
-        """Return a function that can test entity access."""
-        return compile_entities(self._policy.get(CAT_ENTITIES), self._perm_lookup)
+        """Return a function that can test entity access.
+
+        Results are remembered for the lifetime of this object, it is
+        replaced when the policy or the registries change.
+        """
+        entity_func = compile_entities(
+            self._policy.get(CAT_ENTITIES), self._perm_lookup
+        )
+        results: Dict[Tuple[str, str], bool] = {}
+
+        def check_entity(entity_id: str, key: str) -> bool:
+            """Test entity access, remembering the result."""
+            result = results.get((entity_id, key))
+
+            if result is None:
+                result = results[(entity_id, key)] = entity_func(entity_id, key)
+
+            return result
+
+        return check_entity
 
     def __eq__(self, other: Any) -> bool:
         """Equals check."""
@@ -20,7 +20,14 @@ from homeassistant.const import (
 )
 from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers.typing import ConfigType
-from homeassistant.setup import DATA_SETUP, DATA_SETUP_STARTED, async_setup_component
+from homeassistant.setup import (
+    DATA_SETUP,
+    DATA_SETUP_STARTED,
+    async_get_setup_timings,
+    async_get_setup_trace,
+    async_setup_component,
+)
+from homeassistant.util.json import save_json
 from homeassistant.util.logging import async_activate_log_queue_handler
 from homeassistant.util.package import async_get_user_site, is_virtual_env
 from homeassistant.util.yaml import clear_secret_cache
@@ -56,8 +63,13 @@ async def async_setup_hass(
     log_no_color: bool,
     skip_pip: bool,
     safe_mode: bool,
+    setup_timings_file: Optional[str] = None,
 ) -> Optional[core.HomeAssistant]:
-    """Set up Home Assistant."""
+    """Set up Home Assistant.
+
+    If setup_timings_file is given, the time spent setting up each
+    integration is written to it in the Chrome trace format.
+    """
     hass = core.HomeAssistant()
     hass.config.config_dir = config_dir
 
@@ -131,6 +143,18 @@ async def async_setup_hass(
             {"safe_mode": {}, "http": http_conf}, hass,
         )
 
+    if setup_timings_file is not None:
+        data = {
+            "traceEvents": async_get_setup_trace(hass),
+            "integrations": async_get_setup_timings(hass),
+        }
+        try:
+            await hass.async_add_executor_job(save_json, setup_timings_file, data)
+        except HomeAssistantError as err:
+            _LOGGER.error("Unable to write setup timings: %s", err)
+        else:
+            _LOGGER.info("Wrote setup timings to %s", setup_timings_file)
+
     return hass
 
 
@@ -7,6 +7,8 @@ import aiohttp
 import async_timeout
 
 from homeassistant.const import MATCH_ALL, STATE_ON
+from homeassistant.core import callback
+from homeassistant.helpers.event import async_call_later
 import homeassistant.util.dt as dt_util
 
 from .const import API_CHANGE, Cause
@@ -16,20 +18,58 @@ from .messages import AlexaResponse
 _LOGGER = logging.getLogger(__name__)
 DEFAULT_TIMEOUT = 10
 
+# Seconds to collect state changes before reporting them
+REPORT_STATE_WINDOW = 1
+
 
 async def async_enable_proactive_mode(hass, smart_home_config):
     """Enable the proactive mode.
 
     Proactive mode makes this component report state changes to Alexa.
+    Changes are collected for REPORT_STATE_WINDOW seconds and only the last
+    state of each entity is reported, if its properties changed.
     """
     # Validate we can get access token.
     await smart_home_config.async_get_access_token()
 
-    async def async_entity_state_listener(changed_entity, old_state, new_state):
+    reported = {}
+    pending = {}
+    unsub_pending = None
+
+    async def report_pending(_now):
+        """Report the entities that changed during the window."""
+        nonlocal unsub_pending
+        unsub_pending = None
+        entities = list(pending.values())
+        pending.clear()
+
+        jobs = []
+        for alexa_entity in entities:
+            properties = list(alexa_entity.serialize_properties())
+            values = _property_values(properties)
+            if reported.get(alexa_entity.entity_id) == values:
+                continue
+
+            reported[alexa_entity.entity_id] = values
+            jobs.append(
+                async_send_changereport_message(
+                    hass, smart_home_config, alexa_entity, properties=properties
+                )
+            )
+
+        if jobs:
+            await asyncio.gather(*jobs)
+
+    @callback
+    def async_entity_state_listener(changed_entity, old_state, new_state):
+        nonlocal unsub_pending
+
         if not hass.is_running:
             return
 
         if not new_state:
+            reported.pop(changed_entity, None)
+            pending.pop(changed_entity, None)
             return
 
         if new_state.domain not in ENTITY_ADAPTERS:
@@ -45,29 +85,52 @@ async def async_enable_proactive_mode(hass, smart_home_config):
 
         for interface in alexa_changed_entity.interfaces():
             if interface.properties_proactively_reported():
-                await async_send_changereport_message(
-                    hass, smart_home_config, alexa_changed_entity
-                )
+                pending[changed_entity] = alexa_changed_entity
+                if unsub_pending is None:
+                    unsub_pending = async_call_later(
+                        hass, REPORT_STATE_WINDOW, report_pending
+                    )
                 return
             if (
                 interface.name() == "Alexa.DoorbellEventSource"
                 and new_state.state == STATE_ON
             ):
-                await async_send_doorbell_event_message(
-                    hass, smart_home_config, alexa_changed_entity
+                hass.async_create_task(
+                    async_send_doorbell_event_message(
+                        hass, smart_home_config, alexa_changed_entity
+                    )
                 )
                 return
 
-    return hass.helpers.event.async_track_state_change(
+    unsub_state_change = hass.helpers.event.async_track_state_change(
         MATCH_ALL, async_entity_state_listener
     )
 
+    @callback
+    def unsub():
+        """Stop reporting state."""
+        unsub_state_change()
+        if unsub_pending is not None:
+            unsub_pending()
+
+    return unsub
+
+
+def _property_values(properties):
+    """Return the values of serialized properties without the sample time."""
+    return [
+        (prop["namespace"], prop["name"], prop.get("instance"), prop["value"])
+        for prop in properties
+    ]
+
 
 async def async_send_changereport_message(
-    hass, config, alexa_entity, *, invalidate_access_token=True
+    hass, config, alexa_entity, *, invalidate_access_token=True, properties=None
 ):
     """Send a ChangeReport message for an Alexa entity.
 
+    Properties that were already serialized can be passed in.
+
     https://developer.amazon.com/docs/smarthome/state-reporting-for-a-smart-home-skill.html#report-state-with-changereport-events
     """
     token = await config.async_get_access_token()
@@ -79,7 +142,8 @@ async def async_send_changereport_message(
     # this sends all the properties of the Alexa Entity, whether they have
     # changed or not. this should be improved, and properties that have not
     # changed should be moved to the 'context' object
-    properties = list(alexa_entity.serialize_properties())
+    if properties is None:
+        properties = list(alexa_entity.serialize_properties())
 
     payload = {
         API_CHANGE: {"cause": {"type": Cause.APP_INTERACTION}, "properties": properties}
@@ -120,7 +184,11 @@ async def async_send_changereport_message(
     ):
         config.async_invalidate_access_token()
         return await async_send_changereport_message(
-            hass, config, alexa_entity, invalidate_access_token=False
+            hass,
+            config,
+            alexa_entity,
+            invalidate_access_token=False,
+            properties=properties,
         )
 
     _LOGGER.error(
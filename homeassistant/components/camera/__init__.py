@@ -7,6 +7,7 @@ from datetime import timedelta
 import hashlib
 import logging
 from random import SystemRandom
+from time import monotonic
 
 from aiohttp import web
 import async_timeout
@@ -78,12 +79,14 @@ SUPPORT_ON_OFF = 1
 SUPPORT_STREAM = 2
 
 DEFAULT_CONTENT_TYPE = "image/jpeg"
+MJPEG_CONTENT_TYPE = "multipart/x-mixed-replace; boundary=--frameboundary"
 ENTITY_IMAGE_URL = "/api/camera_proxy/{0}?token={1}"
 
 TOKEN_CHANGE_INTERVAL = timedelta(minutes=5)
 _RND = SystemRandom()
 
 MIN_STREAM_INTERVAL = 0.5  # seconds
+MAX_FRAME_CACHE_TTL = 10  # seconds
 
 CAMERA_SERVICE_SCHEMA = vol.Schema({vol.Optional(ATTR_ENTITY_ID): cv.comp_entity_ids})
 
@@ -153,7 +156,7 @@ async def async_get_image(hass, entity_id, timeout=10):
 
     with suppress(asyncio.CancelledError, asyncio.TimeoutError):
         async with async_timeout.timeout(timeout):
-            image = await camera.async_camera_image()
+            image = await camera.async_cached_camera_image()
 
             if image:
                 return Image(camera.content_type, image)
@@ -183,21 +186,12 @@ async def async_get_still_stream(request, image_cb, content_type, interval):
     This method must be run in the event loop.
     """
     response = web.StreamResponse()
-    response.content_type = "multipart/x-mixed-replace; boundary=--frameboundary"
+    response.content_type = MJPEG_CONTENT_TYPE
     await response.prepare(request)
 
     async def write_to_mjpeg_stream(img_bytes):
         """Write image to stream."""
-        await response.write(
-            bytes(
-                "--frameboundary\r\n"
-                "Content-Type: {}\r\n"
-                "Content-Length: {}\r\n\r\n".format(content_type, len(img_bytes)),
-                "utf-8",
-            )
-            + img_bytes
-            + b"\r\n"
-        )
+        await response.write(_mjpeg_frame(content_type, img_bytes))
 
     last_image = None
 
@@ -220,6 +214,143 @@ async def async_get_still_stream(request, image_cb, content_type, interval):
     return response
 
 
+def _mjpeg_frame(content_type, img_bytes):
+    """Return an image encoded as a frame of an MJPEG stream."""
+    return (
+        bytes(
+            "--frameboundary\r\n"
+            "Content-Type: {}\r\n"
+            "Content-Length: {}\r\n\r\n".format(content_type, len(img_bytes)),
+            "utf-8",
+        )
+        + img_bytes
+        + b"\r\n"
+    )
+
+
+class FrameCache:
+    """Share the images of a camera between concurrent and recent requests.
+
+    Requests made while an image is fetched wait for that image. Requests
+    made within the frame cache TTL of the camera get the last image.
+    """
+
+    def __init__(self, camera):
+        """Initialize the frame cache."""
+        self._camera = camera
+        self._image = None
+        self._fetched = 0.0
+        self._pending = None
+
+    async def async_get(self):
+        """Return an image of the camera."""
+        if (
+            self._image is not None
+            and monotonic() - self._fetched < self._camera.frame_cache_ttl
+        ):
+            return self._image
+
+        if self._pending is None:
+            self._pending = self._camera.hass.async_create_task(self._async_fetch())
+
+        # A waiter that times out must not cancel the fetch of the others
+        return await asyncio.shield(self._pending)
+
+    async def _async_fetch(self):
+        """Fetch an image from the camera."""
+        try:
+            image = await self._camera.async_camera_image()
+        finally:
+            self._pending = None
+
+        self._image = image
+        self._fetched = monotonic()
+        return image
+
+
+class MjpegBroadcaster:
+    """Write the images of a camera to several MJPEG streams.
+
+    Images are fetched once per interval as long as there are clients, and
+    each new image is encoded once for all of them. A client that is slow
+    to write skips to the latest frame.
+    """
+
+    def __init__(self, image_cb, content_type, interval):
+        """Initialize the broadcaster."""
+        self._image_cb = image_cb
+        self._content_type = content_type
+        self._interval = interval
+        self._condition = asyncio.Condition()
+        self._frame = None
+        self._clients = 0
+        self._task = None
+        self.finished = False
+
+    async def async_stream(self, request):
+        """Stream the frames to a client until it or the camera stops."""
+        self._clients += 1
+        if self._task is None:
+            self._task = request.app["hass"].async_create_task(
+                self._async_fetch_frames()
+            )
+
+        last_frame = None
+
+        def has_new_frame():
+            """Return if there is a frame the client has not seen."""
+            return self.finished or self._frame is not last_frame
+
+        try:
+            response = web.StreamResponse()
+            response.content_type = MJPEG_CONTENT_TYPE
+            await response.prepare(request)
+
+            while True:
+                async with self._condition:
+                    await self._condition.wait_for(has_new_frame)
+
+                if self.finished:
+                    break
+
+                frame = self._frame
+                await response.write(frame)
+
+                # Chrome seems to always ignore first picture,
+                # print it twice.
+                if last_frame is None:
+                    await response.write(frame)
+                last_frame = frame
+        finally:
+            self._clients -= 1
+
+        return response
+
+    async def _async_fetch_frames(self):
+        """Fetch images until the camera stops or there are no clients."""
+        last_image = None
+
+        try:
+            while self._clients:
+                img_bytes = await self._image_cb()
+                if not img_bytes:
+                    break
+
+                if img_bytes != last_image:
+                    async with self._condition:
+                        self._frame = _mjpeg_frame(self._content_type, img_bytes)
+                        self._condition.notify_all()
+                    last_image = img_bytes
+
+                await asyncio.sleep(self._interval)
+        except Exception:  # pylint: disable=broad-except
+            _LOGGER.exception("Error fetching images of the MJPEG stream")
+
+        self.finished = True
+        async with self._condition:
+            self._condition.notify_all()
+
+
 def _get_camera_from_entity_id(hass, entity_id):
     """Get camera component from entity_id."""
     component = hass.data.get(DOMAIN)
@@ -324,6 +455,9 @@ async def async_unload_entry(hass, entry):
 class Camera(Entity):
     """The base class for camera entities."""
 
+    _frame_cache = None
+    _mjpeg_broadcasters = None
+
     def __init__(self):
         """Initialize a camera."""
         self.is_streaming = False
@@ -372,6 +506,14 @@ class Camera(Entity):
         """Return the interval between frames of the mjpeg stream."""
         return 0.5
 
+    @property
+    def frame_cache_ttl(self):
+        """Return the seconds an image is shared with later requests."""
+        prefs = self.hass.data.get(DATA_CAMERA_PREFS)
+        if prefs is None:
+            return 0
+        return prefs.get(self.entity_id).frame_cache_ttl
+
     async def stream_source(self):
         """Return the source of the stream."""
         return None
@@ -384,11 +526,33 @@ class Camera(Entity):
         """Return bytes of camera image."""
         return await self.hass.async_add_executor_job(self.camera_image)
 
+    async def async_cached_camera_image(self):
+        """Return bytes of camera image, shared with other requests."""
+        if self._frame_cache is None:
+            self._frame_cache = FrameCache(self)
+        return await self._frame_cache.async_get()
+
     async def handle_async_still_stream(self, request, interval):
-        """Generate an HTTP MJPEG stream from camera images."""
-        return await async_get_still_stream(
-            request, self.async_camera_image, self.content_type, interval
-        )
+        """Generate an HTTP MJPEG stream from camera images.
+
+        Streams with the same interval share the images and their frames.
+        """
+        if self._mjpeg_broadcasters is None:
+            self._mjpeg_broadcasters = {}
+
+        broadcaster = self._mjpeg_broadcasters.get(interval)
+        if broadcaster is None or broadcaster.finished:
+            broadcaster = self._mjpeg_broadcasters[interval] = MjpegBroadcaster(
+                self.async_cached_camera_image, self.content_type, interval
+            )
+
+        try:
+            return await broadcaster.async_stream(request)
+        finally:
+            if broadcaster.finished and (
+                self._mjpeg_broadcasters.get(interval) is broadcaster
+            ):
+                del self._mjpeg_broadcasters[interval]
 
     async def handle_async_mjpeg_stream(self, request):
         """Serve an HTTP MJPEG stream from the camera.
@@ -513,7 +677,7 @@ class CameraImageView(CameraView):
         """Serve camera image."""
         with suppress(asyncio.CancelledError, asyncio.TimeoutError):
             async with async_timeout.timeout(10):
-                image = await camera.async_camera_image()
+                image = await camera.async_cached_camera_image()
 
             if image:
                 return web.Response(body=image, content_type=camera.content_type)
@@ -628,6 +792,9 @@ async def websocket_get_prefs(hass, connection, msg):
         vol.Required("type"): "camera/update_prefs",
         vol.Required("entity_id"): cv.entity_id,
         vol.Optional("preload_stream"): bool,
+        vol.Optional("frame_cache_ttl"): vol.All(
+            vol.Coerce(float), vol.Range(min=0, max=MAX_FRAME_CACHE_TTL)
+        ),
     }
 )
 async def websocket_update_prefs(hass, connection, msg):
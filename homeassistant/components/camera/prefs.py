@@ -1,5 +1,5 @@
 """Preference management for camera component."""
-from .const import DOMAIN, PREF_PRELOAD_STREAM
+from .const import DOMAIN, PREF_FRAME_CACHE_TTL, PREF_PRELOAD_STREAM
 
 # mypy: allow-untyped-defs, no-check-untyped-defs
 
@@ -24,6 +24,11 @@ class CameraEntityPreferences:
         """Return if stream is loaded on hass start."""
         return self._prefs.get(PREF_PRELOAD_STREAM, False)
 
+    @property
+    def frame_cache_ttl(self):
+        """Return the seconds an image is shared with later requests."""
+        return self._prefs.get(PREF_FRAME_CACHE_TTL, 0)
+
 
 class CameraPreferences:
     """Handle camera preferences."""
@@ -44,13 +49,21 @@ class CameraPreferences:
         self._prefs = prefs
 
     async def async_update(
-        self, entity_id, *, preload_stream=_UNDEF, stream_options=_UNDEF
+        self,
+        entity_id,
+        *,
+        preload_stream=_UNDEF,
+        frame_cache_ttl=_UNDEF,
+        stream_options=_UNDEF,
     ):
         """Update camera preferences."""
         if not self._prefs.get(entity_id):
             self._prefs[entity_id] = {}
 
-        for key, value in ((PREF_PRELOAD_STREAM, preload_stream),):
+        for key, value in (
+            (PREF_PRELOAD_STREAM, preload_stream),
+            (PREF_FRAME_CACHE_TTL, frame_cache_ttl),
+        ):
             if value is not _UNDEF:
                 self._prefs[entity_id][key] = value
 
@@ -1,8 +1,9 @@
 """Google Report State implementation."""
 import logging
+from typing import Dict, Optional
 
 from homeassistant.const import MATCH_ALL
-from homeassistant.core import HomeAssistant, callback
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
 from homeassistant.helpers.event import async_call_later
 
 from .error import SmartHomeError
@@ -12,19 +13,46 @@ from .helpers import AbstractConfig, GoogleEntity, async_get_entities
 # https://github.com/actions-on-google/smart-home-nodejs/issues/196#issuecomment-439156639
 INITIAL_REPORT_DELAY = 60
 
+# Seconds to collect state changes before reporting them together
+REPORT_STATE_WINDOW = 1
+
 
 _LOGGER = logging.getLogger(__name__)
 
 
 @callback
 def async_enable_report_state(hass: HomeAssistant, google_config: AbstractConfig):
-    """Enable state reporting."""
+    """Enable state reporting.
+
+    Changes are collected for REPORT_STATE_WINDOW seconds and reported
+    together, with only the last state of each entity. The last reported
+    state of each entity is kept to skip changes Google does not care about.
+    """
+    reported: Dict[str, dict] = {}
+    pending: Dict[str, dict] = {}
+    unsub_pending: Optional[CALLBACK_TYPE] = None
+
+    async def report_pending(_now):
+        """Report the states that changed during the window."""
+        nonlocal unsub_pending
+        unsub_pending = None
+        states = dict(pending)
+        pending.clear()
+        reported.update(states)
+
+        _LOGGER.debug("Reporting states: %s", states)
+        await google_config.async_report_state_all({"devices": {"states": states}})
+
+    @callback
+    def async_entity_state_listener(changed_entity, old_state, new_state):
+        nonlocal unsub_pending
 
-    async def async_entity_state_listener(changed_entity, old_state, new_state):
         if not hass.is_running:
             return
 
         if not new_state:
+            reported.pop(changed_entity, None)
+            pending.pop(changed_entity, None)
             return
 
         if not google_config.should_expose(new_state):
@@ -41,18 +69,23 @@ def async_enable_report_state(hass: HomeAssistant, google_config: AbstractConfig
             _LOGGER.debug("Not reporting state for %s: %s", changed_entity, err.code)
             return
 
-        if old_state:
-            old_entity = GoogleEntity(hass, google_config, old_state)
+        if changed_entity not in reported and old_state:
+            try:
+                reported[changed_entity] = GoogleEntity(
+                    hass, google_config, old_state
+                ).query_serialize()
+            except SmartHomeError:
+                pass
 
-            # Only report to Google if data that Google cares about has changed
-            if entity_data == old_entity.query_serialize():
-                return
+        # Only report to Google if data that Google cares about has changed
+        if entity_data == reported.get(changed_entity):
+            pending.pop(changed_entity, None)
+            return
 
-        _LOGGER.debug("Reporting state for %s: %s", changed_entity, entity_data)
+        pending[changed_entity] = entity_data
 
-        await google_config.async_report_state_all(
-            {"devices": {"states": {changed_entity: entity_data}}}
-        )
+        if unsub_pending is None:
+            unsub_pending = async_call_later(hass, REPORT_STATE_WINDOW, report_pending)
 
     async def inital_report(_now):
         """Report initially all states."""
@@ -67,10 +100,20 @@ def async_enable_report_state(hass: HomeAssistant, google_config: AbstractConfig
             except SmartHomeError:
                 continue
 
+        reported.update(entities)
         await google_config.async_report_state_all({"devices": {"states": entities}})
 
     async_call_later(hass, INITIAL_REPORT_DELAY, inital_report)
 
-    return hass.helpers.event.async_track_state_change(
+    unsub_state_change = hass.helpers.event.async_track_state_change(
         MATCH_ALL, async_entity_state_listener
     )
+
+    @callback
+    def unsub():
+        """Stop reporting state."""
+        unsub_state_change()
+        if unsub_pending is not None:
+            unsub_pending()
+
+    return unsub
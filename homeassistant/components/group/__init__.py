@@ -1,7 +1,8 @@
 """Provide the functionality to group entities."""
 import asyncio
+from collections import Counter
 import logging
-from typing import Any, Iterable, List, Optional, cast
+from typing import Any, Dict, Iterable, List, Optional, cast
 
 import voluptuous as vol
 
@@ -55,6 +56,9 @@ ATTR_ALL = "all"
 SERVICE_SET = "set"
 SERVICE_REMOVE = "remove"
 
+# Index of the groups tracking each entity, entity_id -> {group entity_id: None}
+DATA_ENTITY_GROUPS = "group_entity_groups"
+
 _LOGGER = logging.getLogger(__name__)
 
 
@@ -185,16 +189,9 @@ def groups_with_entity(hass: HomeAssistantType, entity_id: str) -> List[str]:
 
     Async friendly.
     """
-    if DOMAIN not in hass.data:
-        return []
-
-    groups = []
+    index: Dict[str, Dict[str, None]] = hass.data.get(DATA_ENTITY_GROUPS, {})
 
-    for group in hass.data[DOMAIN].entities:
-        if entity_id in group.tracking:
-            groups.append(group.entity_id)
-
-    return groups
+    return list(index.get(entity_id, ()))
 
 
 async def async_setup(hass, config):
@@ -374,6 +371,11 @@ class Group(Entity):
         self._order = order
         self._assumed_state = False
         self._async_unsub_state_changed = None
+        # Current state and assumed state of the members that have a state
+        self._member_states: Dict[str, str] = {}
+        self._member_assumed: Dict[str, bool] = {}
+        self._state_counts: Counter = Counter()
+        self._assumed_count = 0
 
     @staticmethod
     def create_group(
@@ -503,18 +505,42 @@ class Group(Entity):
                 self.hass, self.tracking, self._async_state_changed_listener
             )
 
+            index = self.hass.data.setdefault(DATA_ENTITY_GROUPS, {})
+            for entity_id in self.tracking:
+                index.setdefault(entity_id, {})[self.entity_id] = None
+
+            # Catch up with changes made before the members were tracked
+            self._async_reset_member_states()
+
     async def async_stop(self):
         """Unregister the group from Home Assistant.
 
         This method must be run in the event loop.
         """
-        if self._async_unsub_state_changed:
-            self._async_unsub_state_changed()
-            self._async_unsub_state_changed = None
+        self._async_stop()
+
+    @callback
+    def _async_stop(self):
+        """Stop tracking members."""
+        if self._async_unsub_state_changed is None:
+            return
+
+        self._async_unsub_state_changed()
+        self._async_unsub_state_changed = None
+
+        index = self.hass.data.get(DATA_ENTITY_GROUPS, {})
+        for entity_id in self.tracking:
+            groups = index.get(entity_id)
+            if groups is None:
+                continue
+            groups.pop(self.entity_id, None)
+            if not groups:
+                del index[entity_id]
 
     async def async_update(self):
         """Query all members and determine current group state."""
         self._state = STATE_UNKNOWN
+        self._async_reset_member_states()
         self._async_update_group_state()
 
     async def async_added_to_hass(self):
@@ -524,11 +550,10 @@ class Group(Entity):
 
     async def async_will_remove_from_hass(self):
         """Handle removal from Home Assistant."""
-        if self._async_unsub_state_changed:
-            self._async_unsub_state_changed()
-            self._async_unsub_state_changed = None
+        self._async_stop()
 
-    async def _async_state_changed_listener(self, entity_id, old_state, new_state):
+    @callback
+    def _async_state_changed_listener(self, entity_id, old_state, new_state):
         """Respond to a member state changing.
 
         This method must be run in the event loop.
@@ -537,21 +562,45 @@ class Group(Entity):
         if self._async_unsub_state_changed is None:
             return
 
+        self._async_set_member_state(entity_id, new_state)
         self._async_update_group_state(new_state)
         self.async_write_ha_state()
 
-    @property
-    def _tracking_states(self):
-        """Return the states that the group is tracking."""
-        states = []
+    @callback
+    def _async_reset_member_states(self):
+        """Count the states of all members."""
+        self._member_states.clear()
+        self._member_assumed.clear()
+        self._state_counts.clear()
+        self._assumed_count = 0
 
         for entity_id in self.tracking:
-            state = self.hass.states.get(entity_id)
+            self._async_set_member_state(entity_id, self.hass.states.get(entity_id))
 
-            if state is not None:
-                states.append(state)
+    @callback
+    def _async_set_member_state(self, entity_id, state):
+        """Update the counters with the new state of a member."""
+        old_state = self._member_states.pop(entity_id, None)
+        if old_state is not None:
+            self._state_counts[old_state] -= 1
+            if self._member_assumed.pop(entity_id):
+                self._assumed_count -= 1
+
+        if state is None:
+            return
+
+        assumed = bool(state.attributes.get(ATTR_ASSUMED_STATE))
+        self._member_states[entity_id] = state.state
+        self._member_assumed[entity_id] = assumed
+        self._state_counts[state.state] += 1
+        if assumed:
+            self._assumed_count += 1
 
-        return states
+    def _mode_matches(self, count):
+        """Return if the mode holds when count members match."""
+        if self.mode is all:
+            return count == len(self._member_states)
+        return count > 0
 
     @callback
     def _async_update_group_state(self, tr_state=None):
@@ -562,8 +611,6 @@ class Group(Entity):
 
         This method must be run in the event loop.
         """
-        # To store current states of group entities. Might not be needed.
-        states = None
         gr_state = self._state
         gr_on = self.group_on
         gr_off = self.group_off
@@ -571,10 +618,11 @@ class Group(Entity):
         # We have not determined type of group yet
         if gr_on is None:
             if tr_state is None:
-                states = self._tracking_states
+                for entity_id in self.tracking:
+                    if entity_id not in self._member_states:
+                        continue
 
-                for state in states:
-                    gr_on, gr_off = _get_group_on_off(state.state)
+                    gr_on, gr_off = _get_group_on_off(self._member_states[entity_id])
                     if gr_on is not None:
                         break
             else:
@@ -592,10 +640,7 @@ class Group(Entity):
             or (gr_state == gr_off and tr_state.state == gr_on)
             or tr_state.state not in (gr_on, gr_off)
         ):
-            if states is None:
-                states = self._tracking_states
-
-            if self.mode(state.state == gr_on for state in states):
+            if self._mode_matches(self._state_counts[gr_on]):
                 self._state = gr_on
             else:
                 self._state = gr_off
@@ -608,12 +653,7 @@ class Group(Entity):
             or self._assumed_state
             and not tr_state.attributes.get(ATTR_ASSUMED_STATE)
         ):
-            if states is None:
-                states = self._tracking_states
-
-            self._assumed_state = self.mode(
-                state.attributes.get(ATTR_ASSUMED_STATE) for state in states
-            )
+            self._assumed_state = self._mode_matches(self._assumed_count)
 
         elif tr_state.attributes.get(ATTR_ASSUMED_STATE):
             self._assumed_state = True
@@ -1,29 +1,50 @@
 """Provide pre-made queries on top of the recorder component."""
+import asyncio
 from collections import defaultdict
+import concurrent.futures
 from datetime import timedelta
 from itertools import groupby
+import json
 import logging
 import time
 from typing import Optional, cast
 
 from aiohttp import web
+from aiohttp.hdrs import CONTENT_TYPE
 from sqlalchemy import and_, func
+from sqlalchemy.orm import contains_eager
 import voluptuous as vol
 
 from homeassistant.components import recorder
 from homeassistant.components.http import HomeAssistantView
-from homeassistant.components.recorder.models import DB_TIMEZONE, States
+from homeassistant.components.recorder.aggregate import (
+    HOUR,
+    Bucket,
+    BucketAggregator,
+    compiled_hours,
+    state_to_float,
+)
+from homeassistant.components.recorder.models import (
+    DB_TIMEZONE,
+    StateAttributes,
+    States,
+    StatesHourly,
+    process_timestamp,
+)
 from homeassistant.components.recorder.util import execute, session_scope
 from homeassistant.const import (
+    ATTR_ENTITY_ID,
     ATTR_HIDDEN,
     CONF_DOMAINS,
     CONF_ENTITIES,
     CONF_EXCLUDE,
     CONF_INCLUDE,
+    CONTENT_TYPE_JSON,
     HTTP_BAD_REQUEST,
 )
 from homeassistant.core import split_entity_id
 import homeassistant.helpers.config_validation as cv
+from homeassistant.helpers.json import JSONEncoder
 import homeassistant.util.dt as dt_util
 
 # mypy: allow-untyped-defs, no-check-untyped-defs
@@ -35,6 +56,13 @@ CONF_ORDER = "use_include_order"
 
 STATE_KEY = "state"
 LAST_CHANGED_KEY = "last_changed"
+ATTRIBUTES_KEY = "attributes"
+
+# Shortest period history can be aggregated by
+MIN_AGGREGATE_PERIOD = timedelta(minutes=1)
+
+# Number of rows fetched from the database at once when streaming
+STREAM_ROWS_PER_FETCH = 1000
 
 CONFIG_SCHEMA = vol.Schema(
     {
@@ -52,6 +80,17 @@ SCRIPT_DOMAIN = "script"
 ATTR_CAN_CANCEL = "can_cancel"
 
 
+def _query_states(session):
+    """Query states together with their shared attributes."""
+    return (
+        session.query(States)
+        .outerjoin(
+            StateAttributes, States.attributes_id == StateAttributes.attributes_id
+        )
+        .options(contains_eager(States.state_attributes))
+    )
+
+
 def get_significant_states(hass, *args, **kwargs):
     """Wrap _get_significant_states with a sql session."""
     with session_scope(hass=hass) as session:
@@ -78,24 +117,9 @@ def _get_significant_states(
     """
     timer_start = time.perf_counter()
 
-    if significant_changes_only:
-        query = session.query(States).filter(
-            (
-                States.domain.in_(SIGNIFICANT_DOMAINS)
-                | (States.last_changed == States.last_updated)
-            )
-            & (States.last_updated > start_time)
-        )
-    else:
-        query = session.query(States).filter(States.last_updated > start_time)
-
-    if filters:
-        query = filters.apply(query, entity_ids)
-
-    if end_time is not None:
-        query = query.filter(States.last_updated < end_time)
-
-    query = query.order_by(States.entity_id, States.last_updated)
+    query = _significant_states_query(
+        session, start_time, end_time, entity_ids, filters, significant_changes_only
+    )
 
     states = execute(query, to_native=False)
 
@@ -115,11 +139,73 @@ def _get_significant_states(
     )
 
 
+def _stream_significant_states(
+    hass,
+    session,
+    start_time,
+    end_time=None,
+    entity_ids=None,
+    filters=None,
+    include_start_time_state=True,
+    significant_changes_only=True,
+    minimal_response=False,
+):
+    """Yield the list of significant states of one entity at a time.
+
+    Rows are fetched from the database in pages of STREAM_ROWS_PER_FETCH, so
+    only the states of the entity that is being yielded are in memory.
+    """
+    query = _significant_states_query(
+        session, start_time, end_time, entity_ids, filters, significant_changes_only
+    )
+
+    start_time_states = {}
+    if include_start_time_state:
+        for state in _get_start_time_states(
+            hass, session, start_time, entity_ids, filters
+        ):
+            start_time_states[state.entity_id] = [state]
+
+    for ent_id, group in groupby(
+        query.yield_per(STREAM_ROWS_PER_FETCH), lambda state: state.entity_id
+    ):
+        ent_results = start_time_states.pop(ent_id, [])
+        _append_entity_states(ent_id, group, ent_results, minimal_response)
+        if ent_results:
+            yield ent_results
+
+    yield from start_time_states.values()
+
+
+def _significant_states_query(
+    session, start_time, end_time, entity_ids, filters, significant_changes_only
+):
+    """Return a query for significant states sorted by entity and time."""
+    if significant_changes_only:
+        query = _query_states(session).filter(
+            (
+                States.domain.in_(SIGNIFICANT_DOMAINS)
+                | (States.last_changed == States.last_updated)
+            )
+            & (States.last_updated > start_time)
+        )
+    else:
+        query = _query_states(session).filter(States.last_updated > start_time)
+
+    if filters:
+        query = filters.apply(query, entity_ids)
+
+    if end_time is not None:
+        query = query.filter(States.last_updated < end_time)
+
+    return query.order_by(States.entity_id, States.last_updated)
+
+
 def state_changes_during_period(hass, start_time, end_time=None, entity_id=None):
     """Return states changes during UTC period start_time - end_time."""
 
     with session_scope(hass=hass) as session:
-        query = session.query(States).filter(
+        query = _query_states(session).filter(
             (States.last_changed == States.last_updated)
             & (States.last_updated > start_time)
         )
@@ -128,7 +214,7 @@ def state_changes_during_period(hass, start_time, end_time=None, entity_id=None)
             query = query.filter(States.last_updated < end_time)
 
         if entity_id is not None:
-            query = query.filter_by(entity_id=entity_id.lower())
+            query = query.filter(States.entity_id == entity_id.lower())
 
         entity_ids = [entity_id] if entity_id is not None else None
 
@@ -145,10 +231,12 @@ def get_last_state_changes(hass, number_of_states, entity_id):
     start_time = dt_util.utcnow()
 
     with session_scope(hass=hass) as session:
-        query = session.query(States).filter(States.last_changed == States.last_updated)
+        query = _query_states(session).filter(
+            States.last_changed == States.last_updated
+        )
 
         if entity_id is not None:
-            query = query.filter_by(entity_id=entity_id.lower())
+            query = query.filter(States.entity_id == entity_id.lower())
 
         entity_ids = [entity_id] if entity_id is not None else None
 
@@ -196,7 +284,7 @@ def _get_states_with_session(
         if run is None:
             return []
 
-    query = session.query(States)
+    query = _query_states(session)
 
     if entity_ids and len(entity_ids) == 1:
         # Use an entirely different (and extremely fast) query if we only
@@ -292,12 +380,9 @@ def _sorted_states_to_json(
     # Get the states at the start time
     timer_start = time.perf_counter()
     if include_start_time_state:
-        run = recorder.run_information_from_instance(hass, start_time)
-        for state in _get_states_with_session(
-            session, start_time, entity_ids, run=run, filters=filters
+        for state in _get_start_time_states(
+            hass, session, start_time, entity_ids, filters
         ):
-            state.last_changed = start_time
-            state.last_updated = start_time
             result[state.entity_id].append(state)
 
     if _LOGGER.isEnabledFor(logging.DEBUG):
@@ -306,64 +391,250 @@ def _sorted_states_to_json(
 
     # Append all changes to it
     for ent_id, group in groupby(states, lambda state: state.entity_id):
-        domain = split_entity_id(ent_id)[0]
-        ent_results = result[ent_id]
-        if not minimal_response or domain in NEED_ATTRIBUTE_DOMAINS:
-            ent_results.extend(
-                [
-                    native_state
-                    for native_state in (db_state.to_native() for db_state in group)
-                    if (
-                        domain != SCRIPT_DOMAIN
-                        or native_state.attributes.get(ATTR_CAN_CANCEL)
-                    )
-                    and not native_state.attributes.get(ATTR_HIDDEN, False)
-                ]
-            )
+        _append_entity_states(ent_id, group, result[ent_id], minimal_response)
+
+    # Filter out the empty lists if some states had 0 results.
+    return {key: val for key, val in result.items() if val}
+
+
+def _get_start_time_states(hass, session, start_time, entity_ids, filters):
+    """Return the states at start_time as data points at start_time."""
+    run = recorder.run_information_from_instance(hass, start_time)
+    states = _get_states_with_session(
+        session, start_time, entity_ids, run=run, filters=filters
+    )
+    for state in states:
+        state.last_changed = start_time
+        state.last_updated = start_time
+
+    return states
+
+
+def _append_entity_states(ent_id, group, ent_results, minimal_response):
+    """Append the database states of an entity to its list of results."""
+    domain = split_entity_id(ent_id)[0]
+    if not minimal_response or domain in NEED_ATTRIBUTE_DOMAINS:
+        ent_results.extend(
+            [
+                native_state
+                for native_state in (db_state.to_native() for db_state in group)
+                if (
+                    domain != SCRIPT_DOMAIN
+                    or native_state.attributes.get(ATTR_CAN_CANCEL)
+                )
+                and not native_state.attributes.get(ATTR_HIDDEN, False)
+            ]
+        )
+        return
+
+    # With minimal response we only provide a native
+    # State for the first and last response. All the states
+    # in-between only provide the "state" and the
+    # "last_changed".
+    if not ent_results:
+        ent_results.append(next(group).to_native())
+
+    initial_state = ent_results[-1]
+    prev_state = ent_results[-1]
+    initial_state_count = len(ent_results)
+
+    for db_state in group:
+        if ATTR_HIDDEN in db_state.shared_attrs and db_state.to_native().attributes.get(
+            ATTR_HIDDEN, False
+        ):
             continue
 
-        # With minimal response we only provide a native
-        # State for the first and last response. All the states
-        # in-between only provide the "state" and the
-        # "last_changed".
-        if not ent_results:
-            ent_results.append(next(group).to_native())
+        # With minimal response we do not care about attribute
+        # changes so we can filter out duplicate states
+        if db_state.state == prev_state.state:
+            continue
 
-        initial_state = ent_results[-1]
-        prev_state = ent_results[-1]
-        initial_state_count = len(ent_results)
+        ent_results.append(
+            {
+                STATE_KEY: db_state.state,
+                LAST_CHANGED_KEY: f"{str(db_state.last_changed).replace(' ','T').split('.')[0]}{DB_TIMEZONE}",
+            }
+        )
+        prev_state = db_state
+
+    if (
+        prev_state
+        and prev_state != initial_state
+        and len(ent_results) != initial_state_count
+    ):
+        # There was at least one state change
+        # replace the last minimal state with
+        # a full state
+        ent_results[-1] = prev_state.to_native()
+
+
+def _states_to_columns(ent_results):
+    """Convert the results of an entity to parallel lists of states and times.
+
+    The attributes are those of the last full state in the results.
+    """
+    states = []
+    last_changed = []
+    attributes = {}
+    for item in ent_results:
+        if isinstance(item, dict):
+            states.append(item[STATE_KEY])
+            last_changed.append(item[LAST_CHANGED_KEY])
+        else:
+            states.append(item.state)
+            last_changed.append(item.last_changed.isoformat())
+            attributes = dict(item.attributes)
+
+    return {
+        ATTR_ENTITY_ID: ent_results[0].entity_id,
+        ATTRIBUTES_KEY: attributes,
+        STATE_KEY: states,
+        LAST_CHANGED_KEY: last_changed,
+    }
 
-        for db_state in group:
-            if ATTR_HIDDEN in db_state.attributes and db_state.to_native().attributes.get(
-                ATTR_HIDDEN, False
-            ):
-                continue
-
-            # With minimal response we do not care about attribute
-            # changes so we can filter out duplicate states
-            if db_state.state == prev_state.state:
-                continue
-
-            ent_results.append(
-                {
-                    STATE_KEY: db_state.state,
-                    LAST_CHANGED_KEY: f"{str(db_state.last_changed).replace(' ','T').split('.')[0]}{DB_TIMEZONE}",
-                }
-            )
-            prev_state = db_state
 
-        if (
-            prev_state
-            and prev_state != initial_state
-            and len(ent_results) != initial_state_count
+def get_aggregated_states(hass, start_time, end_time, entity_ids, period):
+    """Return the numeric states of entities aggregated per period.
+
+    Periods that are whole hours starting on the hour use the hourly
+    aggregates compiled by the recorder, so their cost depends on the number
+    of hours instead of the number of states. Hours that were not compiled
+    are aggregated from the states.
+    """
+    timer_start = time.perf_counter()
+    entity_ids = [entity_id.lower() for entity_id in entity_ids]
+    result = {entity_id: {} for entity_id in entity_ids}
+
+    with session_scope(hass=hass) as session:
+        if not period % HOUR and start_time == start_time.replace(
+            minute=0, second=0, microsecond=0
         ):
-            # There was at least one state change
-            # replace the last minimal state with
-            # a full state
-            ent_results[-1] = prev_state.to_native()
+            ranges = _aggregate_ranges(
+                start_time, end_time, compiled_hours(session, start_time, end_time)
+            )
+        else:
+            ranges = [(start_time, end_time, False)]
+
+        # Buckets are merged in the order of the ranges
+        for range_start, range_end, compiled in ranges:
+            if compiled:
+                _aggregate_hourly(
+                    session,
+                    result,
+                    entity_ids,
+                    start_time,
+                    range_start,
+                    range_end,
+                    period,
+                )
+            else:
+                _aggregate_states(
+                    hass,
+                    session,
+                    result,
+                    entity_ids,
+                    start_time,
+                    range_start,
+                    range_end,
+                    period,
+                )
 
-    # Filter out the empty lists if some states had 0 results.
-    return {key: val for key, val in result.items() if val}
+    if _LOGGER.isEnabledFor(logging.DEBUG):
+        elapsed = time.perf_counter() - timer_start
+        _LOGGER.debug("get_aggregated_states took %fs", elapsed)
+
+    return {
+        entity_id: [buckets[index] for index in sorted(buckets)]
+        for entity_id, buckets in result.items()
+        if buckets
+    }
+
+
+def _aggregate_ranges(start_time, end_time, hours):
+    """Split a time span into ranges of hours that are compiled or not.
+
+    Returns a list of (range start, range end, compiled) tuples.
+    """
+    ranges = []
+    hour_start = start_time
+
+    while hour_start < end_time:
+        hour_end = min(hour_start + HOUR, end_time)
+        compiled = hour_start in hours and hour_end - hour_start == HOUR
+
+        if ranges and ranges[-1][2] == compiled:
+            ranges[-1] = (ranges[-1][0], hour_end, compiled)
+        else:
+            ranges.append((hour_start, hour_end, compiled))
+
+        hour_start = hour_end
+
+    return ranges
+
+
+def _aggregate_hourly(
+    session, result, entity_ids, start_time, range_start, range_end, period
+):
+    """Aggregate compiled hours into the buckets of the periods."""
+    query = (
+        session.query(StatesHourly)
+        .filter(
+            StatesHourly.entity_id.in_(entity_ids)
+            & (StatesHourly.start >= range_start)
+            & (StatesHourly.start < range_end)
+        )
+        .order_by(StatesHourly.entity_id, StatesHourly.start)
+    )
+    for row in query:
+        hourly = Bucket.from_hourly(row)
+        index = int((hourly.start - start_time) / period)
+        if index not in result[row.entity_id]:
+            result[row.entity_id][index] = Bucket(start_time + index * period)
+        result[row.entity_id][index].merge(hourly)
+
+
+def _aggregate_states(
+    hass, session, result, entity_ids, start_time, range_start, range_end, period
+):
+    """Aggregate states into the buckets of the periods."""
+    if range_start > dt_util.utcnow():
+        return
+
+    aggregators = {
+        entity_id: BucketAggregator(start_time, range_end, period)
+        for entity_id in entity_ids
+    }
+
+    for state in _get_states_with_session(
+        session,
+        range_start,
+        entity_ids,
+        run=recorder.run_information_from_instance(hass, range_start),
+    ):
+        if state.entity_id in aggregators:
+            aggregators[state.entity_id].carry(state_to_float(state.state), range_start)
+
+    query = (
+        session.query(States.entity_id, States.state, States.last_updated)
+        .filter(
+            States.entity_id.in_(entity_ids)
+            & (States.last_updated >= range_start)
+            & (States.last_updated < range_end)
+        )
+        .order_by(States.entity_id, States.last_updated)
+    )
+    for entity_id, state, last_updated in query.yield_per(STREAM_ROWS_PER_FETCH):
+        aggregators[entity_id].add(state, process_timestamp(last_updated))
+
+    until = min(range_end, dt_util.utcnow())
+    for entity_id, aggregator in aggregators.items():
+        buckets = result[entity_id]
+        for bucket in aggregator.finish(until):
+            index = int((bucket.start - start_time) / period)
+            if index in buckets:
+                buckets[index].merge(bucket)
+            else:
+                buckets[index] = bucket
 
 
 def get_state(hass, utc_point_in_time, entity_id, run=None):
@@ -387,6 +658,7 @@ async def async_setup(hass, config):
     use_include_order = conf.get(CONF_ORDER)
 
     hass.http.register_view(HistoryPeriodView(filters, use_include_order))
+    hass.http.register_view(HistoryAggregateView)
     hass.components.frontend.async_register_built_in_panel(
         "history", "history", "hass:poll-box"
     )
@@ -408,7 +680,7 @@ class HistoryPeriodView(HomeAssistantView):
 
     async def get(
         self, request: web.Request, datetime: Optional[str] = None
-    ) -> web.Response:
+    ) -> web.StreamResponse:
         """Return history over a period of time."""
 
         if datetime:
@@ -446,9 +718,30 @@ class HistoryPeriodView(HomeAssistantView):
         )
 
         minimal_response = "minimal_response" in request.query
+        columnar_response = "columnar_response" in request.query
 
         hass = request.app["hass"]
 
+        if "stream" in request.query:
+            response = web.StreamResponse(headers={CONTENT_TYPE: CONTENT_TYPE_JSON})
+            response.enable_compression()
+            await response.prepare(request)
+            completed = await hass.async_add_executor_job(
+                self._stream_significant_states_json,
+                hass,
+                response,
+                start_time,
+                end_time,
+                entity_ids,
+                include_start_time_state,
+                significant_changes_only,
+                minimal_response,
+                columnar_response,
+            )
+            if completed:
+                await response.write_eof()
+            return response
+
         return cast(
             web.Response,
             await hass.async_add_executor_job(
@@ -460,6 +753,7 @@ class HistoryPeriodView(HomeAssistantView):
                 include_start_time_state,
                 significant_changes_only,
                 minimal_response,
+                columnar_response,
             ),
         )
 
@@ -472,6 +766,7 @@ class HistoryPeriodView(HomeAssistantView):
         include_start_time_state,
         significant_changes_only,
         minimal_response,
+        columnar_response,
     ):
         """Fetch significant stats from the database as json."""
         timer_start = time.perf_counter()
@@ -507,8 +802,82 @@ class HistoryPeriodView(HomeAssistantView):
             sorted_result.extend(result)
             result = sorted_result
 
+        if columnar_response:
+            result = [_states_to_columns(state_list) for state_list in result]
+
         return self.json(result)
 
+    def _stream_significant_states_json(
+        self,
+        hass,
+        response,
+        start_time,
+        end_time,
+        entity_ids,
+        include_start_time_state,
+        significant_changes_only,
+        minimal_response,
+        columnar_response,
+    ):
+        """Stream significant states from the database as json.
+
+        The states are written one entity at a time in the order of their
+        entity ids, the included entities order is not applied. Return False
+        if the client went away before all states were written.
+        """
+        timer_start = time.perf_counter()
+        entity_count = 0
+
+        def write(data):
+            """Write to the response from the executor.
+
+            Return False if the connection was closed or the request cancelled.
+            """
+            try:
+                asyncio.run_coroutine_threadsafe(
+                    response.write(data.encode("UTF-8")), hass.loop
+                ).result()
+            except (
+                ConnectionResetError,
+                asyncio.CancelledError,
+                concurrent.futures.CancelledError,
+            ):
+                return False
+            return True
+
+        if not write("["):
+            return False
+
+        with session_scope(hass=hass) as session:
+            for state_list in _stream_significant_states(
+                hass,
+                session,
+                start_time,
+                end_time,
+                entity_ids,
+                self.filters,
+                include_start_time_state,
+                significant_changes_only,
+                minimal_response,
+            ):
+                if columnar_response:
+                    state_list = _states_to_columns(state_list)
+                if not write(
+                    ("," if entity_count else "")
+                    + json.dumps(state_list, sort_keys=True, cls=JSONEncoder)
+                ):
+                    _LOGGER.debug("Stopped streaming after %d entities", entity_count)
+                    return False
+                entity_count += 1
+
+        if not write("]"):
+            return False
+
+        if _LOGGER.isEnabledFor(logging.DEBUG):
+            elapsed = time.perf_counter() - timer_start
+            _LOGGER.debug("Streamed %d entities in %fs", entity_count, elapsed)
+        return True
+
 
 class Filters:
     """Container for the configured include and exclude filters."""
@@ -572,3 +941,66 @@ class Filters:
         if self.excluded_entities:
             query = query.filter(~States.entity_id.in_(self.excluded_entities))
         return query
+
+
+class HistoryAggregateView(HomeAssistantView):
+    """Handle requests for history aggregated per period."""
+
+    url = "/api/history/aggregate"
+    name = "api:history:view-aggregate"
+    extra_urls = ["/api/history/aggregate/{datetime}"]
+
+    async def get(
+        self, request: web.Request, datetime: Optional[str] = None
+    ) -> web.Response:
+        """Return the numeric history of entities aggregated per period."""
+        if datetime:
+            start_time = dt_util.parse_datetime(datetime)
+
+            if start_time is None:
+                return self.json_message("Invalid datetime", HTTP_BAD_REQUEST)
+
+            start_time = dt_util.as_utc(start_time)
+        else:
+            start_time = dt_util.utcnow() - timedelta(days=1)
+
+        end_time = request.query.get("end_time")
+        if end_time:
+            end_time = dt_util.parse_datetime(end_time)
+            if end_time is None:
+                return self.json_message("Invalid end_time", HTTP_BAD_REQUEST)
+            end_time = dt_util.as_utc(end_time)
+        else:
+            end_time = start_time + timedelta(days=1)
+
+        entity_ids = request.query.get("filter_entity_id")
+        if not entity_ids:
+            return self.json_message("filter_entity_id is missing", HTTP_BAD_REQUEST)
+
+        try:
+            period = timedelta(seconds=int(request.query.get("period", 3600)))
+        except ValueError:
+            return self.json_message("Invalid period", HTTP_BAD_REQUEST)
+
+        if period < MIN_AGGREGATE_PERIOD:
+            return self.json_message("Invalid period", HTTP_BAD_REQUEST)
+
+        if start_time >= end_time:
+            return self.json({})
+
+        hass = request.app["hass"]
+        result = await hass.async_add_executor_job(
+            get_aggregated_states,
+            hass,
+            start_time,
+            end_time,
+            entity_ids.split(","),
+            period,
+        )
+
+        return self.json(
+            {
+                entity_id: [bucket.as_dict() for bucket in buckets]
+                for entity_id, buckets in result.items()
+            }
+        )
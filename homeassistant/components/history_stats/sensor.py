@@ -2,6 +2,7 @@
 import datetime
 import logging
 import math
+import threading
 
 import voluptuous as vol
 
@@ -20,7 +21,10 @@ from homeassistant.core import callback
 from homeassistant.exceptions import TemplateError
 import homeassistant.helpers.config_validation as cv
 from homeassistant.helpers.entity import Entity
-from homeassistant.helpers.event import async_track_state_change
+from homeassistant.helpers.event import (
+    async_track_state_change,
+    async_track_state_change_event,
+)
 import homeassistant.util.dt as dt_util
 
 _LOGGER = logging.getLogger(__name__)
@@ -115,6 +119,7 @@ class HistoryStatsSensor(Entity):
         self._unit_of_measurement = UNITS[sensor_type]
 
         self._period = (datetime.datetime.now(), datetime.datetime.now())
+        self._data = HistoryStatsData.async_get(hass, entity_id)
         self.value = None
         self.count = None
 
@@ -133,6 +138,14 @@ class HistoryStatsSensor(Entity):
         # Delay first refresh to keep startup fast
         hass.bus.listen_once(EVENT_HOMEASSISTANT_START, start_refresh)
 
+    async def async_added_to_hass(self):
+        """Start collecting the state changes of the entity."""
+        self._data.async_add_sensor(self)
+
+    async def async_will_remove_from_hass(self):
+        """Stop collecting the state changes of the entity."""
+        self._data.async_remove_sensor(self)
+
     @property
     def name(self):
         """Return the name of the sensor."""
@@ -204,30 +217,31 @@ class HistoryStatsSensor(Entity):
         if (
             start_timestamp == p_start_timestamp
             and end_timestamp == p_end_timestamp
-            and end_timestamp <= now_timestamp
+            and end_timestamp < now_timestamp
         ):
             # Don't compute anything as the value cannot have changed
             return
 
-        # Get history between start and end
-        history_list = history.state_changes_during_period(
-            self.hass, start, end, str(self._entity_id)
-        )
+        # Get the changes since the start, the history is only queried when
+        # the start moves back in time
+        states = self._data.get_states(self, start_timestamp)
 
-        if self._entity_id not in history_list.keys():
+        if all(state is None for _, state in states):
             return
 
-        # Get the first state
-        last_state = history.get_state(self.hass, start, self._entity_id)
-        last_state = last_state is not None and last_state == self._entity_state
+        measure_end = dt_util.as_timestamp(min(end, dt_util.utcnow()))
+        last_state = False
         last_time = start_timestamp
         elapsed = 0
         count = 0
 
         # Make calculations
-        for item in history_list.get(self._entity_id):
-            current_state = item.state == self._entity_state
-            current_time = item.last_changed.timestamp()
+        for timestamp, state in states:
+            if timestamp > measure_end:
+                break
+
+            current_state = state == self._entity_state
+            current_time = max(timestamp, start_timestamp)
 
             if last_state:
                 elapsed += current_time - last_time
@@ -239,7 +253,6 @@ class HistoryStatsSensor(Entity):
 
         # Count time elapsed between last history state and end of measure
         if last_state:
-            measure_end = min(end_timestamp, now_timestamp)
             elapsed += measure_end - last_time
 
         # Save value in hours
@@ -307,6 +320,127 @@ class HistoryStatsSensor(Entity):
         self._period = start, end
 
 
+class HistoryStatsData:
+    """State changes of an entity, shared by the sensors over the entity.
+
+    The history is queried once from the earliest start the sensors asked
+    for and kept up to date with the state changes of the entity. Changes
+    before the earliest start are dropped when the periods move forward.
+    """
+
+    def __init__(self, hass, entity_id):
+        """Initialize the data object."""
+        self.hass = hass
+        self.entity_id = entity_id
+        self._start = None
+        # List of (timestamp, state), the first item is the state at _start
+        self._states = []
+        self._sensor_starts = {}
+        self._lock = threading.Lock()
+        self._load_lock = threading.Lock()
+        self._unsub = None
+
+    @classmethod
+    @callback
+    def async_get(cls, hass, entity_id):
+        """Return the shared data object of an entity."""
+        all_data = hass.data.setdefault(DOMAIN, {})
+        data = all_data.get(entity_id)
+        if data is None:
+            data = all_data[entity_id] = cls(hass, entity_id)
+        return data
+
+    @callback
+    def async_add_sensor(self, sensor):
+        """Register a sensor and start following the state changes."""
+        with self._lock:
+            self._sensor_starts[id(sensor)] = None
+
+        if self._unsub is None:
+            self._unsub = async_track_state_change_event(
+                self.hass, [self.entity_id], self._async_state_changed
+            )
+
+    @callback
+    def async_remove_sensor(self, sensor):
+        """Unregister a sensor, drop the history after the last one."""
+        with self._lock:
+            self._sensor_starts.pop(id(sensor), None)
+
+            if self._sensor_starts or self._unsub is None:
+                return
+
+            self._start = None
+            self._states = []
+
+        self._unsub()
+        self._unsub = None
+
+    @callback
+    def _async_state_changed(self, event):
+        """Add a state change of the entity."""
+        new_state = event.data.get("new_state")
+        if new_state is None:
+            return
+
+        timestamp = new_state.last_changed.timestamp()
+
+        with self._lock:
+            if self._states and timestamp <= self._states[-1][0]:
+                return
+            self._states.append((timestamp, new_state.state))
+
+    def get_states(self, sensor, start):
+        """Return the state changes since the start timestamp.
+
+        Only queries the history if it was not loaded from start yet.
+        """
+        with self._load_lock:
+            if self._start is None or start < self._start:
+                self._load(start)
+
+        with self._lock:
+            self._sensor_starts[id(sensor)] = start
+            self._trim(
+                min(
+                    value for value in self._sensor_starts.values() if value is not None
+                )
+            )
+            return list(self._states)
+
+    def _load(self, start):
+        """Query the history since the start timestamp."""
+        history_list = history.state_changes_during_period(
+            self.hass, dt_util.utc_from_timestamp(start), entity_id=self.entity_id
+        )
+
+        states = [(start, None)]
+        states.extend(
+            (max(item.last_changed.timestamp(), start), item.state)
+            for item in history_list.get(self.entity_id, [])
+        )
+        last_loaded = states[-1][0]
+
+        with self._lock:
+            # Keep the changes that happened while the history was queried
+            self._states = states + [
+                item for item in self._states if item[0] > last_loaded
+            ]
+            self._start = start
+
+    def _trim(self, start):
+        """Drop the changes that happened before the start timestamp."""
+        if start <= self._start:
+            return
+
+        index = 0
+        while index + 1 < len(self._states) and self._states[index + 1][0] <= start:
+            index += 1
+
+        self._states = [(start, self._states[index][1])] + self._states[index + 1 :]
+        self._start = start
+
+
 class HistoryStatsHelper:
     """Static methods to make the HistoryStatsSensor code lighter."""
 
@@ -1,4 +1,5 @@
 """Support for sending data to an Influx database."""
+import gzip
 import logging
 import math
 import queue
@@ -7,6 +8,7 @@ import threading
 import time
 
 from influxdb import InfluxDBClient, exceptions
+from influxdb.line_protocol import make_lines
 import requests.exceptions
 import voluptuous as vol
 
@@ -29,8 +31,11 @@ from homeassistant.const import (
 )
 from homeassistant.helpers import event as event_helper, state as state_helper
 import homeassistant.helpers.config_validation as cv
+from homeassistant.helpers.discovery import load_platform
 from homeassistant.helpers.entity_values import EntityValues
 
+from .spill import SpillBuffer
+
 _LOGGER = logging.getLogger(__name__)
 
 CONF_DB_NAME = "database"
@@ -42,6 +47,11 @@ CONF_COMPONENT_CONFIG = "component_config"
 CONF_COMPONENT_CONFIG_GLOB = "component_config_glob"
 CONF_COMPONENT_CONFIG_DOMAIN = "component_config_domain"
 CONF_RETRY_COUNT = "max_retries"
+CONF_BATCH_SIZE = "batch_size"
+CONF_FLUSH_INTERVAL = "flush_interval"
+CONF_GZIP = "gzip"
+CONF_MAX_SPILL_POINTS = "max_spill_points"
+CONF_STATISTICS_SENSORS = "statistics_sensors"
 
 DEFAULT_DATABASE = "home_assistant"
 DEFAULT_VERIFY_SSL = True
@@ -55,6 +65,18 @@ RETRY_INTERVAL = 60  # seconds
 BATCH_TIMEOUT = 1
 BATCH_BUFFER_SIZE = 100
 
+# Points that could not be written are kept on disk, about 100 bytes each
+SPILL_FILE = ".influxdb_spill"
+DEFAULT_MAX_SPILL_POINTS = 200000
+# Batches written from the spill buffer before handling new events again
+SPILL_BATCHES_PER_FLUSH = 10
+
+WRITE_ERRORS = (
+    exceptions.InfluxDBClientError,
+    exceptions.InfluxDBServerError,
+    OSError,
+)
+
 COMPONENT_CONFIG_SCHEMA_ENTRY = vol.Schema(
     {vol.Optional(CONF_OVERRIDE_MEASUREMENT): cv.string}
 )
@@ -88,6 +110,17 @@ CONFIG_SCHEMA = vol.Schema(
                     vol.Optional(CONF_PORT): cv.port,
                     vol.Optional(CONF_SSL): cv.boolean,
                     vol.Optional(CONF_RETRY_COUNT, default=0): cv.positive_int,
+                    vol.Optional(CONF_BATCH_SIZE, default=BATCH_BUFFER_SIZE): vol.All(
+                        vol.Coerce(int), vol.Range(min=1)
+                    ),
+                    vol.Optional(CONF_FLUSH_INTERVAL, default=BATCH_TIMEOUT): vol.All(
+                        vol.Coerce(float), vol.Range(min=0)
+                    ),
+                    vol.Optional(CONF_GZIP, default=False): cv.boolean,
+                    vol.Optional(
+                        CONF_MAX_SPILL_POINTS, default=DEFAULT_MAX_SPILL_POINTS
+                    ): cv.positive_int,
+                    vol.Optional(CONF_STATISTICS_SENSORS, default=False): cv.boolean,
                     vol.Optional(CONF_DEFAULT_MEASUREMENT): cv.string,
                     vol.Optional(CONF_OVERRIDE_MEASUREMENT): cv.string,
                     vol.Optional(CONF_TAGS, default={}): vol.Schema(
@@ -270,9 +303,31 @@ def setup(hass, config):
 
         return json
 
-    instance = hass.data[DOMAIN] = InfluxThread(hass, influx, event_to_json, max_tries)
+    spill = None
+    if conf[CONF_MAX_SPILL_POINTS]:
+        try:
+            spill = SpillBuffer(
+                hass.config.path(SPILL_FILE), conf[CONF_MAX_SPILL_POINTS]
+            )
+        except OSError as err:
+            _LOGGER.error("Error reading spill file, not keeping points: %s", err)
+
+    instance = hass.data[DOMAIN] = InfluxThread(
+        hass,
+        influx,
+        event_to_json,
+        max_tries,
+        database=conf[CONF_DB_NAME],
+        batch_size=conf[CONF_BATCH_SIZE],
+        flush_interval=conf[CONF_FLUSH_INTERVAL],
+        use_gzip=conf[CONF_GZIP],
+        spill=spill,
+    )
     instance.start()
 
+    if conf[CONF_STATISTICS_SENSORS]:
+        load_platform(hass, "sensor", DOMAIN, {}, config)
+
     def shutdown(event):
         """Shut down the thread."""
         instance.queue.put(None)
@@ -285,28 +340,74 @@ def setup(hass, config):
 
 
 class InfluxThread(threading.Thread):
-    """A threaded event handler class."""
-
-    def __init__(self, hass, influx, event_to_json, max_tries):
+    """A threaded event handler class.
+
+    Points are written in batches of batch_size, waiting at most
+    flush_interval seconds for a batch to fill up. When writing fails and
+    there is a spill buffer, the points are kept on disk and new points are
+    added behind them until they can be written again.
+    """
+
+    def __init__(
+        self,
+        hass,
+        influx,
+        event_to_json,
+        max_tries,
+        database=DEFAULT_DATABASE,
+        batch_size=BATCH_BUFFER_SIZE,
+        flush_interval=BATCH_TIMEOUT,
+        use_gzip=False,
+        spill=None,
+    ):
         """Initialize the listener."""
         threading.Thread.__init__(self, name="InfluxDB")
         self.queue = queue.Queue()
         self.influx = influx
         self.event_to_json = event_to_json
         self.max_tries = max_tries
+        self.database = database
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.use_gzip = use_gzip
+        self.spill = spill
         self.write_errors = 0
         self.shutdown = False
+        self.written = 0
+        self.dropped = 0
+        self.last_lag = 0.0
+        self._batch_started = None
+        self._spilled_since = None
+        self._spill_full_logged = False
+        self._retry_at = 0.0
         hass.bus.listen(EVENT_STATE_CHANGED, self._event_listener)
 
+    @property
+    def buffered(self):
+        """Return the number of points waiting in the spill buffer."""
+        return self.spill.count if self.spill is not None else 0
+
+    @property
+    def lag(self):
+        """Return how many seconds the points written last have waited."""
+        if self._spilled_since is not None:
+            return time.monotonic() - self._spilled_since
+        return self.last_lag
+
     def _event_listener(self, event):
         """Listen for new messages on the bus and queue them for Influx."""
         item = (time.monotonic(), event)
         self.queue.put(item)
 
-    @staticmethod
-    def batch_timeout():
+    def batch_timeout(self):
         """Return number of seconds to wait for more events."""
-        return BATCH_TIMEOUT
+        return self.flush_interval
+
+    def _idle_timeout(self):
+        """Return number of seconds to wait for a first event."""
+        if not self.buffered:
+            return None
+        return max(self._retry_at - time.monotonic(), 0)
 
     def get_events_json(self):
         """Return a batch of events formatted for writing."""
@@ -318,8 +419,8 @@ class InfluxThread(threading.Thread):
         dropped = 0
 
         try:
-            while len(json) < BATCH_BUFFER_SIZE and not self.shutdown:
-                timeout = None if count == 0 else self.batch_timeout()
+            while len(json) < self.batch_size and not self.shutdown:
+                timeout = self._idle_timeout() if count == 0 else self.batch_timeout()
                 item = self.queue.get(timeout=timeout)
                 count += 1
 
@@ -332,6 +433,8 @@ class InfluxThread(threading.Thread):
                     if age < queue_seconds:
                         event_json = self.event_to_json(event)
                         if event_json:
+                            if not json:
+                                self._batch_started = timestamp
                             json.append(event_json)
                     else:
                         dropped += 1
@@ -341,33 +444,150 @@ class InfluxThread(threading.Thread):
 
         if dropped:
             _LOGGER.warning("Catching up, dropped %d old events", dropped)
+            self.dropped += dropped
 
         return count, json
 
     def write_to_influxdb(self, json):
+        """Write preprocessed events to influxdb."""
+        if self.spill is None:
+            self._write_with_retry(json)
+            return
+
+        # Keep the order of the points while older ones are on disk
+        if self.spill.count:
+            self._spill(json)
+            self._write_spilled()
+            return
+
+        try:
+            self._write(json)
+        except WRITE_ERRORS as err:
+            _LOGGER.error("Write error, keeping points until it recovers: %s", err)
+            self._retry_at = time.monotonic() + RETRY_DELAY
+            self._spill(json)
+            return
+
+        self._written(len(json))
+
+    def _write_with_retry(self, json):
         """Write preprocessed events to influxdb, with retry."""
 
         for retry in range(self.max_tries + 1):
             try:
-                self.influx.write_points(json)
+                self._write(json)
 
                 if self.write_errors:
                     _LOGGER.error("Resumed, lost %d events", self.write_errors)
                     self.write_errors = 0
 
-                _LOGGER.debug("Wrote %d events", len(json))
+                self._written(len(json))
                 break
-            except (
-                exceptions.InfluxDBClientError,
-                exceptions.InfluxDBServerError,
-                OSError,
-            ) as err:
+            except WRITE_ERRORS as err:
                 if retry < self.max_tries:
                     time.sleep(RETRY_DELAY)
                 else:
                     if not self.write_errors:
                         _LOGGER.error("Write error: %s", err)
                     self.write_errors += len(json)
+                    self.dropped += len(json)
+
+    def _written(self, count):
+        """Update the statistics after points were written."""
+        self.written += count
+        self.last_lag = time.monotonic() - self._batch_started
+        _LOGGER.debug("Wrote %d events", count)
+
+    def _write(self, json):
+        """Write points formatted as JSON in the line protocol."""
+        self._write_lines(_lines(json))
+
+    def _write_lines(self, lines):
+        """Write points formatted in the line protocol."""
+        if not self.use_gzip:
+            self.influx.write_points(lines, protocol="line")
+            return
+
+        self.influx.request(
+            url="write",
+            method="POST",
+            params={"db": self.database},
+            data=gzip.compress(("\n".join(lines) + "\n").encode("utf-8")),
+            expected_response_code=204,
+            headers={
+                "Content-Type": "application/octet-stream",
+                "Content-Encoding": "gzip",
+            },
+        )
+
+    def _spill(self, json):
+        """Keep points on disk until they can be written."""
+        if self._spilled_since is None:
+            self._spilled_since = self._batch_started
+
+        try:
+            dropped = self.spill.append(_lines(json))
+        except OSError as err:
+            self._disable_spill(err, len(json))
+            return
+
+        if dropped:
+            if not self._spill_full_logged:
+                _LOGGER.error("Spill buffer is full, dropping points")
+                self._spill_full_logged = True
+            self.dropped += dropped
+
+    def _disable_spill(self, err, dropped=0):
+        """Drop the points kept on disk after an error using the spill file.
+
+        Later write errors are retried with max_retries.
+        """
+        dropped += self.spill.count
+        _LOGGER.error(
+            "Error using spill file, dropped %d points and no longer keeping "
+            "points: %s",
+            dropped,
+            err,
+        )
+        self.dropped += dropped
+        self.spill = None
+        self._spilled_since = None
+
+    def _write_spilled(self):
+        """Write the points in the spill buffer once the retry delay passed."""
+        if self.spill is None or time.monotonic() < self._retry_at:
+            return
+
+        for _ in range(SPILL_BATCHES_PER_FLUSH):
+            try:
+                lines = self.spill.read(self.batch_size)
+            except OSError as err:
+                self._disable_spill(err)
+                return
+
+            if not lines:
+                break
+
+            try:
+                self._write_lines(lines)
+            except WRITE_ERRORS as err:
+                _LOGGER.debug("Write error, retrying later: %s", err)
+                self._retry_at = time.monotonic() + RETRY_DELAY
+                return
+
+            self.written += len(lines)
+            try:
+                self.spill.consume(lines)
+            except OSError as err:
+                self._disable_spill(err)
+                return
+
+        if not self.spill.count:
+            _LOGGER.info("Resumed, wrote all points kept during write errors")
+            if self._spilled_since is not None:
+                self.last_lag = time.monotonic() - self._spilled_since
+            self._spilled_since = None
+            self._spill_full_logged = False
 
     def run(self):
         """Process incoming events."""
@@ -375,9 +595,22 @@ class InfluxThread(threading.Thread):
             count, json = self.get_events_json()
             if json:
                 self.write_to_influxdb(json)
+            elif self.buffered:
+                self._write_spilled()
             for _ in range(count):
                 self.queue.task_done()
 
+        if self.spill is not None:
+            try:
+                self.spill.close()
+            except OSError as err:
+                _LOGGER.error("Error rewriting spill file: %s", err)
+
     def block_till_done(self):
         """Block till all events processed."""
         self.queue.join()
+
+
+def _lines(json):
+    """Return points formatted in the line protocol."""
+    return make_lines({"points": json}).rstrip("\n").split("\n")
@@ -1,6 +1,7 @@
 """InfluxDB component which allows you to get data from an Influx database."""
 from datetime import timedelta
 import logging
+import time
 
 from influxdb import InfluxDBClient, exceptions
 import voluptuous as vol
@@ -17,13 +18,14 @@ from homeassistant.const import (
     CONF_VALUE_TEMPLATE,
     CONF_VERIFY_SSL,
     STATE_UNKNOWN,
+    TIME_SECONDS,
 )
 from homeassistant.exceptions import TemplateError
 import homeassistant.helpers.config_validation as cv
 from homeassistant.helpers.entity import Entity
 from homeassistant.util import Throttle
 
-from . import CONF_DB_NAME
+from . import CONF_DB_NAME, DOMAIN
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -71,6 +73,38 @@ PLATFORM_SCHEMA = PLATFORM_SCHEMA.extend(
 
 def setup_platform(hass, config, add_entities, discovery_info=None):
     """Set up the InfluxDB component."""
+    if discovery_info is not None:
+        thread = hass.data[DOMAIN]
+        add_entities(
+            [
+                InfluxStatisticSensor(thread, key, name, unit, getter)
+                for key, name, unit, getter in (
+                    (
+                        "points_written",
+                        "Points written",
+                        "points",
+                        lambda thread: thread.written,
+                    ),
+                    (
+                        "dropped_points",
+                        "Dropped points",
+                        "points",
+                        lambda thread: thread.dropped,
+                    ),
+                    (
+                        "buffered_points",
+                        "Buffered points",
+                        "points",
+                        lambda thread: thread.buffered,
+                    ),
+                    ("lag", "Lag", TIME_SECONDS, lambda thread: round(thread.lag, 1)),
+                )
+            ]
+            + [InfluxThroughputSensor(thread)],
+            True,
+        )
+        return
+
     influx_conf = {
         "host": config[CONF_HOST],
         "password": config.get(CONF_PASSWORD),
@@ -213,3 +247,63 @@ class InfluxSensorData:
                     self.query,
                 )
             self.value = points[0].get("value")
+
+
+class InfluxStatisticSensor(Entity):
+    """Representation of a statistic of the InfluxDB writer."""
+
+    def __init__(self, thread, key, name, unit, getter):
+        """Initialize the sensor."""
+        self._thread = thread
+        self._unique_id = f"{DOMAIN}_{key}"
+        self._name = f"InfluxDB {name}"
+        self._unit_of_measurement = unit
+        self._getter = getter
+        self._state = None
+
+    @property
+    def unique_id(self):
+        """Return the unique ID of the sensor."""
+        return self._unique_id
+
+    @property
+    def name(self):
+        """Return the name of the sensor."""
+        return self._name
+
+    @property
+    def state(self):
+        """Return the state of the sensor."""
+        return self._state
+
+    @property
+    def unit_of_measurement(self):
+        """Return the unit of measurement of this entity, if any."""
+        return self._unit_of_measurement
+
+    def update(self):
+        """Read the statistic from the writer."""
+        self._state = self._getter(self._thread)
+
+
+class InfluxThroughputSensor(InfluxStatisticSensor):
+    """Representation of the points written per second since the last update."""
+
+    def __init__(self, thread):
+        """Initialize the sensor."""
+        super().__init__(thread, "throughput", "Throughput", "points/s", None)
+        self._last_written = None
+        self._last_update = None
+
+    def update(self):
+        """Calculate the throughput since the last update."""
+        written = self._thread.written
+        now = time.monotonic()
+
+        if self._last_update is not None and now > self._last_update:
+            self._state = round(
+                (written - self._last_written) / (now - self._last_update), 1
+            )
+
+        self._last_written = written
+        self._last_update = now
@@ -0,0 +1,87 @@
+"""On-disk buffer of points that could not be written to InfluxDB."""
+import logging
+import os
+from typing import List
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class SpillBuffer:
+    """Append-only file of line protocol points, read from the front.
+
+    Points are appended while InfluxDB is unreachable and read back in the
+    order they were added once it is reachable again. The buffer holds at
+    most max_points points, later points are dropped. Only used from the
+    InfluxDB thread.
+    """
+
+    def __init__(self, path: str, max_points: int) -> None:
+        """Initialize the buffer and count the points left by a previous run."""
+        self.path = path
+        self.max_points = max_points
+        self.count = 0
+        self._offset = 0
+
+        if os.path.exists(path):
+            with open(path, "rb") as fil:
+                self.count = sum(1 for _ in fil)
+            _LOGGER.info("Found %d points that were not written yet", self.count)
+
+    def append(self, lines: List[str]) -> int:
+        """Append points to the buffer and return the number dropped."""
+        room = max(self.max_points - self.count, 0)
+        if room < len(lines):
+            dropped = len(lines) - room
+            lines = lines[:room]
+        else:
+            dropped = 0
+
+        if lines:
+            with open(self.path, "ab") as fil:
+                fil.write(("\n".join(lines) + "\n").encode("utf-8"))
+            self.count += len(lines)
+
+        return dropped
+
+    def read(self, max_points: int) -> List[str]:
+        """Return the points at the front of the buffer."""
+        lines = []
+        if not self.count:
+            return lines
+
+        with open(self.path, "rb") as fil:
+            fil.seek(self._offset)
+            for line in fil:
+                lines.append(line.rstrip(b"\n").decode("utf-8"))
+                if len(lines) == max_points:
+                    break
+        return lines
+
+    def consume(self, lines: List[str]) -> None:
+        """Remove points returned by read from the front of the buffer."""
+        self.count -= len(lines)
+        if self.count <= 0:
+            self.clear()
+            return
+
+        self._offset += sum(len(line.encode("utf-8")) + 1 for line in lines)
+
+    def clear(self) -> None:
+        """Remove all points."""
+        self.count = 0
+        self._offset = 0
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+
+    def close(self) -> None:
+        """Rewrite the buffer without the points that were already read."""
+        if not self._offset:
+            return
+
+        temp_path = f"{self.path}.tmp"
+        with open(self.path, "rb") as src, open(temp_path, "wb") as dst:
+            src.seek(self._offset)
+            for chunk in iter(lambda: src.read(65536), b""):
+                dst.write(chunk)
+        os.replace(temp_path, self.path)
+        self._offset = 0
@@ -1,6 +1,7 @@
 """Event parser and human readable log generator."""
 from datetime import timedelta
 from itertools import groupby
+import json
 import logging
 import time
 
@@ -9,7 +10,7 @@ import voluptuous as vol
 
 from homeassistant.components import sun
 from homeassistant.components.http import HomeAssistantView
-from homeassistant.components.recorder.models import Events, States
+from homeassistant.components.recorder.models import Events, StateAttributes, States
 from homeassistant.components.recorder.util import (
     QUERY_RETRY_WAIT,
     RETRIES,
@@ -392,7 +393,8 @@ def _get_events(hass, config, start_day, end_day, entity_id=None):
     def yield_events(query):
         """Yield Events that are not filtered away."""
         for row in query.yield_per(500):
-            event = row.to_native()
+            event = row.Events.to_native()
+            _add_state_attributes(event, row.shared_attrs or row.attributes)
             if _keep_event(hass, event, entities_filter):
                 yield event
 
@@ -403,9 +405,13 @@ def _get_events(hass, config, start_day, end_day, entity_id=None):
             entity_ids = _get_related_entity_ids(session, entities_filter)
 
         query = (
-            session.query(Events)
+            session.query(Events, States.attributes, StateAttributes.shared_attrs)
             .order_by(Events.time_fired)
             .outerjoin(States, (Events.event_id == States.event_id))
+            .outerjoin(
+                StateAttributes,
+                (States.attributes_id == StateAttributes.attributes_id),
+            )
             .filter(
                 Events.event_type.in_(ALL_EVENT_TYPES + list(hass.data.get(DOMAIN, {})))
             )
@@ -422,6 +428,20 @@ def _get_events(hass, config, start_day, end_day, entity_id=None):
         return list(humanify(hass, yield_events(query)))
 
 
+def _add_state_attributes(event, shared_attrs):
+    """Add the attributes of the new state to a state_changed event.
+
+    The attributes are stored once in the state attributes table, only events
+    recorded before that have them in their data.
+    """
+    if event.event_type != EVENT_STATE_CHANGED or shared_attrs is None:
+        return
+
+    new_state = event.data.get("new_state")
+    if new_state is not None and "attributes" not in new_state:
+        new_state["attributes"] = json.loads(shared_attrs)
+
+
 def _keep_event(hass, event, entities_filter):
     domain, entity_id = None, None
 
@@ -92,7 +92,9 @@ class LovelaceStorage(LovelaceConfig):
 
         super().__init__(hass, url_path, config)
 
-        self._store = storage.Store(hass, CONFIG_STORAGE_VERSION, storage_key)
+        self._store = storage.Store(
+            hass, CONFIG_STORAGE_VERSION, storage_key, compact=True
+        )
         self._data = None
 
     @property
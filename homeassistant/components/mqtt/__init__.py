@@ -757,12 +757,16 @@ class MQTT:
         # should be able to optionally rely on MQTT.
         # pylint: disable=import-outside-toplevel
         import paho.mqtt.client as mqtt
+        from paho.mqtt.matcher import MQTTMatcher
 
         self.hass = hass
         self.broker = broker
         self.port = port
         self.keepalive = keepalive
         self.subscriptions: List[Subscription] = []
+        # Topic trie of subscription topic -> list of subscriptions, kept up
+        # to date on (un)subscribe so routing a message costs O(topic depth)
+        self._matching_subscriptions = MQTTMatcher()
         self.birth_message = birth_message
         self.connected = False
         self._mqttc: mqtt.Client = None
@@ -860,6 +864,10 @@ class MQTT:
 
         subscription = Subscription(topic, msg_callback, qos, encoding)
         self.subscriptions.append(subscription)
+        try:
+            self._matching_subscriptions[topic].append(subscription)
+        except KeyError:
+            self._matching_subscriptions[topic] = [subscription]
 
         # Only subscribe if currently connected.
         if self.connected:
@@ -872,10 +880,14 @@ class MQTT:
                 raise HomeAssistantError("Can't remove subscription twice")
             self.subscriptions.remove(subscription)
 
-            if any(other.topic == topic for other in self.subscriptions):
+            topic_subscriptions = self._matching_subscriptions[topic]
+            topic_subscriptions.remove(subscription)
+            if topic_subscriptions:
                 # Other subscriptions on topic remaining - don't unsubscribe.
                 return
 
+            del self._matching_subscriptions[topic]
+
             # Only unsubscribe if currently connected.
             if self.connected:
                 self.hass.async_create_task(self._async_unsubscribe(topic))
@@ -957,10 +969,16 @@ class MQTT:
         )
         timestamp = dt_util.utcnow()
 
-        for subscription in self.subscriptions:
-            if not _match_topic(subscription.topic, msg.topic):
-                continue
+        # Copy the matches, callbacks are allowed to (un)subscribe
+        subscriptions = [
+            subscription
+            for topic_subscriptions in self._matching_subscriptions.iter_match(
+                msg.topic
+            )
+            for subscription in topic_subscriptions
+        ]
 
+        for subscription in subscriptions:
             payload: SubscribePayloadType = msg.payload
             if subscription.encoding is not None:
                 try:
@@ -1,9 +1,13 @@
 """Support for Prometheus metrics export."""
+import asyncio
+import gzip
+import itertools
 import logging
 import string
 
-from aiohttp import web
+from aiohttp import hdrs, web
 import prometheus_client
+from prometheus_client.exposition import choose_encoder
 import voluptuous as vol
 
 from homeassistant import core as hacore
@@ -23,12 +27,17 @@ from homeassistant.const import (
 from homeassistant.helpers import entityfilter, state as state_helper
 import homeassistant.helpers.config_validation as cv
 from homeassistant.helpers.entity_values import EntityValues
+from homeassistant.helpers.event import track_state_change_event
 from homeassistant.util.temperature import fahrenheit_to_celsius
 
 _LOGGER = logging.getLogger(__name__)
 
 API_ENDPOINT = "/api/prometheus"
 
+# How long a cached exposition is served, the process and garbage collector
+# metrics change without state changes
+CACHE_TTL = 5
+
 DOMAIN = "prometheus"
 CONF_FILTER = "filter"
 CONF_PROM_NAMESPACE = "namespace"
@@ -67,8 +76,6 @@ CONFIG_SCHEMA = vol.Schema(
 
 def setup(hass, config):
     """Activate Prometheus component."""
-    hass.http.register_view(PrometheusView(prometheus_client))
-
     conf = config[DOMAIN]
     entity_filter = conf[CONF_FILTER]
     namespace = conf.get(CONF_PROM_NAMESPACE)
@@ -91,7 +98,22 @@ def setup(hass, config):
         default_metric,
     )
 
-    hass.bus.listen(EVENT_STATE_CHANGED, metrics.handle_event)
+    hass.http.register_view(PrometheusView(prometheus_client, metrics))
+
+    filter_config = entity_filter.config
+    if filter_config[entityfilter.CONF_INCLUDE_ENTITIES] and not (
+        filter_config[entityfilter.CONF_INCLUDE_DOMAINS]
+        or filter_config[entityfilter.CONF_EXCLUDE_DOMAINS]
+        or filter_config[entityfilter.CONF_EXCLUDE_ENTITIES]
+    ):
+        # Only listen to the state changes of the included entities
+        track_state_change_event(
+            hass,
+            filter_config[entityfilter.CONF_INCLUDE_ENTITIES],
+            metrics.handle_event,
+        )
+    else:
+        hass.bus.listen(EVENT_STATE_CHANGED, metrics.handle_event)
     return True
 
 
@@ -128,6 +150,10 @@ class PrometheusMetrics:
             self.metrics_prefix = ""
         self._metrics = {}
         self._climate_units = climate_units
+        self._generations = itertools.count()
+        # Changes every time a metric is updated. State changes are handled
+        # in the executor, next() keeps the generations unique.
+        self.generation = next(self._generations)
 
     def handle_event(self, event):
         """Listen for new messages on the bus, and add them to Prometheus."""
@@ -151,6 +177,7 @@ class PrometheusMetrics:
             "state_change", self.prometheus_cli.Counter, "The number of state changes"
         )
         metric.labels(**self._labels(state)).inc()
+        self.generation = next(self._generations)
 
     def _metric(self, metric, factory, documentation, labels=None):
         if labels is None:
@@ -382,20 +409,84 @@ class PrometheusMetrics:
 
 
 class PrometheusView(HomeAssistantView):
-    """Handle Prometheus requests."""
+    """Handle Prometheus requests.
+
+    The exposition is generated in the executor. Any state change drops
+    the whole cached exposition, so only scrapes without a state change in
+    between and less than CACHE_TTL seconds apart are served from cache,
+    like scrapers that query the same instance back to back.
+    """
 
     url = API_ENDPOINT
     name = "api:prometheus"
 
-    def __init__(self, prometheus_cli):
+    def __init__(self, prometheus_cli, metrics):
         """Initialize Prometheus view."""
         self.prometheus_cli = prometheus_cli
+        self._metrics = metrics
+        self._cache = {}
+        self._lock = None
 
     async def get(self, request):
         """Handle request for Prometheus metrics."""
         _LOGGER.debug("Received Prometheus metrics request")
 
-        return web.Response(
-            body=self.prometheus_cli.generate_latest(),
-            content_type=CONTENT_TYPE_TEXT_PLAIN,
-        )
+        encoder, content_type = choose_encoder(request.headers.get(hdrs.ACCEPT))
+        if encoder is self.prometheus_cli.generate_latest:
+            content_type = CONTENT_TYPE_TEXT_PLAIN
+        compress = _accepts_gzip(request.headers.get(hdrs.ACCEPT_ENCODING, ""))
+        key = (encoder, compress)
+        hass = request.app["hass"]
+
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+
+        async with self._lock:
+            generation = self._metrics.generation
+            now = hass.loop.time()
+            cached = self._cache.get(key)
+            if (
+                cached is not None
+                and cached[0] == generation
+                and now - cached[1] < CACHE_TTL
+            ):
+                body = cached[2]
+            else:
+                body = await hass.async_add_executor_job(
+                    _generate, encoder, self.prometheus_cli.REGISTRY, compress
+                )
+                self._cache[key] = (generation, now, body)
+
+        headers = {hdrs.CONTENT_TYPE: content_type, hdrs.VARY: hdrs.ACCEPT_ENCODING}
+        if compress:
+            headers[hdrs.CONTENT_ENCODING] = "gzip"
+
+        return web.Response(body=body, headers=headers)
+
+
+def _generate(encoder, registry, compress):
+    """Generate the exposition of the metrics of a registry."""
+    body = encoder(registry)
+    if compress:
+        return gzip.compress(body)
+    return body
+
+
+def _accepts_gzip(accept_encoding):
+    """Return if an Accept-Encoding header accepts the gzip coding."""
+    qualities = {}
+    for coding in accept_encoding.split(","):
+        name, *params = coding.split(";")
+        quality = 1.0
+        for param in params:
+            key, _, value = param.partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        qualities[name.strip().lower()] = quality
+
+    if "gzip" in qualities:
+        return qualities["gzip"] > 0
+    return qualities.get("*", 0) > 0
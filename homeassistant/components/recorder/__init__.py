@@ -1,22 +1,23 @@
 """Support for recording details."""
 import asyncio
-from collections import namedtuple
+from collections import OrderedDict, namedtuple
 import concurrent.futures
-from datetime import datetime
+from datetime import datetime, timedelta
 import logging
 import queue
 import threading
 import time
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 
-from sqlalchemy import create_engine, event as sqlalchemy_event, exc, select
+from sqlalchemy import create_engine, event as sqlalchemy_event, exc, func, select
 from sqlalchemy.orm import scoped_session, sessionmaker
 from sqlalchemy.pool import StaticPool
 import voluptuous as vol
 
-from homeassistant.components import persistent_notification
+from homeassistant.components import persistent_notification, websocket_api
 from homeassistant.const import (
     ATTR_ENTITY_ID,
+    ATTR_NOW,
     CONF_DOMAINS,
     CONF_ENTITIES,
     CONF_EXCLUDE,
@@ -27,15 +28,23 @@ from homeassistant.const import (
     EVENT_TIME_CHANGED,
     MATCH_ALL,
 )
-from homeassistant.core import CoreState, HomeAssistant, callback
+from homeassistant.core import CoreState, Event, HomeAssistant, callback
 import homeassistant.helpers.config_validation as cv
 from homeassistant.helpers.entityfilter import generate_filter
 from homeassistant.helpers.typing import ConfigType
 import homeassistant.util.dt as dt_util
 
-from . import migration, purge
+from . import aggregate, migration, purge
 from .const import DATA_INSTANCE
-from .models import Base, Events, RecorderRuns, States
+from .models import (
+    Base,
+    Events,
+    RecorderRuns,
+    StateAttributes,
+    States,
+    StatesHourlyRuns,
+    process_timestamp,
+)
 from .util import session_scope
 
 _LOGGER = logging.getLogger(__name__)
@@ -60,14 +69,31 @@ DEFAULT_DB_MAX_RETRIES = 10
 DEFAULT_DB_RETRY_WAIT = 3
 KEEPALIVE_TIME = 30
 
+# Write pending events to the database once this many are waiting,
+# even if the commit interval has not passed yet.
+MAX_BATCH_SIZE = 1000
+
+# Hours before the recorder started that hourly aggregates are compiled of
+MAX_AGGREGATE_BACKLOG = timedelta(days=1)
+
+# Number of state attributes to remember the attributes_id of
+STATE_ATTRIBUTES_CACHE_SIZE = 2048
+
+QUEUE_OVERFLOW_DROP_NEW = "drop_new"
+QUEUE_OVERFLOW_DROP_OLDEST = "drop_oldest"
+
 CONF_AUTO_PURGE = "auto_purge"
 CONF_DB_URL = "db_url"
 CONF_DB_MAX_RETRIES = "db_max_retries"
 CONF_DB_RETRY_WAIT = "db_retry_wait"
 CONF_PURGE_KEEP_DAYS = "purge_keep_days"
+CONF_PURGE_KEEP_DAYS_DOMAINS = "purge_keep_days_domains"
+CONF_PURGE_KEEP_DAYS_ENTITIES = "purge_keep_days_entities"
 CONF_PURGE_INTERVAL = "purge_interval"
 CONF_EVENT_TYPES = "event_types"
 CONF_COMMIT_INTERVAL = "commit_interval"
+CONF_MAX_QUEUE_SIZE = "max_queue_size"
+CONF_QUEUE_OVERFLOW = "queue_overflow"
 
 FILTER_SCHEMA = vol.Schema(
     {
@@ -97,6 +123,12 @@ CONFIG_SCHEMA = vol.Schema(
                     vol.Optional(CONF_PURGE_KEEP_DAYS, default=10): vol.All(
                         vol.Coerce(int), vol.Range(min=1)
                     ),
+                    vol.Optional(CONF_PURGE_KEEP_DAYS_DOMAINS, default={}): {
+                        cv.string: vol.All(vol.Coerce(int), vol.Range(min=1))
+                    },
+                    vol.Optional(CONF_PURGE_KEEP_DAYS_ENTITIES, default={}): {
+                        cv.entity_id: vol.All(vol.Coerce(int), vol.Range(min=1))
+                    },
                     vol.Optional(CONF_PURGE_INTERVAL, default=1): vol.All(
                         vol.Coerce(int), vol.Range(min=0)
                     ),
@@ -110,6 +142,10 @@ CONFIG_SCHEMA = vol.Schema(
                     vol.Optional(
                         CONF_DB_RETRY_WAIT, default=DEFAULT_DB_RETRY_WAIT
                     ): cv.positive_int,
+                    vol.Optional(CONF_MAX_QUEUE_SIZE, default=0): cv.positive_int,
+                    vol.Optional(
+                        CONF_QUEUE_OVERFLOW, default=QUEUE_OVERFLOW_DROP_NEW
+                    ): vol.In([QUEUE_OVERFLOW_DROP_NEW, QUEUE_OVERFLOW_DROP_OLDEST]),
                 }
             ),
         )
@@ -163,9 +199,13 @@ async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
     conf = config[DOMAIN]
     auto_purge = conf[CONF_AUTO_PURGE]
     keep_days = conf[CONF_PURGE_KEEP_DAYS]
+    keep_days_domains = conf[CONF_PURGE_KEEP_DAYS_DOMAINS]
+    keep_days_entities = conf[CONF_PURGE_KEEP_DAYS_ENTITIES]
     commit_interval = conf[CONF_COMMIT_INTERVAL]
     db_max_retries = conf[CONF_DB_MAX_RETRIES]
     db_retry_wait = conf[CONF_DB_RETRY_WAIT]
+    max_queue_size = conf[CONF_MAX_QUEUE_SIZE]
+    queue_overflow = conf[CONF_QUEUE_OVERFLOW]
 
     db_url = conf.get(CONF_DB_URL)
     if not db_url:
@@ -177,12 +217,16 @@ async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
         hass=hass,
         auto_purge=auto_purge,
         keep_days=keep_days,
+        keep_days_domains=keep_days_domains,
+        keep_days_entities=keep_days_entities,
         commit_interval=commit_interval,
         uri=db_url,
         db_max_retries=db_max_retries,
         db_retry_wait=db_retry_wait,
         include=include,
         exclude=exclude,
+        max_queue_size=max_queue_size,
+        queue_overflow=queue_overflow,
     )
     instance.async_initialize()
     instance.start()
@@ -195,12 +239,68 @@ async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
         DOMAIN, SERVICE_PURGE, async_handle_purge_service, schema=SERVICE_PURGE_SCHEMA
     )
 
+    hass.components.websocket_api.async_register_command(websocket_info)
+
     return await instance.async_db_ready
 
 
+@callback
+@websocket_api.require_admin
+@websocket_api.websocket_command({vol.Required("type"): "recorder/info"})
+def websocket_info(hass, connection, msg):
+    """Return statistics about the recorder queue and writes."""
+    instance = hass.data[DATA_INSTANCE]
+
+    connection.send_result(
+        msg["id"],
+        {
+            "backlog": instance.queue.qsize(),
+            "max_backlog": instance.queue.max_events,
+            "events_dropped": instance.queue.dropped,
+            "last_batch_size": instance.last_batch_size,
+            "last_commit_latency": instance.last_commit_latency,
+            "thread_running": instance.is_alive(),
+            "purge": instance.purge_progress and instance.purge_progress.as_dict(),
+        },
+    )
+
+
 PurgeTask = namedtuple("PurgeTask", ["keep_days", "repack"])
 
 
+class RecorderQueue(queue.Queue):
+    """Queue that sheds events once it holds max_events items.
+
+    Only events are shed, purge tasks and the stop marker are always queued.
+    """
+
+    def __init__(self, max_events: int = 0, drop_oldest: bool = False) -> None:
+        """Initialize the queue, max_events of 0 means unbounded."""
+        super().__init__()
+        self.max_events = max_events
+        self.drop_oldest = drop_oldest
+        self.dropped = 0
+
+    def put_event(self, event: Event) -> None:
+        """Put an event in the queue, shedding an event if it is full."""
+        with self.mutex:
+            if self.max_events and self._qsize() >= self.max_events:
+                self.dropped += 1
+
+                if not self.drop_oldest:
+                    return
+
+                for idx, item in enumerate(self.queue):
+                    if isinstance(item, Event):
+                        del self.queue[idx]
+                        self.unfinished_tasks -= 1
+                        break
+
+            self._put(event)
+            self.unfinished_tasks += 1
+            self.not_empty.notify()
+
+
 class Recorder(threading.Thread):
     """A threaded recorder class."""
 
@@ -215,6 +315,10 @@ class Recorder(threading.Thread):
         db_retry_wait: int,
         include: Dict,
         exclude: Dict,
+        max_queue_size: int = 0,
+        queue_overflow: str = QUEUE_OVERFLOW_DROP_NEW,
+        keep_days_domains: Optional[Dict[str, int]] = None,
+        keep_days_entities: Optional[Dict[str, int]] = None,
     ) -> None:
         """Initialize the recorder."""
         threading.Thread.__init__(self, name="Recorder")
@@ -222,8 +326,12 @@ class Recorder(threading.Thread):
         self.hass = hass
         self.auto_purge = auto_purge
         self.keep_days = keep_days
+        self.keep_days_domains = keep_days_domains or {}
+        self.keep_days_entities = keep_days_entities or {}
         self.commit_interval = commit_interval
-        self.queue: Any = queue.Queue()
+        self.queue: Any = RecorderQueue(
+            max_queue_size, queue_overflow == QUEUE_OVERFLOW_DROP_OLDEST
+        )
         self.recording_start = dt_util.utcnow()
         self.db_url = uri
         self.db_max_retries = db_max_retries
@@ -242,6 +350,17 @@ class Recorder(threading.Thread):
 
         self._timechanges_seen = 0
         self._keepalive_count = 0
+        self._pending_events: List[Event] = []
+        # Events written to the event session but not committed yet
+        self._uncommitted_events: List[Event] = []
+        self.last_batch_size = 0
+        self.last_commit_latency: Optional[float] = None
+        self.purge_progress: Optional[purge.PurgeProgress] = None
+        self._next_aggregate_hour: Optional[datetime] = None
+        # LRU of encoded state attributes to their attributes_id. The
+        # attributes themselves are the key so a hash collision can never
+        # link a state to the wrong attributes.
+        self._attributes_ids: "OrderedDict[str, int]" = OrderedDict()
         self.event_session = None
         self.get_session = None
 
@@ -348,6 +467,8 @@ class Recorder(threading.Thread):
         # Use a session for the event read loop
         # with a commit every time the event time
         # has changed.  This reduces the disk io.
+        # While there is a backlog events are kept
+        # in memory so they can be written in batches.
         while True:
             event = self.queue.get()
             if event is None:
@@ -356,7 +477,17 @@ class Recorder(threading.Thread):
                 self.queue.task_done()
                 return
             if isinstance(event, PurgeTask):
-                purge.purge_old_data(self, event.keep_days, event.repack)
+                # Purge what is on disk, including what is pending
+                self._commit_event_session_or_retry()
+                if self.purge_progress is None or self.purge_progress.finished:
+                    self.purge_progress = purge.PurgeProgress()
+                if not purge.purge_old_data(
+                    self, event.keep_days, event.repack, self.purge_progress
+                ):
+                    # Process the events that came in before the next batch
+                    self.queue.put(event)
+                # Purging may have removed cached state attributes
+                self._attributes_ids.clear()
                 self.queue.task_done()
                 continue
             if event.event_type == EVENT_TIME_CHANGED:
@@ -365,6 +496,7 @@ class Recorder(threading.Thread):
                 if self._keepalive_count >= KEEPALIVE_TIME:
                     self._keepalive_count = 0
                     self._send_keep_alive()
+                self._compile_hourly_aggregates(event.data[ATTR_NOW])
                 if self.commit_interval:
                     self._timechanges_seen += 1
                     if self._timechanges_seen >= self.commit_interval:
@@ -381,29 +513,11 @@ class Recorder(threading.Thread):
                     self.queue.task_done()
                     continue
 
-            try:
-                dbevent = Events.from_event(event)
-                self.event_session.add(dbevent)
-                self.event_session.flush()
-            except (TypeError, ValueError):
-                _LOGGER.warning("Event is not JSON serializable: %s", event)
-            except Exception as err:  # pylint: disable=broad-except
-                # Must catch the exception to prevent the loop from collapsing
-                _LOGGER.exception("Error adding event: %s", err)
-
-            if dbevent and event.event_type == EVENT_STATE_CHANGED:
-                try:
-                    dbstate = States.from_event(event)
-                    dbstate.event_id = dbevent.event_id
-                    self.event_session.add(dbstate)
-                except (TypeError, ValueError):
-                    _LOGGER.warning(
-                        "State is not JSON serializable: %s",
-                        event.data.get("new_state"),
-                    )
-                except Exception as err:  # pylint: disable=broad-except
-                    # Must catch the exception to prevent the loop from collapsing
-                    _LOGGER.exception("Error adding state change: %s", err)
+            self._pending_events.append(event)
+
+            # Write in batches while there is a backlog
+            if self.queue.qsize() == 0 or len(self._pending_events) >= MAX_BATCH_SIZE:
+                self._write_pending_events()
 
             # If they do not have a commit interval
             # than we commit right away
@@ -412,6 +526,190 @@ class Recorder(threading.Thread):
 
             self.queue.task_done()
 
+    def _write_pending_events(self):
+        """Write the pending events and their states to the event session.
+
+        If the batch can not be written, the session is rolled back and the
+        events since the last commit are written and committed one at a
+        time, so only the events that fail are dropped.
+        """
+        pending_events = self._pending_events
+        if not pending_events:
+            return
+
+        self._pending_events = []
+        self.last_batch_size = len(pending_events)
+
+        try:
+            self._write_events(pending_events)
+        except Exception as err:  # pylint: disable=broad-except
+            # Must catch the exception to prevent the loop from collapsing
+            _LOGGER.error("Error adding events, adding them one by one: %s", err)
+        else:
+            self._uncommitted_events.extend(pending_events)
+            return
+
+        # The rollback also discards the batches written since the last commit
+        retry_events = self._uncommitted_events + pending_events
+        self._uncommitted_events = []
+        self._rollback_event_session()
+
+        for event in retry_events:
+            try:
+                self._write_events([event])
+                self.event_session.commit()
+            except Exception as err:  # pylint: disable=broad-except
+                # Must catch the exception to prevent the loop from collapsing
+                _LOGGER.exception("Error adding event %s: %s", event, err)
+                self._rollback_event_session()
+
+    def _write_events(self, pending_events):
+        """Write events and their states to the event session.
+
+        Events without a state and the states are inserted with a single
+        executemany each. The states reference the ids of their event and
+        attributes, so events of state changes and state attributes that are
+        not in the database yet are inserted with one INSERT per row to fetch
+        the ids of the new rows.
+        """
+        events = []
+        state_events = []
+        states = []
+
+        for event in pending_events:
+            try:
+                dbevent = Events.from_event(event)
+            except (TypeError, ValueError):
+                _LOGGER.warning("Event is not JSON serializable: %s", event)
+                continue
+
+            if event.event_type != EVENT_STATE_CHANGED:
+                events.append(dbevent)
+                continue
+
+            state_events.append(dbevent)
+            try:
+                states.append(
+                    (
+                        dbevent,
+                        States.from_event(event),
+                        StateAttributes.shared_attrs_from_event(event),
+                    )
+                )
+            except (TypeError, ValueError):
+                _LOGGER.warning(
+                    "State is not JSON serializable: %s", event.data.get("new_state"),
+                )
+
+        if events:
+            self.event_session.bulk_save_objects(events)
+
+        attributes_ids = {}
+        new_attributes = {}
+        for _, _, shared_attrs in states:
+            if shared_attrs in attributes_ids or shared_attrs in new_attributes:
+                continue
+            attributes_id = self._get_attributes_id(shared_attrs)
+            if attributes_id is None:
+                new_attributes[shared_attrs] = StateAttributes.from_shared_attrs(
+                    shared_attrs
+                )
+            else:
+                attributes_ids[shared_attrs] = attributes_id
+
+        # return_defaults sets the ids of the inserted rows on the objects,
+        # which needs one INSERT per row
+        if state_events:
+            self.event_session.bulk_save_objects(state_events, return_defaults=True)
+        if new_attributes:
+            self.event_session.bulk_save_objects(
+                list(new_attributes.values()), return_defaults=True
+            )
+
+        for shared_attrs, dbattrs in new_attributes.items():
+            attributes_ids[shared_attrs] = dbattrs.attributes_id
+            self._cache_attributes_id(shared_attrs, dbattrs.attributes_id)
+
+        for dbevent, dbstate, shared_attrs in states:
+            dbstate.event_id = dbevent.event_id
+            dbstate.attributes_id = attributes_ids[shared_attrs]
+
+        if states:
+            self.event_session.bulk_save_objects([dbstate for _, dbstate, _ in states])
+
+    def _rollback_event_session(self):
+        """Roll back the event session after a failed write."""
+        # Ids of attributes added since the last commit are not stored
+        self._attributes_ids.clear()
+        try:
+            self.event_session.rollback()
+        except Exception as err:  # pylint: disable=broad-except
+            # Must catch the exception to prevent the loop from collapsing
+            _LOGGER.exception("Error while rolling back event session: %s", err)
+
+    def _get_attributes_id(self, shared_attrs):
+        """Return the id of stored state attributes or None if not stored."""
+        attributes_id = self._attributes_ids.get(shared_attrs)
+        if attributes_id is not None:
+            self._attributes_ids.move_to_end(shared_attrs)
+            return attributes_id
+
+        query = self.event_session.query(
+            StateAttributes.attributes_id, StateAttributes.shared_attrs
+        ).filter(
+            StateAttributes.hash == StateAttributes.hash_shared_attrs(shared_attrs)
+        )
+
+        for attributes_id, stored_shared_attrs in query:
+            if stored_shared_attrs == shared_attrs:
+                self._cache_attributes_id(shared_attrs, attributes_id)
+                return attributes_id
+
+        return None
+
+    def _cache_attributes_id(self, shared_attrs, attributes_id):
+        """Remember the id of stored state attributes."""
+        self._attributes_ids[shared_attrs] = attributes_id
+        if len(self._attributes_ids) > STATE_ATTRIBUTES_CACHE_SIZE:
+            self._attributes_ids.popitem(last=False)
+
+    def _compile_hourly_aggregates(self, now):
+        """Compile the hourly aggregates of the hours that have ended."""
+        hour_start = dt_util.as_utc(now).replace(minute=0, second=0, microsecond=0)
+
+        try:
+            if self._next_aggregate_hour is None:
+                last_start = self.event_session.query(
+                    func.max(StatesHourlyRuns.start)
+                ).scalar()
+                if last_start is None:
+                    self._next_aggregate_hour = self.recording_start.replace(
+                        minute=0, second=0, microsecond=0
+                    )
+                else:
+                    self._next_aggregate_hour = (
+                        process_timestamp(last_start) + aggregate.HOUR
+                    )
+
+            if self._next_aggregate_hour >= hour_start:
+                return
+
+            # Do not compile more than a backlog of hours when time jumps
+            self._next_aggregate_hour = max(
+                self._next_aggregate_hour, hour_start - MAX_AGGREGATE_BACKLOG
+            )
+            self._write_pending_events()
+
+            while self._next_aggregate_hour < hour_start:
+                aggregate.compile_hourly_aggregates(
+                    self.event_session, self._next_aggregate_hour
+                )
+                self._next_aggregate_hour += aggregate.HOUR
+        except Exception as err:  # pylint: disable=broad-except
+            # Must catch the exception to prevent the loop from collapsing
+            _LOGGER.exception("Error compiling hourly aggregates: %s", err)
+            self._next_aggregate_hour = hour_start
+
     def _send_keep_alive(self):
         try:
             _LOGGER.debug("Sending keepalive")
@@ -462,11 +760,7 @@ class Recorder(threading.Thread):
         self._reopen_event_session()
 
     def _reopen_event_session(self):
-        try:
-            self.event_session.rollback()
-        except Exception as err:  # pylint: disable=broad-except
-            # Must catch the exception to prevent the loop from collapsing
-            _LOGGER.exception("Error while rolling back event session: %s", err)
+        self._rollback_event_session()
 
         try:
             self.event_session.close()
@@ -481,17 +775,24 @@ class Recorder(threading.Thread):
             _LOGGER.exception("Error while creating new event session: %s", err)
 
     def _commit_event_session(self):
+        start = time.monotonic()
         try:
+            self._write_pending_events()
             self.event_session.commit()
         except Exception as err:
             _LOGGER.error("Error executing query: %s", err)
             self.event_session.rollback()
+            self._attributes_ids.clear()
             raise
+        finally:
+            self._uncommitted_events = []
+
+        self.last_commit_latency = time.monotonic() - start
 
     @callback
     def event_listener(self, event):
         """Listen for new events and put them in the process queue."""
-        self.queue.put(event)
+        self.queue.put_event(event)
 
     def block_till_done(self):
         """Block till all events processed."""
@@ -0,0 +1,248 @@
+"""Aggregate numeric states into buckets of time."""
+from datetime import datetime, timedelta
+import logging
+import math
+from typing import Dict, List, Optional, Set
+
+from .models import States, StatesHourly, StatesHourlyRuns, process_timestamp
+
+_LOGGER = logging.getLogger(__name__)
+
+HOUR = timedelta(hours=1)
+
+
+def state_to_float(state: Optional[str]) -> Optional[float]:
+    """Return the numeric value of a state or None if it is not numeric."""
+    try:
+        value = float(state)  # type: ignore
+    except (TypeError, ValueError):
+        return None
+
+    if math.isnan(value) or math.isinf(value):
+        return None
+
+    return value
+
+
+class Bucket:
+    """Aggregate of the numeric values of an entity during a period.
+
+    min, max and last are those of the values in effect during the period,
+    including the value carried in from before it. sum and count are those
+    of the states recorded during the period. The duration is the number of
+    seconds the entity had a numeric value.
+    """
+
+    __slots__ = (
+        "start",
+        "min",
+        "max",
+        "sum",
+        "count",
+        "last",
+        "weighted_sum",
+        "duration",
+    )
+
+    def __init__(self, start: datetime) -> None:
+        """Initialize an empty bucket."""
+        self.start = start
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+        self.sum = 0.0
+        self.count = 0
+        self.last: Optional[float] = None
+        self.weighted_sum = 0.0
+        self.duration = 0.0
+
+    @property
+    def mean(self) -> Optional[float]:
+        """Return the mean of the states recorded during the period."""
+        return self.sum / self.count if self.count else None
+
+    @property
+    def time_weighted_mean(self) -> Optional[float]:
+        """Return the mean of the values weighted by how long they lasted."""
+        return self.weighted_sum / self.duration if self.duration else None
+
+    @property
+    def has_data(self) -> bool:
+        """Return if the entity had a numeric value during the period."""
+        return self.min is not None
+
+    def _add_value(self, value: float) -> None:
+        """Add a value that was in effect during the period."""
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+        self.last = value
+
+    def add_state(self, value: Optional[float]) -> None:
+        """Add a state recorded during the period, None if not numeric."""
+        if value is None:
+            self.last = None
+            return
+
+        self._add_value(value)
+        self.sum += value
+        self.count += 1
+
+    def add_duration(self, value: float, seconds: float) -> None:
+        """Add a value that lasted a number of seconds of the period."""
+        self._add_value(value)
+        self.weighted_sum += value * seconds
+        self.duration += seconds
+
+    def merge(self, other: "Bucket") -> None:
+        """Merge the aggregate of a later part of the period."""
+        if other.min is not None and (self.min is None or other.min < self.min):
+            self.min = other.min
+        if other.max is not None and (self.max is None or other.max > self.max):
+            self.max = other.max
+        self.sum += other.sum
+        self.count += other.count
+        self.last = other.last
+        self.weighted_sum += other.weighted_sum
+        self.duration += other.duration
+
+    @staticmethod
+    def from_hourly(row: StatesHourly) -> "Bucket":
+        """Create a bucket from a row of hourly aggregates."""
+        bucket = Bucket(process_timestamp(row.start))
+        bucket.min = row.min
+        bucket.max = row.max
+        bucket.sum = row.sum
+        bucket.count = row.count
+        bucket.last = row.last
+        bucket.weighted_sum = row.weighted_sum
+        bucket.duration = row.duration
+        return bucket
+
+    def as_dict(self) -> dict:
+        """Return a dictionary representation of the aggregate."""
+        return {
+            "start": self.start.isoformat(),
+            "min": self.min,
+            "max": self.max,
+            "mean": self.mean,
+            "time_weighted_mean": self.time_weighted_mean,
+            "last": self.last,
+            "count": self.count,
+        }
+
+
+class BucketAggregator:
+    """Aggregate the states of an entity into buckets of equal width.
+
+    States must be added in the order they were recorded.
+    """
+
+    def __init__(self, start: datetime, end: datetime, width: timedelta) -> None:
+        """Initialize the aggregator."""
+        self._start = start
+        self._end = end
+        self._width = width
+        self._buckets: Dict[int, Bucket] = {}
+        self._value: Optional[float] = None
+        self._since = start
+
+    def _bucket(self, when: datetime) -> Bucket:
+        """Return the bucket a point in time belongs to."""
+        index = int((when - self._start) / self._width)
+        bucket = self._buckets.get(index)
+        if bucket is None:
+            bucket = self._buckets[index] = Bucket(self._start + index * self._width)
+        return bucket
+
+    def _advance(self, until: datetime) -> None:
+        """Add the duration of the current value up to a point in time."""
+        until = min(until, self._end)
+        if self._value is None:
+            self._since = max(self._since, until)
+            return
+
+        while self._since < until:
+            bucket = self._bucket(self._since)
+            bucket_end = min(bucket.start + self._width, until)
+            bucket.add_duration(self._value, (bucket_end - self._since).total_seconds())
+            self._since = bucket_end
+
+    def carry(self, value: Optional[float], when: datetime) -> None:
+        """Set the value the entity had at a point in time before any states."""
+        self._since = max(when, self._start)
+        self._value = value
+
+    def add(self, state: Optional[str], when: datetime) -> None:
+        """Add a state recorded at a point in time."""
+        if when < self._start:
+            self.carry(state_to_float(state), when)
+            return
+
+        self._advance(when)
+        self._value = state_to_float(state)
+        if when < self._end:
+            self._bucket(when).add_state(self._value)
+
+    def finish(self, until: datetime) -> List[Bucket]:
+        """Add the duration of the last value and return the buckets."""
+        self._advance(until)
+        return [
+            self._buckets[index]
+            for index in sorted(self._buckets)
+            if self._buckets[index].has_data
+        ]
+
+
+def compile_hourly_aggregates(session, hour_start: datetime) -> int:
+    """Compile the aggregates of the hour that starts at hour_start.
+
+    The value an entity has when the hour starts is the last value of the
+    aggregate of the hour before. The hour is recorded as compiled, also
+    when there are no aggregates. Returns the number of rows added.
+    """
+    hour_end = hour_start + HOUR
+    aggregators: Dict[str, BucketAggregator] = {}
+
+    for entity_id, last in session.query(
+        StatesHourly.entity_id, StatesHourly.last
+    ).filter(StatesHourly.start == hour_start - HOUR):
+        if last is not None:
+            aggregator = aggregators[entity_id] = BucketAggregator(
+                hour_start, hour_end, HOUR
+            )
+            aggregator.carry(last, hour_start)
+
+    query = (
+        session.query(States.entity_id, States.state, States.last_updated)
+        .filter((States.last_updated >= hour_start) & (States.last_updated < hour_end))
+        .order_by(States.entity_id, States.last_updated)
+    )
+    for entity_id, state, last_updated in query:
+        aggregator = aggregators.get(entity_id)
+        if aggregator is None:
+            aggregator = aggregators[entity_id] = BucketAggregator(
+                hour_start, hour_end, HOUR
+            )
+        aggregator.add(state, process_timestamp(last_updated))
+
+    rows = [
+        StatesHourly.from_bucket(entity_id, bucket)
+        for entity_id, aggregator in aggregators.items()
+        for bucket in aggregator.finish(hour_end)
+    ]
+    session.bulk_save_objects(rows)
+    session.add(StatesHourlyRuns(start=hour_start))
+
+    _LOGGER.debug("Compiled %s hourly aggregates of %s", len(rows), hour_start)
+    return len(rows)
+
+
+def compiled_hours(session, start: datetime, end: datetime) -> Set[datetime]:
+    """Return the starts of the compiled hours between start and end."""
+    return {
+        process_timestamp(hour_start)
+        for hour_start, in session.query(StatesHourlyRuns.start).filter(
+            (StatesHourlyRuns.start >= start) & (StatesHourlyRuns.start < end)
+        )
+    }
@@ -249,6 +249,16 @@ def _apply_update(engine, new_version, old_version):
     elif new_version == 7:
         _create_index(engine, "states", "ix_states_entity_id")
     elif new_version == 8:
+        # The state_attributes table is created with the other missing
+        # tables when the connection is set up. Existing states keep their
+        # inline attributes.
+        _add_columns(engine, "states", ["attributes_id INTEGER"])
+        _create_index(engine, "states", "ix_states_attributes_id")
+    elif new_version == 9:
+        # The states_hourly table is created with the other missing tables
+        # when the connection is set up.
+        pass
+    elif new_version == 10:
         # Pending migration, want to group a few.
         pass
         # _add_columns(engine, "events", [
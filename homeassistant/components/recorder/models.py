@@ -1,11 +1,14 @@
 """Models for SQLAlchemy."""
+import hashlib
 import json
 import logging
 
 from sqlalchemy import (
+    BigInteger,
     Boolean,
     Column,
     DateTime,
+    Float,
     ForeignKey,
     Index,
     Integer,
@@ -14,8 +17,10 @@ from sqlalchemy import (
     distinct,
 )
 from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.orm import relationship
 from sqlalchemy.orm.session import Session
 
+from homeassistant.const import EVENT_STATE_CHANGED
 from homeassistant.core import Context, Event, EventOrigin, State, split_entity_id
 from homeassistant.helpers.json import JSONEncoder
 import homeassistant.util.dt as dt_util
@@ -24,7 +29,7 @@ import homeassistant.util.dt as dt_util
 # pylint: disable=invalid-name
 Base = declarative_base()
 
-SCHEMA_VERSION = 7
+SCHEMA_VERSION = 9
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -47,10 +52,25 @@ class Events(Base):  # type: ignore
 
     @staticmethod
     def from_event(event):
-        """Create an event database object from a native event."""
+        """Create an event database object from a native event.
+
+        The states of state_changed events are stored without their
+        attributes, these are stored once in StateAttributes.
+        """
+        if event.event_type == EVENT_STATE_CHANGED:
+            event_data = json.dumps(
+                _strip_state_attributes(event.data), cls=JSONEncoder
+            )
+        else:
+            try:
+                event_data = event.data_as_json()
+            except ValueError:
+                # NaN and infinity are only valid in the JSON of the database
+                event_data = json.dumps(event.data, cls=JSONEncoder)
+
         return Events(
             event_type=event.event_type,
-            event_data=json.dumps(event.data, cls=JSONEncoder),
+            event_data=event_data,
             origin=str(event.origin),
             time_fired=event.time_fired,
             context_id=event.context.id,
@@ -75,6 +95,60 @@ class Events(Base):  # type: ignore
             return None
 
 
+def _strip_state_attributes(data):
+    """Return the data of a state_changed event without state attributes."""
+    stripped = dict(data)
+    for key in ("old_state", "new_state"):
+        state = data.get(key)
+        if isinstance(state, State):
+            stripped[key] = {
+                name: value
+                for name, value in state.as_read_only_dict().items()
+                if name != "attributes"
+            }
+    return stripped
+
+
+class StateAttributes(Base):  # type: ignore
+    """State attributes, shared by all states with the same attributes."""
+
+    __tablename__ = "state_attributes"
+    attributes_id = Column(Integer, primary_key=True)
+    hash = Column(BigInteger, index=True)
+    shared_attrs = Column(Text)
+
+    @staticmethod
+    def from_shared_attrs(shared_attrs):
+        """Create a state attributes database object from encoded attributes."""
+        return StateAttributes(
+            hash=StateAttributes.hash_shared_attrs(shared_attrs),
+            shared_attrs=shared_attrs,
+        )
+
+    @staticmethod
+    def shared_attrs_from_event(event):
+        """Return the JSON encoded attributes of a state_changed event."""
+        state = event.data.get("new_state")
+
+        # State got deleted
+        if state is None:
+            return "{}"
+
+        try:
+            return state.attributes_as_json()
+        except ValueError:
+            return json.dumps(dict(state.attributes), cls=JSONEncoder)
+
+    @staticmethod
+    def hash_shared_attrs(shared_attrs):
+        """Return a stable signed 64 bit hash of encoded attributes."""
+        return int.from_bytes(
+            hashlib.blake2b(shared_attrs.encode("utf-8"), digest_size=8).digest(),
+            "big",
+            signed=True,
+        )
+
+
 class States(Base):  # type: ignore
     """State change history."""
 
@@ -83,7 +157,11 @@ class States(Base):  # type: ignore
     domain = Column(String(64))
     entity_id = Column(String(255), index=True)
     state = Column(String(255))
+    # Only set for states recorded before schema version 8
     attributes = Column(Text)
+    attributes_id = Column(
+        Integer, ForeignKey("state_attributes.attributes_id"), index=True
+    )
     event_id = Column(Integer, ForeignKey("events.event_id"), index=True)
     last_changed = Column(DateTime(timezone=True), default=dt_util.utcnow)
     last_updated = Column(DateTime(timezone=True), default=dt_util.utcnow, index=True)
@@ -91,6 +169,7 @@ class States(Base):  # type: ignore
     context_id = Column(String(36), index=True)
     context_user_id = Column(String(36), index=True)
     # context_parent_id = Column(String(36), index=True)
+    state_attributes = relationship(StateAttributes)
 
     __table_args__ = (
         # Used for fetching the state of entities at a specific time
@@ -100,7 +179,11 @@ class States(Base):  # type: ignore
 
     @staticmethod
     def from_event(event):
-        """Create object from a state_changed event."""
+        """Create object from a state_changed event.
+
+        The attributes are not part of the object, they are stored once in
+        StateAttributes and referenced by attributes_id.
+        """
         entity_id = event.data["entity_id"]
         state = event.data.get("new_state")
 
@@ -115,18 +198,24 @@ class States(Base):  # type: ignore
         if state is None:
             dbstate.state = ""
             dbstate.domain = split_entity_id(entity_id)[0]
-            dbstate.attributes = "{}"
             dbstate.last_changed = event.time_fired
             dbstate.last_updated = event.time_fired
         else:
             dbstate.domain = state.domain
             dbstate.state = state.state
-            dbstate.attributes = json.dumps(dict(state.attributes), cls=JSONEncoder)
             dbstate.last_changed = state.last_changed
             dbstate.last_updated = state.last_updated
 
         return dbstate
 
+    @property
+    def shared_attrs(self):
+        """Return the JSON encoded attributes of the state."""
+        if self.state_attributes is not None:
+            return self.state_attributes.shared_attrs
+
+        return self.attributes
+
     def to_native(self):
         """Convert to an HA state object."""
         context = Context(id=self.context_id, user_id=self.context_user_id)
@@ -134,7 +223,7 @@ class States(Base):  # type: ignore
             return State(
                 self.entity_id,
                 self.state,
-                json.loads(self.attributes),
+                json.loads(self.shared_attrs),
                 process_timestamp(self.last_changed),
                 process_timestamp(self.last_updated),
                 context=context,
@@ -148,6 +237,47 @@ class States(Base):  # type: ignore
             return None
 
 
+class StatesHourly(Base):  # type: ignore
+    """Hourly aggregates of the numeric states of an entity."""
+
+    __tablename__ = "states_hourly"
+    id = Column(Integer, primary_key=True)
+    entity_id = Column(String(255))
+    start = Column(DateTime(timezone=True), index=True)
+    min = Column(Float)
+    max = Column(Float)
+    sum = Column(Float)
+    count = Column(Integer)
+    last = Column(Float)
+    weighted_sum = Column(Float)
+    duration = Column(Float)
+
+    __table_args__ = (Index("ix_states_hourly_entity_id_start", "entity_id", "start"),)
+
+    @staticmethod
+    def from_bucket(entity_id, bucket):
+        """Create an hourly aggregate database object from a bucket."""
+        return StatesHourly(
+            entity_id=entity_id,
+            start=bucket.start,
+            min=bucket.min,
+            max=bucket.max,
+            sum=bucket.sum,
+            count=bucket.count,
+            last=bucket.last,
+            weighted_sum=bucket.weighted_sum,
+            duration=bucket.duration,
+        )
+
+
+class StatesHourlyRuns(Base):  # type: ignore
+    """Hours of which the hourly aggregates have been compiled."""
+
+    __tablename__ = "states_hourly_runs"
+    run_id = Column(Integer, primary_key=True)
+    start = Column(DateTime(timezone=True), index=True)
+
+
 class RecorderRuns(Base):  # type: ignore
     """Representation of recorder run."""
 
@@ -1,37 +1,105 @@
 """Purge old data helper."""
 from datetime import timedelta
 import logging
+import time
 
+from sqlalchemy import and_, exists
 from sqlalchemy.exc import SQLAlchemyError
 
 import homeassistant.util.dt as dt_util
 
-from .models import Events, States
+from .models import Events, StateAttributes, States, StatesHourly, StatesHourlyRuns
 from .util import session_scope
 
 _LOGGER = logging.getLogger(__name__)
 
+# Rows deleted from a table in one batch, this stays below the bind
+# variable limit of SQLite as the ids are deleted with an IN clause.
+MAX_ROWS_TO_PURGE = 998
+
+
+class PurgeProgress:
+    """Progress of a purge that is done in several batches."""
+
+    def __init__(self):
+        """Initialize the progress."""
+        self.started = time.monotonic()
+        self.duration = 0.0
+        self.deleted_states = 0
+        self.deleted_events = 0
+        self.deleted_state_attributes = 0
+        self.deleted_hourly_aggregates = 0
+        self.finished = False
+
+    @property
+    def deleted_rows(self):
+        """Return the number of rows deleted so far."""
+        return (
+            self.deleted_states
+            + self.deleted_events
+            + self.deleted_state_attributes
+            + self.deleted_hourly_aggregates
+        )
+
+    @property
+    def rows_per_second(self):
+        """Return the number of rows deleted per second spent purging."""
+        if not self.duration:
+            return 0.0
+
+        return self.deleted_rows / self.duration
+
+    def as_dict(self):
+        """Return a dictionary representation of the progress."""
+        return {
+            "deleted_states": self.deleted_states,
+            "deleted_events": self.deleted_events,
+            "deleted_state_attributes": self.deleted_state_attributes,
+            "deleted_hourly_aggregates": self.deleted_hourly_aggregates,
+            "rows_per_second": round(self.rows_per_second, 1),
+            "finished": self.finished,
+        }
+
+
+def purge_old_data(instance, purge_days, repack, progress=None):
+    """Purge a batch of events and states older than purge_days ago.
+
+    Entities and domains with their own number of days to keep are purged
+    according to that instead. Returns True when everything is purged and
+    False when another batch needs to be purged.
+    """
+    if progress is None:
+        progress = PurgeProgress()
 
-def purge_old_data(instance, purge_days, repack):
-    """Purge events and states older than purge_days ago."""
     purge_before = dt_util.utcnow() - timedelta(days=purge_days)
     _LOGGER.debug("Purging events before %s", purge_before)
+    batch_start = time.monotonic()
 
     try:
         with session_scope(session=instance.get_session()) as session:
-            deleted_rows = (
-                session.query(States)
-                .filter(States.last_updated < purge_before)
-                .delete(synchronize_session=False)
-            )
-            _LOGGER.debug("Deleted %s states", deleted_rows)
+            finished = _purge_batch(instance, session, purge_before, progress)
+
+        progress.duration += time.monotonic() - batch_start
 
-            deleted_rows = (
-                session.query(Events)
-                .filter(Events.time_fired < purge_before)
-                .delete(synchronize_session=False)
+        if not finished:
+            _LOGGER.debug(
+                "Purged %s rows so far (%.0f rows/s)",
+                progress.deleted_rows,
+                progress.rows_per_second,
             )
-            _LOGGER.debug("Deleted %s events", deleted_rows)
+            return False
+
+        progress.finished = True
+        _LOGGER.info(
+            "Purged %s states, %s events, %s state attributes and %s hourly "
+            "aggregates in %.1fs (%.0f rows/s)",
+            progress.deleted_states,
+            progress.deleted_events,
+            progress.deleted_state_attributes,
+            progress.deleted_hourly_aggregates,
+            progress.duration,
+            progress.rows_per_second,
+        )
 
         # Execute sqlite vacuum command to free up space on disk
         if repack and instance.engine.driver in ("pysqlite", "postgresql"):
@@ -40,3 +108,151 @@ def purge_old_data(instance, purge_days, repack):
 
     except SQLAlchemyError as err:
         _LOGGER.warning("Error purging history: %s.", err)
+        progress.finished = True
+
+    return True
+
+
+def _purge_batch(instance, session, purge_before, progress):
+    """Delete at most one batch of rows from each table.
+
+    States are deleted together with their events. Events without a state
+    and state attributes are only deleted once all old states are gone.
+    Hourly aggregates are deleted last, together with the record of the
+    hours they were compiled for.
+    """
+    state_ids = []
+    event_ids = []
+    for criteria in _states_to_purge_criteria(instance, purge_before):
+        for state_id, event_id in (
+            session.query(States.state_id, States.event_id)
+            .filter(criteria)
+            .order_by(States.state_id)
+            .limit(MAX_ROWS_TO_PURGE - len(state_ids))
+        ):
+            state_ids.append(state_id)
+            if event_id is not None:
+                event_ids.append(event_id)
+
+        if len(state_ids) == MAX_ROWS_TO_PURGE:
+            break
+
+    if state_ids:
+        progress.deleted_states += (
+            session.query(States)
+            .filter(States.state_id.in_(state_ids))
+            .delete(synchronize_session=False)
+        )
+        _LOGGER.debug("Deleted %s states", len(state_ids))
+
+    if event_ids:
+        progress.deleted_events += (
+            session.query(Events)
+            .filter(Events.event_id.in_(event_ids))
+            .delete(synchronize_session=False)
+        )
+
+    if len(state_ids) == MAX_ROWS_TO_PURGE:
+        return False
+
+    # States of entities that are kept longer keep their events
+    event_ids = [
+        event_id
+        for event_id, in session.query(Events.event_id)
+        .filter(Events.time_fired < purge_before)
+        .filter(~exists().where(States.event_id == Events.event_id))
+        .order_by(Events.event_id)
+        .limit(MAX_ROWS_TO_PURGE)
+    ]
+
+    if event_ids:
+        progress.deleted_events += (
+            session.query(Events)
+            .filter(Events.event_id.in_(event_ids))
+            .delete(synchronize_session=False)
+        )
+        _LOGGER.debug("Deleted %s events", len(event_ids))
+
+    if len(event_ids) == MAX_ROWS_TO_PURGE:
+        return False
+
+    attributes_ids = [
+        attributes_id
+        for attributes_id, in session.query(StateAttributes.attributes_id)
+        .filter(~exists().where(States.attributes_id == StateAttributes.attributes_id))
+        .order_by(StateAttributes.attributes_id)
+        .limit(MAX_ROWS_TO_PURGE)
+    ]
+
+    if attributes_ids:
+        progress.deleted_state_attributes += (
+            session.query(StateAttributes)
+            .filter(StateAttributes.attributes_id.in_(attributes_ids))
+            .delete(synchronize_session=False)
+        )
+        _LOGGER.debug("Deleted %s state attributes", len(attributes_ids))
+
+    if len(attributes_ids) == MAX_ROWS_TO_PURGE:
+        return False
+
+    hourly_ids = [
+        hourly_id
+        for hourly_id, in session.query(StatesHourly.id)
+        .filter(StatesHourly.start < purge_before)
+        .order_by(StatesHourly.id)
+        .limit(MAX_ROWS_TO_PURGE)
+    ]
+
+    if hourly_ids:
+        progress.deleted_hourly_aggregates += (
+            session.query(StatesHourly)
+            .filter(StatesHourly.id.in_(hourly_ids))
+            .delete(synchronize_session=False)
+        )
+        _LOGGER.debug("Deleted %s hourly aggregates", len(hourly_ids))
+
+    if len(hourly_ids) == MAX_ROWS_TO_PURGE:
+        return False
+
+    session.query(StatesHourlyRuns).filter(
+        StatesHourlyRuns.start < purge_before
+    ).delete(synchronize_session=False)
+
+    return True
+
+
+def _states_to_purge_criteria(instance, purge_before):
+    """Return the criteria of states to purge for each retention period.
+
+    Days to keep of an entity take precedence over those of its domain.
+    """
+    now = dt_util.utcnow()
+    keep_days_entities = instance.keep_days_entities
+    keep_days_domains = instance.keep_days_domains
+    criteria = []
+
+    for entity_id, keep_days in keep_days_entities.items():
+        criteria.append(
+            and_(
+                States.entity_id == entity_id,
+                States.last_updated < now - timedelta(days=keep_days),
+            )
+        )
+
+    for domain, keep_days in keep_days_domains.items():
+        domain_criteria = and_(
+            States.domain == domain,
+            States.last_updated < now - timedelta(days=keep_days),
+        )
+        if keep_days_entities:
+            domain_criteria &= ~States.entity_id.in_(list(keep_days_entities))
+        criteria.append(domain_criteria)
+
+    default_criteria = States.last_updated < purge_before
+    if keep_days_domains:
+        default_criteria &= ~States.domain.in_(list(keep_days_domains))
+    if keep_days_entities:
+        default_criteria &= ~States.entity_id.in_(list(keep_days_entities))
+    criteria.append(default_criteria)
+
+    return criteria
@@ -1,4 +1,5 @@
 """Allows the creation of a sensor that breaks out state_attributes."""
+from functools import partial
 import logging
 from typing import Optional
 
@@ -20,15 +21,17 @@ from homeassistant.const import (
     CONF_SENSORS,
     CONF_VALUE_TEMPLATE,
     EVENT_HOMEASSISTANT_START,
-    MATCH_ALL,
 )
 from homeassistant.core import callback
 from homeassistant.exceptions import TemplateError
 import homeassistant.helpers.config_validation as cv
 from homeassistant.helpers.entity import Entity, async_generate_entity_id
-from homeassistant.helpers.event import async_track_state_change
+from homeassistant.helpers.event import (
+    async_track_state_change,
+    async_track_template_result,
+)
 
-from . import extract_entities, initialise_templates
+from . import initialise_templates
 from .const import CONF_AVAILABILITY_TEMPLATE
 
 CONF_ATTRIBUTE_TEMPLATES = "attribute_templates"
@@ -81,13 +84,7 @@ async def async_setup_platform(hass, config, async_add_entities, discovery_info=
         }
 
         initialise_templates(hass, templates, attribute_templates)
-        entity_ids = extract_entities(
-            device,
-            "sensor",
-            device_config.get(ATTR_ENTITY_ID),
-            templates,
-            attribute_templates,
-        )
+        entity_ids = device_config.get(ATTR_ENTITY_ID)
 
         sensors.append(
             SensorTemplate(
@@ -158,21 +155,87 @@ class SensorTemplate(Entity):
             """Handle device state changes."""
             self.async_schedule_update_ha_state(True)
 
+        def template_sensor_result_listener(update):
+            """Return a listener applying new results of a template."""
+
+            @callback
+            def result_listener(event, last_result, result):
+                """Write a new result of the template to the state."""
+                if result == last_result:
+                    return
+
+                update(result)
+                self.async_write_ha_state()
+
+            return result_listener
+
         @callback
         def template_sensor_startup(event):
             """Update template on startup."""
-            if self._entities != MATCH_ALL:
-                # Track state change only for valid templates
-                async_track_state_change(
-                    self.hass, self._entities, template_sensor_state_listener
+            if self._entities is not None:
+                self.async_on_remove(
+                    async_track_state_change(
+                        self.hass, self._entities, template_sensor_state_listener
+                    )
+                )
+                self.async_schedule_update_ha_state(True)
+                return
+
+            # Track the states each template used when it was last rendered
+            results = []
+            untracked = []
+            for name, template, update in self._template_updates():
+                info = async_track_template_result(
+                    self.hass, template, template_sensor_result_listener(update)
                 )
+                self.async_on_remove(info.async_remove)
+                results.append((update, info.last_result))
+                if not info.tracks_states:
+                    untracked.append(name)
 
-            self.async_schedule_update_ha_state(True)
+            if untracked:
+                _LOGGER.warning(
+                    "Template sensor '%s' has no entity ids configured to track nor"
+                    " were we able to extract the entities to track from the %s "
+                    "template(s). These templates will only be able to be updated "
+                    "manually.",
+                    self._name,
+                    ", ".join(untracked),
+                )
+
+            for update, result in results:
+                update(result)
+
+            self.async_write_ha_state()
 
         self.hass.bus.async_listen_once(
             EVENT_HOMEASSISTANT_START, template_sensor_startup
         )
 
+    def _template_updates(self):
+        """Return the templates of the sensor by name and how to apply results.
+
+        The availability template comes last as it overrides the availability
+        set by the value template.
+        """
+        updates = [("value", self._template, self._update_state)]
+        for key, template in self._attribute_templates.items():
+            updates.append((key, template, partial(self._update_attribute, key)))
+
+        templates = {
+            "_icon": ("icon", self._icon_template),
+            "_entity_picture": ("entity_picture", self._entity_picture_template),
+            "_name": ("friendly_name", self._friendly_name_template),
+            "_available": ("availability", self._availability_template),
+        }
+        for property_name, (name, template) in templates.items():
+            if template is not None:
+                updates.append(
+                    (name, template, partial(self._update_property, property_name))
+                )
+
+        return updates
+
     @property
     def name(self):
         """Return the name of the sensor."""
@@ -220,66 +283,70 @@ class SensorTemplate(Entity):
 
     async def async_update(self):
         """Update the state from the template."""
-        try:
-            self._state = self._template.async_render()
-            self._available = True
-        except TemplateError as ex:
-            self._available = False
-            if ex.args and ex.args[0].startswith(
-                "UndefinedError: 'None' has no attribute"
-            ):
-                # Common during HA startup - so just a warning
-                _LOGGER.warning(
-                    "Could not render template %s, the state is unknown.", self._name
-                )
-            else:
-                self._state = None
-                _LOGGER.error("Could not render template %s: %s", self._name, ex)
-
-        attrs = {}
-        for key, value in self._attribute_templates.items():
-            try:
-                attrs[key] = value.async_render()
-            except TemplateError as err:
-                _LOGGER.error("Error rendering attribute %s: %s", key, err)
-
-        self._attributes = attrs
-
-        templates = {
-            "_icon": self._icon_template,
-            "_entity_picture": self._entity_picture_template,
-            "_name": self._friendly_name_template,
-            "_available": self._availability_template,
-        }
-
-        for property_name, template in templates.items():
-            if template is None:
-                continue
-
+        self._attributes = {}
+        for _, template, update in self._template_updates():
             try:
-                value = template.async_render()
-                if property_name == "_available":
-                    value = value.lower() == "true"
-                setattr(self, property_name, value)
+                result = template.async_render()
             except TemplateError as ex:
-                friendly_property_name = property_name[1:].replace("_", " ")
-                if ex.args and ex.args[0].startswith(
-                    "UndefinedError: 'None' has no attribute"
-                ):
-                    # Common during HA startup - so just a warning
-                    _LOGGER.warning(
-                        "Could not render %s template %s, the state is unknown.",
-                        friendly_property_name,
-                        self._name,
-                    )
-                    continue
-
-                try:
-                    setattr(self, property_name, getattr(super(), property_name))
-                except AttributeError:
-                    _LOGGER.error(
-                        "Could not render %s template %s: %s",
-                        friendly_property_name,
-                        self._name,
-                        ex,
-                    )
+                result = ex
+            update(result)
+
+    def _update_state(self, result):
+        """Apply a result of the value template."""
+        # The availability template decides when there is one
+        if self._availability_template is None:
+            self._available = not isinstance(result, TemplateError)
+
+        if not isinstance(result, TemplateError):
+            self._state = result
+            return
+
+        if result.args and result.args[0].startswith(
+            "UndefinedError: 'None' has no attribute"
+        ):
+            # Common during HA startup - so just a warning
+            _LOGGER.warning(
+                "Could not render template %s, the state is unknown.", self._name
+            )
+        else:
+            self._state = None
+            _LOGGER.error("Could not render template %s: %s", self._name, result)
+
+    def _update_attribute(self, key, result):
+        """Apply a result of an attribute template."""
+        if not isinstance(result, TemplateError):
+            self._attributes[key] = result
+            return
+
+        self._attributes.pop(key, None)
+        _LOGGER.error("Error rendering attribute %s: %s", key, result)
+
+    def _update_property(self, property_name, result):
+        """Apply a result of the template of a property."""
+        if not isinstance(result, TemplateError):
+            if property_name == "_available":
+                result = result.lower() == "true"
+            setattr(self, property_name, result)
+            return
+
+        friendly_property_name = property_name[1:].replace("_", " ")
+        if result.args and result.args[0].startswith(
+            "UndefinedError: 'None' has no attribute"
+        ):
+            # Common during HA startup - so just a warning
+            _LOGGER.warning(
+                "Could not render %s template %s, the state is unknown.",
+                friendly_property_name,
+                self._name,
+            )
+            return
+
+        try:
+            setattr(self, property_name, getattr(super(), property_name))
+        except AttributeError:
+            _LOGGER.error(
+                "Could not render %s template %s: %s",
+                friendly_property_name,
+                self._name,
+                result,
+            )
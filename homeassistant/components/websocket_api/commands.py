@@ -1,21 +1,36 @@
 """Commands part of Websocket API."""
 import asyncio
+import logging
 
 import voluptuous as vol
 
 from homeassistant.auth.permissions.const import POLICY_READ
 from homeassistant.const import EVENT_STATE_CHANGED, EVENT_TIME_CHANGED, MATCH_ALL
-from homeassistant.core import DOMAIN as HASS_DOMAIN, callback
-from homeassistant.exceptions import HomeAssistantError, ServiceNotFound, Unauthorized
+from homeassistant.core import DOMAIN as HASS_DOMAIN, callback, split_entity_id
+from homeassistant.exceptions import (
+    HomeAssistantError,
+    ServiceNotFound,
+    TemplateError,
+    Unauthorized,
+)
 from homeassistant.helpers import config_validation as cv
-from homeassistant.helpers.event import async_track_state_change
+from homeassistant.helpers.event import (
+    async_track_state_change,
+    async_track_state_change_event,
+    async_track_template_result,
+)
 from homeassistant.helpers.service import async_get_all_descriptions
 from homeassistant.loader import IntegrationNotFound, async_get_integration
+from homeassistant.setup import async_get_setup_timings, async_get_setup_trace
 
 from . import const, decorators, messages
 
 # mypy: allow-untyped-calls, allow-untyped-defs
 
+_LOGGER = logging.getLogger(__name__)
+
+DATA_STATE_CHANGED_FORWARDERS = "websocket_api_state_changed_forwarders"
+
 
 @callback
 def async_register_commands(hass, async_reg):
@@ -30,6 +45,7 @@ def async_register_commands(hass, async_reg):
     async_reg(hass, handle_render_template)
     async_reg(hass, handle_manifest_list)
     async_reg(hass, handle_manifest_get)
+    async_reg(hass, handle_integration_setup_timings)
 
 
 def pong_message(iden):
@@ -42,6 +58,9 @@ def pong_message(iden):
     {
         vol.Required("type"): "subscribe_events",
         vol.Optional("event_type", default=MATCH_ALL): str,
+        vol.Optional("entity_id"): cv.entity_ids,
+        vol.Optional("domain"): vol.All(cv.ensure_list, [cv.string]),
+        vol.Optional("attributes"): vol.All(cv.ensure_list, [cv.string]),
     }
 )
 def handle_subscribe_events(hass, connection, msg):
@@ -56,26 +75,40 @@ def handle_subscribe_events(hass, connection, msg):
         raise Unauthorized
 
     if event_type == EVENT_STATE_CHANGED:
+        connection.subscriptions[msg["id"]] = _async_subscribe_state_changed(
+            hass,
+            connection,
+            msg["id"],
+            frozenset(msg["entity_id"]) if "entity_id" in msg else None,
+            frozenset(msg.get("domain", ())),
+            frozenset(msg.get("attributes", ())),
+        )
+        connection.send_message(messages.result_message(msg["id"]))
+        return
 
-        @callback
-        def forward_events(event):
-            """Forward state changed events to websocket."""
-            if not connection.user.permissions.check_entity(
-                event.data["entity_id"], POLICY_READ
-            ):
-                return
-
-            connection.send_message(messages.event_message(msg["id"], event))
+    if "entity_id" in msg or "domain" in msg or "attributes" in msg:
+        connection.send_message(
+            messages.error_message(
+                msg["id"],
+                const.ERR_INVALID_FORMAT,
+                "Filters are only supported for state_changed events.",
+            )
+        )
+        return
 
-    else:
+    @callback
+    def forward_events(event):
+        """Forward events to websocket."""
+        if event.event_type == EVENT_TIME_CHANGED:
+            return
 
-        @callback
-        def forward_events(event):
-            """Forward events to websocket."""
-            if event.event_type == EVENT_TIME_CHANGED:
-                return
+        try:
+            message = messages.cached_event_message(msg["id"], event.as_json())
+        except (ValueError, TypeError):
+            # Let the writer report the data that can not be serialized
+            message = messages.event_message(msg["id"], event.as_read_only_dict())
 
-            connection.send_message(messages.event_message(msg["id"], event.as_dict()))
+        connection.send_message(message)
 
     connection.subscriptions[msg["id"]] = hass.bus.async_listen(
         event_type, forward_events
@@ -84,6 +117,98 @@ def handle_subscribe_events(hass, connection, msg):
     connection.send_message(messages.result_message(msg["id"]))
 
 
+@callback
+def _async_subscribe_state_changed(
+    hass, connection, iden, entity_ids, domains, attributes
+):
+    """Subscribe a connection to state changes matching a filter.
+
+    Subscriptions with the same filter share a forwarder, so each state
+    change is filtered once for all of them.
+    """
+    forwarders = hass.data.setdefault(DATA_STATE_CHANGED_FORWARDERS, {})
+    key = (entity_ids, domains, attributes)
+    forwarder = forwarders.get(key)
+
+    if forwarder is None:
+        forwarder = forwarders[key] = StateChangedForwarder(
+            entity_ids, domains, attributes
+        )
+        if entity_ids is None:
+            forwarder.unsub = hass.bus.async_listen(
+                EVENT_STATE_CHANGED, forwarder.async_forward
+            )
+        else:
+            forwarder.unsub = async_track_state_change_event(
+                hass, entity_ids, forwarder.async_forward
+            )
+
+    subscriber = (connection, iden)
+    forwarder.subscribers.add(subscriber)
+
+    @callback
+    def unsubscribe():
+        """Unsubscribe the connection."""
+        forwarder.subscribers.discard(subscriber)
+        if not forwarder.subscribers:
+            forwarder.unsub()
+            forwarders.pop(key)
+
+    return unsubscribe
+
+
+class StateChangedForwarder:
+    """Forward state changes matching a filter to websocket subscribers."""
+
+    def __init__(self, entity_ids, domains, attributes):
+        """Initialize the forwarder."""
+        self.entity_ids = entity_ids
+        self.domains = domains
+        self.attributes = attributes
+        self.subscribers = set()
+        self.unsub = None
+
+    def _matches(self, event):
+        """Return if a state change passes the domain and attribute filters."""
+        if self.domains and split_entity_id(event.data["entity_id"])[0] not in (
+            self.domains
+        ):
+            return False
+
+        if not self.attributes:
+            return True
+
+        old_state = event.data.get("old_state")
+        new_state = event.data.get("new_state")
+        if old_state is None or new_state is None:
+            return True
+
+        return old_state.state != new_state.state or any(
+            old_state.attributes.get(attr) != new_state.attributes.get(attr)
+            for attr in self.attributes
+        )
+
+    @callback
+    def async_forward(self, event):
+        """Forward a state change to the subscribers allowed to read it."""
+        if not self._matches(event):
+            return
+
+        entity_id = event.data["entity_id"]
+
+        for connection, iden in list(self.subscribers):
+            if not connection.user.permissions.check_entity(entity_id, POLICY_READ):
+                continue
+
+            try:
+                dumped = event.as_json()
+            except (ValueError, TypeError):
+                _LOGGER.error("Unable to serialize to JSON: %s", event)
+                return
+
+            connection.send_message(messages.cached_event_message(iden, dumped))
+
+
 @callback
 @decorators.websocket_command(
     {
@@ -171,7 +296,14 @@ def handle_get_states(hass, connection, msg):
             if entity_perm(state.entity_id, "read")
         ]
 
-    connection.send_message(messages.result_message(msg["id"], states))
+    # The JSON encoder reuses the cached JSON of the states
+    try:
+        dumped = const.JSON_DUMP(states)
+    except (ValueError, TypeError):
+        connection.send_message(messages.result_message(msg["id"], states))
+        return
+
+    connection.send_message(messages.cached_result_message(msg["id"], dumped))
 
 
 @decorators.websocket_command({vol.Required("type"): "get_services"})
@@ -219,6 +351,21 @@ async def handle_manifest_get(hass, connection, msg):
         connection.send_error(msg["id"], const.ERR_NOT_FOUND, "Integration not found")
 
 
+@callback
+@decorators.websocket_command(
+    {
+        vol.Required("type"): "integration/setup_timings",
+        vol.Optional("format", default="summary"): vol.In(("summary", "trace")),
+    }
+)
+def handle_integration_setup_timings(hass, connection, msg):
+    """Handle integration setup timings command."""
+    if msg["format"] == "trace":
+        connection.send_result(msg["id"], async_get_setup_trace(hass))
+    else:
+        connection.send_result(msg["id"], async_get_setup_timings(hass))
+
+
 @callback
 @decorators.websocket_command({vol.Required("type"): "ping"})
 def handle_ping(hass, connection, msg):
@@ -244,7 +391,8 @@ def handle_render_template(hass, connection, msg):
 
     entity_ids = msg.get("entity_ids")
     if entity_ids is None:
-        entity_ids = template.extract_entities(variables)
+        _async_render_tracked_template(hass, connection, msg, template, variables)
+        return
 
     @callback
     def state_listener(*_):
@@ -254,12 +402,40 @@ def handle_render_template(hass, connection, msg):
             )
         )
 
-    if entity_ids and entity_ids != MATCH_ALL:
-        connection.subscriptions[msg["id"]] = async_track_state_change(
-            hass, entity_ids, state_listener
-        )
-    else:
-        connection.subscriptions[msg["id"]] = lambda: None
+    connection.subscriptions[msg["id"]] = async_track_state_change(
+        hass, entity_ids, state_listener
+    )
 
     connection.send_result(msg["id"])
     state_listener()
+
+
+@callback
+def _async_render_tracked_template(hass, connection, msg, template, variables):
+    """Render a template again when the states it used change."""
+
+    @callback
+    def template_listener(event, last_result, result):
+        if result == last_result:
+            return
+
+        if isinstance(result, TemplateError):
+            connection.logger.error(
+                "Error rendering template %s: %s", template.template, result
+            )
+            return
+
+        connection.send_message(messages.event_message(msg["id"], {"result": result}))
+
+    info = async_track_template_result(
+        hass, template, template_listener, variables, match_all_fallback=True
+    )
+    if isinstance(info.last_result, TemplateError):
+        info.async_remove()
+        raise info.last_result
+
+    connection.subscriptions[msg["id"]] = info.async_remove
+    connection.send_result(msg["id"])
+    connection.send_message(
+        messages.event_message(msg["id"], {"result": info.last_result})
+    )
@@ -36,3 +36,16 @@ def error_message(iden, code, message):
 def event_message(iden, event):
     """Return an event message."""
     return {"id": iden, "type": "event", "event": event}
+
+
+def cached_event_message(iden, dumped_event):
+    """Return an event message with an already JSON encoded event."""
+    return f'{{"id": {iden}, "type": "event", "event": {dumped_event}}}'
+
+
+def cached_result_message(iden, dumped_result):
+    """Return a success result message with an already JSON encoded result."""
+    return (
+        f'{{"id": {iden}, "type": "{const.TYPE_RESULT}", '
+        f'"success": true, "result": {dumped_result}}}'
+    )
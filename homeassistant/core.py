@@ -10,6 +10,7 @@ import datetime
 import enum
 import functools
 from ipaddress import ip_address
+import json
 import logging
 import os
 import pathlib
@@ -71,7 +72,7 @@ from homeassistant.exceptions import (
     ServiceNotFound,
     Unauthorized,
 )
-from homeassistant.util import location, network
+from homeassistant.util import ReadOnlyDict, location, network
 from homeassistant.util.async_ import fire_coroutine_threadsafe, run_callback_threadsafe
 import homeassistant.util.dt as dt_util
 from homeassistant.util.thread import fix_threading_exception_logging
@@ -133,6 +134,29 @@ def valid_state(state: str) -> bool:
     return len(state) < 256
 
 
+def _json_dumps(obj: Any) -> str:
+    """Encode an object as JSON that is valid for any consumer."""
+    # Circular dep
+    # pylint: disable=import-outside-toplevel
+    from homeassistant.helpers.json import JSONEncoder
+
+    return json.dumps(obj, cls=JSONEncoder, allow_nan=False)
+
+
+def _json_dumps_data(data: Mapping) -> str:
+    """Encode a mapping as JSON, reusing the cached JSON of the states in it."""
+    if not any(isinstance(value, State) for value in data.values()) or not all(
+        isinstance(key, str) for key in data
+    ):
+        return _json_dumps(dict(data))
+
+    return "{%s}" % ", ".join(
+        f"{_json_dumps(key)}: "
+        f"{value.as_json() if isinstance(value, State) else _json_dumps(value)}"
+        for key, value in data.items()
+    )
+
+
 def callback(func: CALLABLE_T) -> CALLABLE_T:
     """Annotation to mark method as safe to call from within the event loop."""
     setattr(func, "_hass_callback", True)
@@ -489,7 +513,16 @@ class EventOrigin(enum.Enum):
 class Event:
     """Representation of an event within the bus."""
 
-    __slots__ = ["event_type", "data", "origin", "time_fired", "context"]
+    __slots__ = [
+        "event_type",
+        "data",
+        "origin",
+        "time_fired",
+        "context",
+        "_as_dict",
+        "_data_as_json",
+        "_as_json",
+    ]
 
     def __init__(
         self,
@@ -505,6 +538,9 @@ class Event:
         self.origin = origin
         self.time_fired = time_fired or dt_util.utcnow()
         self.context: Context = context or Context()
+        self._as_dict: Optional[ReadOnlyDict] = None
+        self._data_as_json: Optional[str] = None
+        self._as_json: Optional[str] = None
 
     def as_dict(self) -> Dict:
         """Create a dict representation of this Event.
@@ -519,6 +555,55 @@ class Event:
             "context": self.context.as_dict(),
         }
 
+    def as_read_only_dict(self) -> ReadOnlyDict:
+        """Create a read only dict representation of this Event.
+
+        The representation is cached and shared by all callers.
+
+        Async friendly.
+        """
+        if self._as_dict is None:
+            self._as_dict = ReadOnlyDict(
+                {
+                    "event_type": self.event_type,
+                    "data": ReadOnlyDict(self.data),
+                    "origin": str(self.origin),
+                    "time_fired": self.time_fired,
+                    "context": ReadOnlyDict(self.context.as_dict()),
+                }
+            )
+        return self._as_dict
+
+    def data_as_json(self) -> str:
+        """Return the event data encoded as JSON.
+
+        The JSON is cached. Raises ValueError or TypeError when the data
+        can not be encoded.
+
+        Async friendly.
+        """
+        if self._data_as_json is None:
+            self._data_as_json = _json_dumps_data(self.data)
+        return self._data_as_json
+
+    def as_json(self) -> str:
+        """Return the dict representation of this Event encoded as JSON.
+
+        The JSON is cached. Raises ValueError or TypeError when the event
+        can not be encoded.
+
+        Async friendly.
+        """
+        if self._as_json is None:
+            self._as_json = (
+                f'{{"event_type": {_json_dumps(self.event_type)}, '
+                f'"data": {self.data_as_json()}, '
+                f'"origin": {_json_dumps(str(self.origin))}, '
+                f'"time_fired": {_json_dumps(self.time_fired)}, '
+                f'"context": {_json_dumps(self.context.as_dict())}}}'
+            )
+        return self._as_json
+
     def __repr__(self) -> str:
         """Return the representation."""
         # pylint: disable=maybe-no-member
@@ -720,6 +805,9 @@ class State:
         "last_changed",
         "last_updated",
         "context",
+        "_as_dict",
+        "_attributes_as_json",
+        "_as_json",
     ]
 
     def __init__(
@@ -755,6 +843,9 @@ class State:
         self.last_updated = last_updated or dt_util.utcnow()
         self.last_changed = last_changed or self.last_updated
         self.context = context or Context()
+        self._as_dict: Optional[ReadOnlyDict] = None
+        self._attributes_as_json: Optional[str] = None
+        self._as_json: Optional[str] = None
 
     @property
     def domain(self) -> str:
@@ -790,6 +881,57 @@ class State:
             "context": self.context.as_dict(),
         }
 
+    def as_read_only_dict(self) -> ReadOnlyDict:
+        """Return a read only dict representation of the State.
+
+        The representation is cached and shared by all callers.
+
+        Async friendly.
+        """
+        if self._as_dict is None:
+            self._as_dict = ReadOnlyDict(
+                {
+                    "entity_id": self.entity_id,
+                    "state": self.state,
+                    "attributes": ReadOnlyDict(self.attributes),
+                    "last_changed": self.last_changed,
+                    "last_updated": self.last_updated,
+                    "context": ReadOnlyDict(self.context.as_dict()),
+                }
+            )
+        return self._as_dict
+
+    def attributes_as_json(self) -> str:
+        """Return the attributes encoded as JSON.
+
+        The JSON is cached. Raises ValueError or TypeError when the
+        attributes can not be encoded.
+
+        Async friendly.
+        """
+        if self._attributes_as_json is None:
+            self._attributes_as_json = _json_dumps(dict(self.attributes))
+        return self._attributes_as_json
+
+    def as_json(self) -> str:
+        """Return the dict representation of the State encoded as JSON.
+
+        The JSON is cached. Raises ValueError or TypeError when the state
+        can not be encoded.
+
+        Async friendly.
+        """
+        if self._as_json is None:
+            self._as_json = (
+                f'{{"entity_id": {_json_dumps(self.entity_id)}, '
+                f'"state": {_json_dumps(self.state)}, '
+                f'"attributes": {self.attributes_as_json()}, '
+                f'"last_changed": {_json_dumps(self.last_changed)}, '
+                f'"last_updated": {_json_dumps(self.last_updated)}, '
+                f'"context": {_json_dumps(self.context.as_dict())}}}'
+            )
+        return self._as_json
+
     @classmethod
     def from_dict(cls, json_dict: Dict) -> Any:
         """Initialize a state from a dict.
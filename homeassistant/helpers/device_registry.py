@@ -85,7 +85,9 @@ class DeviceRegistry:
     def __init__(self, hass: HomeAssistantType) -> None:
         """Initialize the device registry."""
         self.hass = hass
-        self._store = hass.helpers.storage.Store(STORAGE_VERSION, STORAGE_KEY)
+        self._store = hass.helpers.storage.Store(
+            STORAGE_VERSION, STORAGE_KEY, compact=True
+        )
 
     @callback
     def async_get(self, device_id: str) -> Optional[DeviceEntry]:
@@ -95,11 +95,7 @@ class EntityComponent:
 
     def get_entity(self, entity_id: str) -> Optional[entity.Entity]:
         """Get an entity."""
-        for platform in self._platforms.values():
-            entity_obj = platform.entities.get(entity_id)
-            if entity_obj is not None:
-                return entity_obj
-        return None
+        return self._platforms[self.domain].domain_entities.get(entity_id)
 
     def setup(self, config: ConfigType) -> None:
         """Set up a full entity component.
@@ -210,7 +206,10 @@ class EntityComponent:
         async def handle_service(call: Callable) -> None:
             """Handle the service."""
             await self.hass.helpers.service.entity_service_call(
-                self._platforms.values(), func, call, required_features
+                self._platforms[self.domain].domain_entities,
+                func,
+                call,
+                required_features,
             )
 
         self.hass.services.async_register(self.domain, name, handle_service, schema)
@@ -11,6 +11,7 @@ from homeassistant.core import CALLBACK_TYPE, callback, split_entity_id, valid_e
 from homeassistant.exceptions import HomeAssistantError, PlatformNotReady
 from homeassistant.helpers import config_validation as cv, service
 from homeassistant.helpers.typing import HomeAssistantType
+from homeassistant.setup import PHASE_SETUP_PLATFORM, async_time_setup_phase
 from homeassistant.util.async_ import run_callback_threadsafe
 
 from .entity_registry import DISABLED_INTEGRATION
@@ -25,6 +26,7 @@ SLOW_SETUP_WARNING = 10
 SLOW_SETUP_MAX_WAIT = 60
 PLATFORM_NOT_READY_RETRIES = 10
 DATA_ENTITY_PLATFORM = "entity_platform"
+DATA_DOMAIN_ENTITIES = "domain_entities"
 
 
 class EntityPlatform:
@@ -51,6 +53,10 @@ class EntityPlatform:
         self.entity_namespace = entity_namespace
         self.config_entry = None
         self.entities: Dict[str, Entity] = {}  # pylint: disable=used-before-assignment
+        # Entities of all platforms of this domain, by entity_id
+        self.domain_entities: Dict[str, Entity] = hass.data.setdefault(
+            DATA_DOMAIN_ENTITIES, {}
+        ).setdefault(domain, {})
         self._tasks: List[asyncio.Future] = []
         # Method to cancel the state change listener
         self._async_unsub_polling: Optional[CALLBACK_TYPE] = None
@@ -173,17 +179,20 @@ class EntityPlatform:
         )
 
         try:
-            task = async_create_setup_task()
+            with async_time_setup_phase(
+                hass, self.platform_name, PHASE_SETUP_PLATFORM, self.domain
+            ):
+                task = async_create_setup_task()
 
-            await asyncio.wait_for(asyncio.shield(task), SLOW_SETUP_MAX_WAIT)
+                await asyncio.wait_for(asyncio.shield(task), SLOW_SETUP_MAX_WAIT)
 
-            # Block till all entities are done
-            if self._tasks:
-                pending = [task for task in self._tasks if not task.done()]
-                self._tasks.clear()
+                # Block till all entities are done
+                if self._tasks:
+                    pending = [task for task in self._tasks if not task.done()]
+                    self._tasks.clear()
 
-                if pending:
-                    await asyncio.gather(*pending)
+                    if pending:
+                        await asyncio.gather(*pending)
 
             hass.config.components.add(full_name)
             return True
@@ -438,7 +447,14 @@ class EntityPlatform:
 
         entity_id = entity.entity_id
         self.entities[entity_id] = entity
-        entity.async_on_remove(lambda: self.entities.pop(entity_id))
+        self.domain_entities[entity_id] = entity
+
+        def remove_entity_cb() -> None:
+            """Remove entity from entities list."""
+            self.entities.pop(entity_id)
+            self.domain_entities.pop(entity_id)
+
+        entity.async_on_remove(remove_entity_cb)
 
         await entity.async_internal_added_to_hass()
         await entity.async_added_to_hass()
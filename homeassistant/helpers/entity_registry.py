@@ -125,7 +125,9 @@ class EntityRegistry:
         """Initialize the registry."""
         self.hass = hass
         self.entities: Dict[str, RegistryEntry]
-        self._store = hass.helpers.storage.Store(STORAGE_VERSION, STORAGE_KEY)
+        self._store = hass.helpers.storage.Store(
+            STORAGE_VERSION, STORAGE_KEY, compact=True
+        )
         self.hass.bus.async_listen(
             EVENT_DEVICE_REGISTRY_UPDATED, self.async_device_removed
         )
@@ -1,7 +1,10 @@
 """Helpers for listening to events."""
 from datetime import datetime, timedelta
 import functools as ft
-from typing import Any, Awaitable, Callable, Dict, Iterable, Optional, Union, cast
+import heapq
+import itertools
+import logging
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Union
 
 import attr
 
@@ -15,12 +18,28 @@ from homeassistant.const import (
     SUN_EVENT_SUNSET,
 )
 from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, State, callback
+from homeassistant.exceptions import TemplateError
 from homeassistant.helpers.sun import get_astral_event_next
-from homeassistant.helpers.template import Template
+from homeassistant.helpers.template import RenderInfo, Template
 from homeassistant.loader import bind_hass
 from homeassistant.util import dt as dt_util
 from homeassistant.util.async_ import run_callback_threadsafe
 
+TRACK_STATE_CHANGE_CALLBACKS = "track_state_change_callbacks"
+TRACK_STATE_CHANGE_LISTENER = "track_state_change_listener"
+TRACK_TIME_CHANGE_SCHEDULER = "track_time_change_scheduler"
+
+# Point in time used to run a scheduled action on the next time_changed event
+NEXT_TIME_CHANGE = datetime.min.replace(tzinfo=dt_util.UTC)
+
+# Rebuild the heap once this many cancelled timers are waiting in it
+SCHEDULER_COMPACT_THRESHOLD = 100
+
+# Minimum seconds between renders of a template that iterates over all states
+ALL_STATES_RATE_LIMIT = 1
+
+_LOGGER = logging.getLogger(__name__)
+
 # PyLint does not like the use of threaded_listener_factory
 # pylint: disable=invalid-name
 
@@ -70,23 +89,9 @@ def async_track_state_change(
     match_from_state = process_state_match(from_state)
     match_to_state = process_state_match(to_state)
 
-    # Ensure it is a lowercase list with entity ids we want to match on
-    if entity_ids == MATCH_ALL:
-        pass
-    elif isinstance(entity_ids, str):
-        entity_ids = (entity_ids.lower(),)
-    else:
-        entity_ids = tuple(entity_id.lower() for entity_id in entity_ids)
-
     @callback
     def state_change_listener(event: Event) -> None:
         """Handle specific state changes."""
-        if (
-            entity_ids != MATCH_ALL
-            and cast(str, event.data.get("entity_id")) not in entity_ids
-        ):
-            return
-
         old_state = event.data.get("old_state")
         if old_state is not None:
             old_state = old_state.state
@@ -103,12 +108,97 @@ def async_track_state_change(
                 event.data.get("new_state"),
             )
 
-    return hass.bus.async_listen(EVENT_STATE_CHANGED, state_change_listener)
+    return async_track_state_change_event(hass, entity_ids, state_change_listener)
 
 
 track_state_change = threaded_listener_factory(async_track_state_change)
 
 
+@callback
+def _remove_empty_listener() -> None:
+    """Remove a listener that does nothing."""
+
+
+@callback
+@bind_hass
+def async_track_state_change_event(
+    hass: HomeAssistant,
+    entity_ids: Union[str, Iterable[str]],
+    action: Callable[[Event], Any],
+) -> CALLBACK_TYPE:
+    """Track state change events for specific entity ids.
+
+    Instead of registering a state_changed listener on the event bus per
+    tracker, a single listener dispatches events to the callbacks that are
+    indexed by entity_id. Pass MATCH_ALL to receive every state change.
+
+    Returns a function that can be called to remove the listener.
+
+    Must be run within the event loop.
+    """
+    # Ensure it is a lowercase list with entity ids we want to match on
+    if entity_ids == MATCH_ALL:
+        entity_ids = (MATCH_ALL,)
+    elif isinstance(entity_ids, str):
+        entity_ids = (entity_ids.lower(),)
+    else:
+        entity_ids = tuple({entity_id.lower() for entity_id in entity_ids})
+
+    if not entity_ids:
+        return _remove_empty_listener
+
+    entity_callbacks: Dict[str, List[Callable]] = hass.data.setdefault(
+        TRACK_STATE_CHANGE_CALLBACKS, {}
+    )
+
+    if TRACK_STATE_CHANGE_LISTENER not in hass.data:
+
+        @callback
+        def _async_state_change_dispatcher(event: Event) -> None:
+            """Dispatch state changes by entity_id."""
+            entity_id = event.data.get("entity_id")
+
+            for key in (entity_id, MATCH_ALL):
+                if key not in entity_callbacks:
+                    continue
+
+                # Copy the list, callbacks are allowed to unsubscribe
+                for action in entity_callbacks[key][:]:
+                    try:
+                        hass.async_run_job(action, event)
+                    except Exception:  # pylint: disable=broad-except
+                        _LOGGER.exception(
+                            "Error while processing state changed for %s", entity_id
+                        )
+
+        hass.data[TRACK_STATE_CHANGE_LISTENER] = hass.bus.async_listen(
+            EVENT_STATE_CHANGED, _async_state_change_dispatcher
+        )
+
+    for entity_id in entity_ids:
+        entity_callbacks.setdefault(entity_id, []).append(action)
+
+    @callback
+    def remove_listener() -> None:
+        """Remove state change listener."""
+        for entity_id in entity_ids:
+            callbacks = entity_callbacks.get(entity_id)
+            if callbacks is None or action not in callbacks:
+                continue
+
+            callbacks.remove(action)
+            if not callbacks:
+                del entity_callbacks[entity_id]
+
+        if not entity_callbacks and TRACK_STATE_CHANGE_LISTENER in hass.data:
+            hass.data.pop(TRACK_STATE_CHANGE_LISTENER)()
+
+    return remove_listener
+
+
+track_state_change_event = threaded_listener_factory(async_track_state_change_event)
+
+
 @callback
 @bind_hass
 def async_track_template(
@@ -118,32 +208,209 @@ def async_track_template(
     variables: Optional[Dict[str, Any]] = None,
 ) -> CALLBACK_TYPE:
     """Add a listener that track state changes with template condition."""
-    from . import condition  # pylint: disable=import-outside-toplevel
-
     # Local variable to keep track of if the action has already been triggered
     already_triggered = False
 
     @callback
-    def template_condition_listener(entity_id: str, from_s: State, to_s: State) -> None:
+    def template_condition_listener(
+        event: Optional[Event], last_result: Any, result: Any
+    ) -> None:
         """Check if condition is correct and run action."""
         nonlocal already_triggered
-        template_result = condition.async_template(hass, template, variables)
+        if isinstance(result, TemplateError):
+            _LOGGER.error("Error during template condition: %s", result)
+            template_result = False
+        else:
+            template_result = result.lower() == "true"
 
         # Check to see if template returns true
         if template_result and not already_triggered:
             already_triggered = True
-            hass.async_run_job(action, entity_id, from_s, to_s)
+            data = {} if event is None else event.data
+            hass.async_run_job(
+                action,
+                data.get("entity_id"),
+                data.get("old_state"),
+                data.get("new_state"),
+            )
         elif not template_result:
             already_triggered = False
 
-    return async_track_state_change(
-        hass, template.extract_entities(variables), template_condition_listener
-    )
+    return async_track_template_result(
+        hass, template, template_condition_listener, variables, match_all_fallback=True
+    ).async_remove
 
 
 track_template = threaded_listener_factory(async_track_template)
 
 
+@callback
+@bind_hass
+def async_track_template_result(
+    hass: HomeAssistant,
+    template: Template,
+    action: Callable[[Optional[Event], Any, Any], None],
+    variables: Optional[Dict[str, Any]] = None,
+    match_all_fallback: bool = False,
+) -> "TrackTemplateResultInfo":
+    """Add a listener that re-renders a template when its states change.
+
+    Each render records the entities it accessed and the domains or all
+    states it iterated over, and only changes to those are listened to.
+    The action is called with the state change, the last result and the
+    new result after each re-render. A result is a TemplateError when the
+    render failed.
+
+    Templates that use no states, like those using now(), are not tracked
+    unless match_all_fallback is set. They are then re-rendered on any state
+    change as extract_entities used to do.
+
+    Must be run within the event loop.
+    """
+    info = TrackTemplateResultInfo(
+        hass, template, action, variables, match_all_fallback
+    )
+    info.async_setup()
+    return info
+
+
+class TrackTemplateResultInfo:
+    """Re-render a template when the states used by its last render change.
+
+    Templates that iterate over all states are rendered at most once every
+    ALL_STATES_RATE_LIMIT seconds.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        template: Template,
+        action: Callable[[Optional[Event], Any, Any], None],
+        variables: Optional[Dict[str, Any]],
+        match_all_fallback: bool = False,
+    ) -> None:
+        """Initialize the tracker."""
+        self.hass = hass
+        self._template = template
+        self._action = action
+        self._variables = variables
+        self._match_all_fallback = match_all_fallback
+        self._info: Optional[RenderInfo] = None
+        self._last_result: Any = None
+        self._last_render = 0.0
+        self._tracked: Any = None
+        self._use_no_states = False
+        self._unsub_track: Optional[CALLBACK_TYPE] = None
+        self._unsub_rate_limit: Optional[CALLBACK_TYPE] = None
+        self._pending_event: Optional[Event] = None
+
+    @property
+    def last_result(self) -> Any:
+        """Return the result of the last render."""
+        return self._last_result
+
+    @property
+    def tracks_states(self) -> bool:
+        """Return if state changes can render the template again."""
+        return bool(self._tracked)
+
+    @callback
+    def async_setup(self) -> None:
+        """Render the template and listen to the states it used."""
+        self._last_result = self._async_render()
+
+    @callback
+    def async_remove(self) -> None:
+        """Stop tracking the template."""
+        if self._unsub_track is not None:
+            self._unsub_track()
+            self._unsub_track = None
+        if self._unsub_rate_limit is not None:
+            self._unsub_rate_limit()
+            self._unsub_rate_limit = None
+
+    @callback
+    def async_refresh(self) -> None:
+        """Re-render the template and call the action."""
+        self._async_render_and_notify(None)
+
+    @callback
+    def _async_render(self) -> Any:
+        """Render the template and update the listener."""
+        info = self._info = self._template.async_render_to_info(self._variables)
+        self._last_render = self.hass.loop.time()
+
+        # Templates that use no states, like those using now(), are only
+        # re-rendered on any state change when the caller asked for it
+        self._use_no_states = self._match_all_fallback and not (
+            self._template.is_static or info.all_states or info.domains or info.entities
+        )
+
+        # Domains and all states are filtered by the listener
+        if self._use_no_states or info.all_states or info.domains:
+            tracked: Any = MATCH_ALL
+        else:
+            tracked = info.entities
+        if tracked != self._tracked:
+            if self._unsub_track is not None:
+                self._unsub_track()
+                self._unsub_track = None
+            if tracked:
+                self._unsub_track = async_track_state_change_event(
+                    self.hass, tracked, self._async_state_changed
+                )
+            self._tracked = tracked
+
+        try:
+            return info.result
+        except TemplateError as ex:
+            return ex
+
+    @callback
+    def _async_render_and_notify(self, event: Optional[Event]) -> None:
+        """Re-render the template and call the action with the result."""
+        last_result = self._last_result
+        result = self._last_result = self._async_render()
+        self.hass.async_run_job(self._action, event, last_result, result)
+
+    @callback
+    def _async_state_changed(self, event: Event) -> None:
+        """Re-render the template if the state change is one it used."""
+        info = self._info
+        assert info is not None
+        entity_id = event.data["entity_id"]
+
+        if not self._use_no_states:
+            if (
+                event.data.get("old_state") is None
+                or event.data.get("new_state") is None
+            ):
+                if not info.filter_lifecycle(entity_id):
+                    return
+            elif not info.filter(entity_id):
+                return
+
+        if info.all_states:
+            delay = self._last_render + ALL_STATES_RATE_LIMIT - self.hass.loop.time()
+            if delay > 0:
+                self._pending_event = event
+                if self._unsub_rate_limit is None:
+                    self._unsub_rate_limit = async_call_later(
+                        self.hass, delay, self._async_rate_limit_passed
+                    )
+                return
+
+        self._async_render_and_notify(event)
+
+    @callback
+    def _async_rate_limit_passed(self, _now: datetime) -> None:
+        """Render the template for the state changes that were held back."""
+        self._unsub_rate_limit = None
+        event = self._pending_event
+        self._pending_event = None
+        self._async_render_and_notify(event)
+
+
 @callback
 @bind_hass
 def async_track_same_state(
@@ -231,27 +498,7 @@ def async_track_point_in_utc_time(
     # Ensure point_in_time is UTC
     point_in_time = dt_util.as_utc(point_in_time)
 
-    @callback
-    def point_in_time_listener(event: Event) -> None:
-        """Listen for matching time_changed events."""
-        now = event.data[ATTR_NOW]
-
-        if now < point_in_time or hasattr(point_in_time_listener, "run"):
-            return
-
-        # Set variable so that we will never run twice.
-        # Because the event bus might have to wait till a thread comes
-        # available to execute this listener it might occur that the
-        # listener gets lined up twice to be executed. This will make
-        # sure the second time it does nothing.
-        setattr(point_in_time_listener, "run", True)
-        async_unsub()
-
-        hass.async_run_job(action, now)
-
-    async_unsub = hass.bus.async_listen(EVENT_TIME_CHANGED, point_in_time_listener)
-
-    return async_unsub
+    return _async_get_time_change_scheduler(hass).async_schedule(point_in_time, action)
 
 
 track_point_in_utc_time = threaded_listener_factory(async_track_point_in_utc_time)
@@ -418,7 +665,9 @@ def async_track_utc_time_change(
     matching_minutes = dt_util.parse_time_expression(minute, 0, 59)
     matching_hours = dt_util.parse_time_expression(hour, 0, 23)
 
-    next_time = None
+    scheduler = _async_get_time_change_scheduler(hass)
+    next_time: Optional[datetime] = None
+    cancel_scheduled: CALLBACK_TYPE
 
     def calculate_next(now: datetime) -> None:
         """Calculate and set the next time the trigger should fire."""
@@ -429,31 +678,51 @@ def async_track_utc_time_change(
             localized_now, matching_seconds, matching_minutes, matching_hours
         )
 
-    # Make sure rolling back the clock doesn't prevent the timer from
-    # triggering.
-    last_now: Optional[datetime] = None
-
     @callback
-    def pattern_time_change_listener(event: Event) -> None:
-        """Listen for matching time_changed events."""
-        nonlocal next_time, last_now
+    def schedule_next() -> None:
+        """Schedule the listener for the next matching time."""
+        nonlocal cancel_scheduled
 
-        now = event.data[ATTR_NOW]
+        assert next_time is not None
+        cancel_scheduled = scheduler.async_schedule(
+            next_time, pattern_time_change_listener
+        )
 
-        if last_now is None or now < last_now:
-            # Time rolled back or next time not yet calculated
+    @callback
+    def pattern_time_change_listener(now: datetime) -> None:
+        """Listen for matching time_changed events."""
+        if next_time is None:
             calculate_next(now)
 
-        last_now = now
-
+        assert next_time is not None
         if next_time <= now:
             hass.async_run_job(action, dt_util.as_local(now) if local else now)
             calculate_next(now + timedelta(seconds=1))
 
-    # We can't use async_track_point_in_utc_time here because it would
-    # break in the case that the system time abruptly jumps backwards.
-    # Our custom last_now logic takes care of resolving that scenario.
-    return hass.bus.async_listen(EVENT_TIME_CHANGED, pattern_time_change_listener)
+        schedule_next()
+
+    # Make sure rolling back the clock doesn't prevent the timer from
+    # triggering.
+    @callback
+    def time_rolled_back(now: datetime) -> None:
+        """Recalculate the next time when the clock jumps backwards."""
+        cancel_scheduled()
+        calculate_next(now)
+        schedule_next()
+
+    unsub_rolled_back = scheduler.async_listen_rolled_back(time_rolled_back)
+    # Until the first time_changed event we don't know what time it is
+    cancel_scheduled = scheduler.async_schedule(
+        NEXT_TIME_CHANGE, pattern_time_change_listener
+    )
+
+    @callback
+    def remove_listener() -> None:
+        """Remove pattern time change listener."""
+        cancel_scheduled()
+        unsub_rolled_back()
+
+    return remove_listener
 
 
 track_utc_time_change = threaded_listener_factory(async_track_utc_time_change)
@@ -475,6 +744,123 @@ def async_track_time_change(
 track_time_change = threaded_listener_factory(async_track_time_change)
 
 
+class TimeChangeScheduler:
+    """Run actions at a point in time from a single time_changed listener.
+
+    Pending actions are kept in a heap ordered by their point in time, so a
+    time_changed event only costs work for the actions that are due instead
+    of a callback per pending timer.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the scheduler."""
+        self.hass = hass
+        self._heap: List[List[Any]] = []
+        self._counter = itertools.count()
+        self._cancelled = 0
+        self._rolled_back_listeners: List[Callable[[datetime], None]] = []
+        self._last_now: Optional[datetime] = None
+        self._unsub: Optional[CALLBACK_TYPE] = None
+
+    @callback
+    def async_attach(self) -> None:
+        """Start listening for time_changed events."""
+        assert self._unsub is None
+        self._unsub = self.hass.bus.async_listen(
+            EVENT_TIME_CHANGED, self._async_time_changed
+        )
+
+    @callback
+    def async_schedule(
+        self, point_in_time: datetime, action: Callable[..., Any]
+    ) -> CALLBACK_TYPE:
+        """Run action with the current time once point_in_time has passed.
+
+        Returns a function that can be called to cancel the action.
+        """
+        # Entries are mutable lists so cancelling doesn't need a heap search.
+        # The counter keeps insertion order for equal points in time.
+        entry = [dt_util.as_utc(point_in_time), next(self._counter), action]
+        heapq.heappush(self._heap, entry)
+
+        @callback
+        def cancel() -> None:
+            """Cancel the scheduled action."""
+            if entry[2] is None:
+                return
+            entry[2] = None
+            self._cancelled += 1
+
+        return cancel
+
+    @callback
+    def async_listen_rolled_back(
+        self, listener: Callable[[datetime], None]
+    ) -> CALLBACK_TYPE:
+        """Call listener with the new time when the clock jumps backwards."""
+        self._rolled_back_listeners.append(listener)
+
+        @callback
+        def remove_listener() -> None:
+            """Remove the rolled back listener."""
+            self._rolled_back_listeners.remove(listener)
+
+        return remove_listener
+
+    @callback
+    def _async_time_changed(self, event: Event) -> None:
+        """Run the actions that are due."""
+        now = event.data[ATTR_NOW]
+        utc_now = dt_util.as_utc(now)
+
+        if self._last_now is not None and utc_now < self._last_now:
+            for listener in self._rolled_back_listeners[:]:
+                listener(now)
+
+        self._last_now = utc_now
+
+        # Collect the due entries first, actions that schedule themselves
+        # again will run on the next time_changed event at the earliest.
+        due = []
+        while self._heap and self._heap[0][0] <= utc_now:
+            due.append(heapq.heappop(self._heap))
+
+        for entry in due:
+            action = entry[2]
+            if action is None:
+                self._cancelled -= 1
+                continue
+
+            # Mark as done so cancelling after running is a no-op
+            entry[2] = None
+            try:
+                self.hass.async_run_job(action, now)
+            except Exception:  # pylint: disable=broad-except
+                _LOGGER.exception("Error while running scheduled action %s", action)
+
+        if (
+            self._cancelled > SCHEDULER_COMPACT_THRESHOLD
+            and self._cancelled > len(self._heap) // 2
+        ):
+            self._heap = [entry for entry in self._heap if entry[2] is not None]
+            heapq.heapify(self._heap)
+            self._cancelled = 0
+
+
+@callback
+def _async_get_time_change_scheduler(hass: HomeAssistant) -> TimeChangeScheduler:
+    """Return the time change scheduler, creating it if needed."""
+    scheduler: Optional[TimeChangeScheduler] = hass.data.get(
+        TRACK_TIME_CHANGE_SCHEDULER
+    )
+
+    if scheduler is None:
+        scheduler = hass.data[TRACK_TIME_CHANGE_SCHEDULER] = TimeChangeScheduler(hass)
+        scheduler.async_attach()
+
+    return scheduler
+
+
 def process_state_match(
     parameter: Union[None, str, Iterable[str]]
 ) -> Callable[[str], bool]:
@@ -2,7 +2,7 @@
 from datetime import datetime
 import json
 import logging
-from typing import Any
+from typing import Any, Optional, cast
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -10,6 +10,28 @@ _LOGGER = logging.getLogger(__name__)
 class JSONEncoder(json.JSONEncoder):
     """JSONEncoder that supports Home Assistant objects."""
 
+    def encode(self, o: Any) -> str:
+        """Return the JSON of an object.
+
+        States and events, and lists of them, reuse their cached JSON unless
+        the output is indented. Their keys are not sorted.
+        """
+        if cast(Optional[int], self.indent) is None:
+            try:
+                if hasattr(o, "as_json"):
+                    return cast(str, o.as_json())
+                if (
+                    isinstance(o, (list, tuple))
+                    and o
+                    and all(hasattr(item, "as_json") for item in o)
+                ):
+                    return "[%s]" % ", ".join(item.as_json() for item in o)
+            except (ValueError, TypeError):
+                # The cached JSON is strict, let the encoder decide
+                pass
+
+        return super().encode(o)
+
     # pylint: disable=method-hidden
     def default(self, o: Any) -> Any:
         """Convert Home Assistant objects.
@@ -20,6 +42,8 @@ class JSONEncoder(json.JSONEncoder):
             return o.isoformat()
         if isinstance(o, set):
             return list(o)
+        if hasattr(o, "as_read_only_dict"):
+            return o.as_read_only_dict()
         if hasattr(o, "as_dict"):
             return o.as_dict()
 
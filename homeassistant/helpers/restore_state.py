@@ -1,8 +1,14 @@
-"""Support for restoring entity states on startup."""
+"""Support for restoring entity states on startup.
+
+The states are saved in full once a day and whenever the journal of states
+that changed since the last full save holds as many states. In between,
+only the states that changed are appended to the journal.
+"""
 import asyncio
 from datetime import datetime, timedelta
+from itertools import chain
 import logging
-from typing import Any, Awaitable, Dict, List, Optional, Set, cast
+from typing import Any, Awaitable, Dict, Iterable, List, Optional, Set, cast
 
 from homeassistant.const import EVENT_HOMEASSISTANT_START, EVENT_HOMEASSISTANT_STOP
 from homeassistant.core import (
@@ -33,6 +39,9 @@ STATE_DUMP_INTERVAL = timedelta(minutes=15)
 # How long should a saved state be preserved if the entity no longer exists
 STATE_EXPIRATION = timedelta(days=7)
 
+# How long between saving all states and clearing the journal
+STATE_COMPACT_INTERVAL = timedelta(days=1)
+
 
 class StoredState:
     """Object to represent a stored state."""
@@ -77,15 +86,15 @@ class RestoreStateData:
                     _LOGGER.error("Error loading last states", exc_info=exc)
                     stored_states = None
 
-                if stored_states is None:
+                journal = await data.store.async_load_journal()
+
+                if stored_states is None and not journal:
                     _LOGGER.debug("Not creating cache - no saved states found")
                     data.last_states = {}
                 else:
-                    data.last_states = {
-                        item["state"]["entity_id"]: StoredState.from_dict(item)
-                        for item in stored_states
-                        if valid_entity_id(item["state"]["entity_id"])
-                    }
+                    data.last_states = _replay_stored_states(
+                        chain(stored_states or [], journal)
+                    )
                     _LOGGER.debug("Created cache with %s", list(data.last_states))
 
                 if hass.state == CoreState.running:
@@ -107,10 +116,15 @@ class RestoreStateData:
         """Initialize the restore state data class."""
         self.hass: HomeAssistant = hass
         self.store: Store = Store(
-            hass, STORAGE_VERSION, STORAGE_KEY, encoder=JSONEncoder
+            hass, STORAGE_VERSION, STORAGE_KEY, encoder=JSONEncoder, compact=True
         )
         self.last_states: Dict[str, StoredState] = {}
         self.entity_ids: Set[str] = set()
+        # The states as they were last written, to find the changed ones
+        self._dumped_states: Dict[str, State] = {}
+        self._journal_size = 0
+        self._last_compaction: Optional[datetime] = None
+        self._dump_lock = asyncio.Lock()
 
     @callback
     def async_get_stored_states(self) -> List[StoredState]:
@@ -155,17 +169,73 @@ class RestoreStateData:
         return stored_states
 
     async def async_dump_states(self) -> None:
-        """Save the current state machine to storage."""
+        """Save the current state machine to storage.
+
+        Only the states that changed since the last dump are appended to the
+        journal, unless it is time to save all states.
+        """
+        async with self._dump_lock:
+            stored_states = self.async_get_stored_states()
+            entity_ids = {
+                stored_state.state.entity_id for stored_state in stored_states
+            }
+            changed_states = [
+                stored_state
+                for stored_state in stored_states
+                if self._dumped_states.get(stored_state.state.entity_id)
+                is not stored_state.state
+            ]
+            now = dt_util.utcnow()
+
+            # Saving all states is deferred to the final write when stopping
+            if self.hass.state != CoreState.stopping and (
+                self._last_compaction is None
+                or now - self._last_compaction >= STATE_COMPACT_INTERVAL
+                or self._journal_size + len(changed_states) >= len(stored_states)
+                # The journal can not remove states
+                or not self._dumped_states.keys() <= entity_ids
+            ):
+                await self._async_save_all_states(stored_states, now)
+            elif changed_states:
+                await self._async_append_changed_states(changed_states)
+
+    async def _async_save_all_states(
+        self, stored_states: List[StoredState], now: datetime
+    ) -> None:
+        """Save all states and clear the journal."""
         _LOGGER.debug("Dumping states")
         try:
             await self.store.async_save(
-                [
-                    stored_state.as_dict()
-                    for stored_state in self.async_get_stored_states()
-                ]
+                [stored_state.as_dict() for stored_state in stored_states]
             )
+            await self.store.async_remove_journal()
         except HomeAssistantError as exc:
             _LOGGER.error("Error saving current states", exc_info=exc)
+            return
+
+        self._dumped_states = {
+            stored_state.state.entity_id: stored_state.state
+            for stored_state in stored_states
+        }
+        self._journal_size = 0
+        self._last_compaction = now
+
+    async def _async_append_changed_states(
+        self, changed_states: List[StoredState]
+    ) -> None:
+        """Append the states that changed since the last dump to the journal."""
+        _LOGGER.debug("Dumping %s changed states", len(changed_states))
+        try:
+            await self.store.async_append_journal(
+                [stored_state.as_dict() for stored_state in changed_states]
+            )
+        except HomeAssistantError as exc:
+            _LOGGER.error("Error saving changed states", exc_info=exc)
+            return
+
+        for stored_state in changed_states:
+            self._dumped_states[stored_state.state.entity_id] = stored_state.state
+        self._journal_size += len(changed_states)
 
     @callback
     def async_setup_dump(self, *args: Any) -> None:
@@ -207,6 +277,27 @@ class RestoreStateData:
         self.entity_ids.remove(entity_id)
 
 
+def _replay_stored_states(items: Iterable[Dict]) -> Dict[str, StoredState]:
+    """Return the last stored state of each entity.
+
+    A journal that was not cleared after all states were saved holds states
+    seen before the saved ones, so the state seen last wins.
+    """
+    last_states: Dict[str, StoredState] = {}
+
+    for item in items:
+        if not valid_entity_id(item["state"]["entity_id"]):
+            continue
+
+        stored_state = StoredState.from_dict(item)
+        entity_id = stored_state.state.entity_id
+        last_state = last_states.get(entity_id)
+        if last_state is None or stored_state.last_seen >= last_state.last_seen:
+            last_states[entity_id] = stored_state
+
+    return last_states
+
+
 def _encode(value: Any) -> Any:
     """Little helper to JSON encode a value."""
     try:
@@ -338,6 +338,9 @@ def async_set_service_schema(
 async def entity_service_call(hass, platforms, func, call, required_features=None):
     """Handle an entity service call.
 
+    Platforms is either a list of entity platforms or a dict of the
+    entities to target by entity_id.
+
     Calls all platforms simultaneously.
     """
     if call.context.user_id:
@@ -348,79 +351,59 @@ async def entity_service_call(hass, platforms, func, call, required_features=Non
     else:
         entity_perms = None
 
-    target_all_entities = call.data.get(ATTR_ENTITY_ID) == ENTITY_MATCH_ALL
-
-    if not target_all_entities:
-        # A set of entities we're trying to target.
-        entity_ids = await async_extract_entity_ids(hass, call, True)
-
-    # If the service function is a string, we'll pass it the service call data
-    if isinstance(func, str):
-        data = {
-            key: val
-            for key, val in call.data.items()
-            if key not in cv.ENTITY_SERVICE_FIELDS
-        }
-    # If the service function is not a string, we pass the service call
+    if isinstance(platforms, dict):
+        entity_dicts = [platforms]
     else:
-        data = call
+        entity_dicts = [platform.entities for platform in platforms]
 
-    # Check the permissions
+    target_all_entities = call.data.get(ATTR_ENTITY_ID) == ENTITY_MATCH_ALL
 
     # A list with entities to call the service on.
     entity_candidates = []
 
-    if entity_perms is None:
-        for platform in platforms:
-            if target_all_entities:
-                entity_candidates.extend(platform.entities.values())
-            else:
-                entity_candidates.extend(
-                    [
-                        entity
-                        for entity in platform.entities.values()
-                        if entity.entity_id in entity_ids
-                    ]
-                )
-
-    elif target_all_entities:
+    if target_all_entities:
         # If we target all entities, we will select all entities the user
         # is allowed to control.
-        for platform in platforms:
+        for entities in entity_dicts:
+            if entity_perms is None:
+                entity_candidates.extend(entities.values())
+                continue
+
             entity_candidates.extend(
                 [
                     entity
-                    for entity in platform.entities.values()
+                    for entity in entities.values()
                     if entity_perms(entity.entity_id, POLICY_CONTROL)
                 ]
             )
 
     else:
-        for platform in platforms:
-            platform_entities = []
-            for entity in platform.entities.values():
-
-                if entity.entity_id not in entity_ids:
-                    continue
-
-                if not entity_perms(entity.entity_id, POLICY_CONTROL):
-                    raise Unauthorized(
-                        context=call.context,
-                        entity_id=entity.entity_id,
-                        permission=POLICY_CONTROL,
-                    )
+        # A set of entities we're trying to target.
+        entity_ids = await async_extract_entity_ids(hass, call, True)
+        missing = []
 
-                platform_entities.append(entity)
+        # Look up the referenced entities instead of scanning all entities
+        for entity_id in entity_ids:
+            for entities in entity_dicts:
+                entity = entities.get(entity_id)
+                if entity is not None:
+                    break
+            else:
+                missing.append(entity_id)
+                continue
 
-            entity_candidates.extend(platform_entities)
+            if entity_perms is not None and not entity_perms(entity_id, POLICY_CONTROL):
+                raise Unauthorized(
+                    context=call.context,
+                    entity_id=entity_id,
+                    permission=POLICY_CONTROL,
+                )
 
-    if not target_all_entities:
-        for entity in entity_candidates:
-            entity_ids.remove(entity.entity_id)
+            entity_candidates.append(entity)
 
-        if entity_ids:
+        if missing:
             _LOGGER.warning(
-                "Unable to find referenced entities %s", ", ".join(sorted(entity_ids))
+                "Unable to find referenced entities %s", ", ".join(sorted(missing))
             )
 
     entities = []
@@ -441,6 +424,17 @@ async def entity_service_call(hass, platforms, func, call, required_features=Non
     if not entities:
         return
 
+    # If the service function is a string, we'll pass it the service call data
+    if isinstance(func, str):
+        data = {
+            key: val
+            for key, val in call.data.items()
+            if key not in cv.ENTITY_SERVICE_FIELDS
+        }
+    # If the service function is not a string, we pass the service call
+    else:
+        data = call
+
     done, pending = await asyncio.wait(
         [
             entity.async_request_call(
@@ -1,8 +1,10 @@
 """Helper to help store data."""
 import asyncio
+import json
 from json import JSONEncoder
 import logging
 import os
+from time import monotonic
 from typing import Any, Callable, Dict, List, Optional, Type, Union
 
 from homeassistant.const import EVENT_HOMEASSISTANT_FINAL_WRITE
@@ -67,8 +69,13 @@ class Store:
         private: bool = False,
         *,
         encoder: Optional[Type[JSONEncoder]] = None,
+        compact: bool = False,
     ):
-        """Initialize storage class."""
+        """Initialize storage class.
+
+        Compact stores write their data without indentation, which is much
+        faster to encode for large data.
+        """
         self.version = version
         self.key = key
         self.hass = hass
@@ -79,12 +86,20 @@ class Store:
         self._write_lock = asyncio.Lock()
         self._load_task: Optional[asyncio.Future] = None
         self._encoder = encoder
+        self._compact = compact
+        self.last_write_duration: Optional[float] = None
+        self.last_write_size: Optional[int] = None
 
     @property
     def path(self):
         """Return the config path."""
         return self.hass.config.path(STORAGE_DIR, self.key)
 
+    @property
+    def journal_path(self):
+        """Return the path of the journal."""
+        return f"{self.path}.journal"
+
     async def async_load(self) -> Union[Dict, List, None]:
         """Load data.
 
@@ -226,7 +241,93 @@ class Store:
             os.makedirs(os.path.dirname(path))
 
         _LOGGER.debug("Writing data for %s", self.key)
-        json_util.save_json(path, data, self._private, encoder=self._encoder)
+        start = monotonic()
+        self.last_write_size = json_util.save_json(
+            path, data, self._private, encoder=self._encoder, compact=self._compact
+        )
+        self.last_write_duration = monotonic() - start
+        _LOGGER.debug(
+            "Wrote %s bytes of data for %s in %.3fs",
+            self.last_write_size,
+            self.key,
+            self.last_write_duration,
+        )
+
+    async def async_append_journal(self, records: List[Any]) -> None:
+        """Append records to the journal of the store.
+
+        The journal is kept next to the data and holds one record per line,
+        so adding records does not rewrite what was written before.
+
+        Raises SerializationError or WriteError if the records were not
+        appended.
+        """
+        async with self._write_lock:
+            await self.hass.async_add_executor_job(
+                self._append_journal, self.journal_path, records
+            )
+
+    async def async_load_journal(self) -> List[Any]:
+        """Load the records of the journal of the store."""
+        return await self.hass.async_add_executor_job(
+            self._load_journal, self.journal_path
+        )
+
+    async def async_remove_journal(self) -> None:
+        """Remove the journal of the store."""
+        async with self._write_lock:
+            try:
+                await self.hass.async_add_executor_job(os.unlink, self.journal_path)
+            except FileNotFoundError:
+                pass
+
+    def _append_journal(self, path: str, records: List[Any]) -> None:
+        """Append records to the journal."""
+        try:
+            lines = "".join(
+                f"{json.dumps(record, cls=self._encoder)}\n" for record in records
+            )
+        except (TypeError, ValueError) as err:
+            raise json_util.SerializationError(err)
+
+        _LOGGER.debug("Appending %s records to journal of %s", len(records), self.key)
+        try:
+            if not os.path.isdir(os.path.dirname(path)):
+                os.makedirs(os.path.dirname(path))
+
+            fdesc = os.open(
+                path,
+                os.O_WRONLY | os.O_CREAT | os.O_APPEND,
+                0o600 if self._private else 0o644,
+            )
+            with open(fdesc, "a", encoding="utf-8") as fobj:
+                fobj.write(lines)
+        except OSError as err:
+            raise json_util.WriteError(err)
+
+    def _load_journal(self, path: str) -> List[Any]:
+        """Load the records of the journal.
+
+        A line that can not be parsed was cut short when writing and ends
+        the journal.
+        """
+        records = []
+        try:
+            with open(path, encoding="utf-8") as fobj:
+                for line in fobj:
+                    try:
+                        records.append(json.loads(line))
+                    except ValueError:
+                        _LOGGER.warning(
+                            "Ignoring incomplete record in journal of %s", self.key
+                        )
+                        break
+        except FileNotFoundError:
+            pass
+        except OSError as err:
+            _LOGGER.error("Error reading journal of %s: %s", self.key, err)
+
+        return records
 
     async def _async_migrate_func(self, old_version, old_data):
         """Migrate to the new version."""
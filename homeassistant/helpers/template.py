@@ -1,5 +1,6 @@
 """Template helper methods for rendering strings with Home Assistant data."""
 import base64
+from collections import OrderedDict
 import collections.abc
 from datetime import datetime
 from functools import wraps
@@ -8,7 +9,9 @@ import logging
 import math
 import random
 import re
-from typing import Any, Dict, Iterable, List, Optional, Union
+import threading
+from types import CodeType
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Tuple, Union
 
 import jinja2
 from jinja2 import contextfilter, contextfunction
@@ -50,6 +53,11 @@ _RE_GET_ENTITIES = re.compile(
 )
 _RE_JINJA_DELIMITERS = re.compile(r"\{%|\{\{")
 
+# Number of compiled templates shared between Template instances
+COMPILED_CACHE_SIZE = 512
+_COMPILED_CACHE: "OrderedDict[Tuple[bool, str], CodeType]" = OrderedDict()
+_COMPILED_CACHE_LOCK = threading.Lock()
+
 
 @bind_hass
 def attach(hass: HomeAssistantType, obj: Any) -> None:
@@ -135,6 +143,21 @@ class RenderInfo:
         self._domains = []
         self._entities = []
 
+    @property
+    def all_states(self) -> bool:
+        """Return if the render iterated over all states."""
+        return self._all_states
+
+    @property
+    def domains(self) -> FrozenSet[str]:
+        """Return the domains whose states the render iterated over."""
+        return frozenset(getattr(self, "_domains", ()))
+
+    @property
+    def entities(self) -> FrozenSet[str]:
+        """Return the entities whose states the render accessed."""
+        return frozenset(self._entities)
+
     def filter(self, entity_id: str) -> bool:
         """Template should re-render if the state changes."""
         return entity_id in self._entities
@@ -175,6 +198,8 @@ class Template:
             raise TypeError("Expected template to be a string")
 
         self.template: str = template
+        # Strings without Jinja code render to themselves
+        self.is_static = "{" not in template
         self._compiled_code = None
         self._compiled = None
         self.hass = hass
@@ -190,11 +215,11 @@ class Template:
 
     def ensure_valid(self):
         """Return if template is valid."""
-        if self._compiled_code is not None:
+        if self._compiled_code is not None or self.is_static:
             return
 
         try:
-            self._compiled_code = self._env.compile(self.template)
+            self._compiled_code = _compile(self._env, self.template)
         except jinja2.exceptions.TemplateSyntaxError as err:
             raise TemplateError(err)
 
@@ -219,6 +244,9 @@ class Template:
 
         This method must be run in the event loop.
         """
+        if self.is_static:
+            return self.template.strip()
+
         compiled = self._compiled or self._ensure_compiled()
 
         if variables is not None:
@@ -268,6 +296,9 @@ class Template:
 
         This method must be run in the event loop.
         """
+        if self.is_static:
+            return self.template.strip()
+
         if self._compiled is None:
             self._ensure_compiled()
 
@@ -322,6 +353,29 @@ class Template:
         return 'Template("' + self.template + '")'
 
 
+def _compile(env: "TemplateEnvironment", source: str) -> CodeType:
+    """Compile the source of a template or return the code of an earlier compile.
+
+    The code only depends on the filters and tests of the environment, which
+    are the same for all environments with a hass instance.
+    """
+    key = (env.hass is not None, source)
+    with _COMPILED_CACHE_LOCK:
+        code = _COMPILED_CACHE.get(key)
+        if code is not None:
+            _COMPILED_CACHE.move_to_end(key)
+            return code
+
+    code = env.compile(source)
+
+    with _COMPILED_CACHE_LOCK:
+        _COMPILED_CACHE[key] = code
+        if len(_COMPILED_CACHE) > COMPILED_CACHE_SIZE:
+            _COMPILED_CACHE.popitem(last=False)
+
+    return code
+
+
 class AllStates:
     """Class to expose all HA states as attributes."""
 
@@ -40,6 +40,9 @@ DATA_INTEGRATIONS = "integrations"
 DATA_CUSTOM_COMPONENTS = "custom_components"
 PACKAGE_CUSTOM_COMPONENTS = "custom_components"
 PACKAGE_BUILTIN = "homeassistant.components"
+STORAGE_KEY = "core.custom_components"
+STORAGE_VERSION = 1
+STORAGE_SAVE_DELAY = 10
 CUSTOM_WARNING = (
     "You are using a custom integration for %s which has not "
     "been tested by Home Assistant. This component might "
@@ -61,6 +64,50 @@ def manifest_from_legacy_module(domain: str, module: ModuleType) -> Dict:
     }
 
 
+def _load_custom_manifests(
+    paths: List[str], index: Dict[str, Dict[str, Any]]
+) -> Dict[str, Dict[str, Any]]:
+    """Return the manifests of the custom integrations in a set of paths.
+
+    The index maps the path of each manifest to its modification time and
+    content. Manifests that did not change since they were indexed are not
+    read again.
+    """
+    manifests: Dict[str, Dict[str, Any]] = {}
+    seen: Set[str] = set()
+
+    for path in paths:
+        for entry in pathlib.Path(path).iterdir():
+            if entry.name in seen or not entry.is_dir():
+                continue
+
+            manifest_path = entry / "manifest.json"
+
+            try:
+                mtime = manifest_path.stat().st_mtime
+            except OSError:
+                continue
+
+            key = str(manifest_path)
+            cached = index.get(key)
+
+            if cached is not None and cached["mtime"] == mtime:
+                manifest = cached["manifest"]
+            else:
+                try:
+                    manifest = json.loads(manifest_path.read_text())
+                except ValueError as err:
+                    _LOGGER.error(
+                        "Error parsing manifest.json file at %s: %s", manifest_path, err
+                    )
+                    continue
+
+            seen.add(entry.name)
+            manifests[key] = {"name": entry.name, "mtime": mtime, "manifest": manifest}
+
+    return manifests
+
+
 async def _async_get_custom_components(
     hass: "HomeAssistant",
 ) -> Dict[str, "Integration"]:
@@ -73,33 +120,30 @@ async def _async_get_custom_components(
     except ImportError:
         return {}
 
-    def get_sub_directories(paths: List[str]) -> List[pathlib.Path]:
-        """Return all sub directories in a set of paths."""
-        return [
-            entry
-            for path in paths
-            for entry in pathlib.Path(path).iterdir()
-            if entry.is_dir()
-        ]
+    # pylint: disable=import-outside-toplevel
+    from homeassistant.helpers.storage import Store
+
+    store = Store(hass, STORAGE_VERSION, STORAGE_KEY, compact=True)
+    index = await store.async_load() or {}
 
-    dirs = await hass.async_add_executor_job(
-        get_sub_directories, custom_components.__path__
+    manifests = await hass.async_add_executor_job(
+        _load_custom_manifests, custom_components.__path__, index
     )
 
-    integrations = await asyncio.gather(
-        *(
-            hass.async_add_executor_job(
-                Integration.resolve_from_root, hass, custom_components, comp.name
-            )
-            for comp in dirs
+    if manifests != index:
+        store.async_delay_save(lambda: manifests, STORAGE_SAVE_DELAY)
+
+    integrations = [
+        Integration(
+            hass,
+            f"{custom_components.__name__}.{info['name']}",
+            pathlib.Path(manifest_path).parent,
+            dict(info["manifest"]),
         )
-    )
+        for manifest_path, info in manifests.items()
+    ]
 
-    return {
-        integration.domain: integration
-        for integration in integrations
-        if integration is not None
-    }
+    return {integration.domain: integration for integration in integrations}
 
 
 async def async_get_custom_components(
@@ -147,6 +191,30 @@ async def async_get_config_flows(hass: "HomeAssistant") -> Set[str]:
 class Integration:
     """An integration in Home Assistant."""
 
+    @classmethod
+    def resolve_from_index(
+        cls, hass: "HomeAssistant", root_module: ModuleType, domain: str
+    ) -> "Optional[Integration]":
+        """Resolve a built-in integration from the generated manifest index.
+
+        This does not touch the file system, built-in integrations that are
+        not in the index are resolved with resolve_from_root.
+        """
+        # pylint: disable=import-outside-toplevel
+        from homeassistant.generated.manifests import MANIFESTS
+
+        manifest = MANIFESTS.get(domain)
+
+        if manifest is None:
+            return None
+
+        return cls(
+            hass,
+            f"{root_module.__name__}.{domain}",
+            pathlib.Path(root_module.__path__[0]) / domain,  # type: ignore
+            dict(manifest),
+        )
+
     @classmethod
     def resolve_from_root(
         cls, hass: "HomeAssistant", root_module: ModuleType, domain: str
@@ -315,9 +383,12 @@ async def async_get_integration(hass: "HomeAssistant", domain: str) -> Integrati
 
     from homeassistant import components  # pylint: disable=import-outside-toplevel
 
-    integration = await hass.async_add_executor_job(
-        Integration.resolve_from_root, hass, components, domain
-    )
+    integration = Integration.resolve_from_index(hass, components, domain)
+
+    if integration is None:
+        integration = await hass.async_add_executor_job(
+            Integration.resolve_from_root, hass, components, domain
+        )
 
     if integration is not None:
         cache[domain] = integration
@@ -2,7 +2,8 @@
 import argparse
 import asyncio
 from contextlib import suppress
-from datetime import datetime
+from datetime import datetime, timedelta
+import json
 import logging
 from timeit import default_timer as timer
 from typing import Callable, Dict, TypeVar
@@ -10,6 +11,7 @@ from typing import Callable, Dict, TypeVar
 from homeassistant import core
 from homeassistant.components.websocket_api.const import JSON_DUMP
 from homeassistant.const import ATTR_NOW, EVENT_STATE_CHANGED, EVENT_TIME_CHANGED
+from homeassistant.helpers.template import Template
 from homeassistant.util import dt as dt_util
 
 # mypy: allow-untyped-calls, allow-untyped-defs, no-check-untyped-defs
@@ -108,6 +110,33 @@ async def time_changed_helper(hass):
     return timer() - start
 
 
+@benchmark
+async def time_changed_pending_timers(hass):
+    """Run ten thousand time changed events with ten thousand pending timers."""
+    now = dt_util.utcnow()
+    ticks = 10 ** 4
+
+    @core.callback
+    def listener(_):
+        """Handle timer."""
+
+    for _ in range(10 ** 4):
+        hass.helpers.event.async_track_point_in_utc_time(
+            listener, now + timedelta(days=1)
+        )
+
+    start = timer()
+
+    for tick in range(ticks):
+        hass.bus.async_fire(
+            EVENT_TIME_CHANGED, {ATTR_NOW: now + timedelta(seconds=tick)}
+        )
+
+    await hass.async_block_till_done()
+
+    return timer() - start
+
+
 @benchmark
 async def state_changed_helper(hass):
     """Run a million events through state changed helper."""
@@ -141,6 +170,33 @@ async def state_changed_helper(hass):
     return timer() - start
 
 
+@benchmark
+async def state_changed_event_helper(hass):
+    """Run a hundred thousand state writes with a thousand trackers."""
+    entity_id = "light.kitchen"
+    events_to_fire = 10 ** 5
+
+    @core.callback
+    def listener(*args):
+        """Handle event."""
+
+    for idx in range(1000):
+        hass.helpers.event.async_track_state_change(
+            f"{entity_id}_{idx}", listener, "off", "on"
+        )
+
+    start = timer()
+
+    for idx in range(events_to_fire):
+        hass.states.async_set(entity_id, "on" if idx % 2 else "off")
+
+    await hass.async_block_till_done()
+
+    runtime = timer() - start
+    print(f"{events_to_fire / runtime:.0f} state writes per second")
+    return runtime
+
+
 @benchmark
 async def logbook_filtering_state(hass):
     """Filter state changes."""
@@ -188,6 +244,92 @@ async def _logbook_filtering(hass, last_changed, last_updated):
     return timer() - start
 
 
+@benchmark
+async def mqtt_topic_routing(hass):
+    """Route ten thousand messages over 1500 subscriptions with the topic trie."""
+    mqtt_client, topics = await _mqtt_setup_subscriptions(hass)
+    messages = _mqtt_messages(topics)
+
+    start = timer()
+
+    for msg in messages:
+        mqtt_client._mqtt_handle_message(msg)  # pylint: disable=protected-access
+
+    return timer() - start
+
+
+@benchmark
+async def mqtt_topic_routing_matcher(hass):
+    """Match ten thousand messages over 1500 subscriptions one by one."""
+    # pylint: disable=import-outside-toplevel,protected-access
+    from homeassistant.components.mqtt import _match_topic
+
+    mqtt_client, topics = await _mqtt_setup_subscriptions(hass)
+    messages = _mqtt_messages(topics)
+
+    start = timer()
+
+    for msg in messages:
+        for subscription in mqtt_client.subscriptions:
+            _match_topic(subscription.topic, msg.topic)
+
+    return timer() - start
+
+
+async def _mqtt_setup_subscriptions(hass):
+    """Set up an MQTT client with typical Zigbee2MQTT/Tasmota subscriptions."""
+    # pylint: disable=import-outside-toplevel
+    from homeassistant.components.mqtt import MQTT
+
+    mqtt_client = MQTT(
+        hass,
+        "localhost",
+        1883,
+        client_id=None,
+        keepalive=60,
+        username=None,
+        password=None,
+        certificate=None,
+        client_key=None,
+        client_cert=None,
+        tls_insecure=None,
+        protocol=None,
+        will_message=None,
+        birth_message=None,
+        tls_version=None,
+    )
+
+    @core.callback
+    def listener(_):
+        """Handle message."""
+
+    topics = []
+    for idx in range(500):
+        topics.append(f"zigbee2mqtt/device_{idx}")
+        topics.append(f"tele/tasmota_{idx}/SENSOR")
+        topics.append(f"stat/tasmota_{idx}/+")
+
+    for topic in topics:
+        await mqtt_client.async_subscribe(topic, listener, 0)
+
+    return mqtt_client, topics
+
+
+def _mqtt_messages(topics):
+    """Return messages published on subscribed topics."""
+    # pylint: disable=import-outside-toplevel
+    from paho.mqtt.client import MQTTMessage
+
+    messages = []
+    for idx in range(10 ** 4):
+        topic = topics[idx % len(topics)].replace("+", "POWER")
+        msg = MQTTMessage(topic=topic.encode())
+        msg.payload = b"{}"
+        messages.append(msg)
+
+    return messages
+
+
 @benchmark
 async def valid_entity_id(hass):
     """Run valid entity ID a million times."""
@@ -208,3 +350,28 @@ async def json_serialize_states(hass):
     start = timer()
     JSON_DUMP(states)
     return timer() - start
+
+
+@benchmark
+async def render_mqtt_templates(hass):
+    """Render value templates of 100 MQTT entities for 100 payloads."""
+    sources = [
+        "{{ value_json.temperature }}",
+        "{{ value_json.humidity | round(1) }}",
+        "{{ value_json.state | lower }}",
+        "{{ value }}",
+        "ON",
+    ]
+    payloads = [
+        json.dumps({"temperature": idx / 10, "humidity": idx / 3, "state": "ON"})
+        for idx in range(100)
+    ]
+
+    start = timer()
+    for _ in range(100):
+        # Each entity has its own templates with the same sources
+        templates = [Template(source, hass) for source in sources]
+        for payload in payloads:
+            for template in templates:
+                template.async_render_with_possible_json_value(payload, "")
+    return timer() - start
@@ -1,13 +1,18 @@
 """All methods needed to bootstrap a Home Assistant instance."""
 import asyncio
+import contextlib
 import logging.handlers
 from timeit import default_timer as timer
 from types import ModuleType
-from typing import Awaitable, Callable, List, Optional
+from typing import Any, Awaitable, Callable, Dict, Generator, List, Optional, Tuple
 
 from homeassistant import config as conf_util, core, loader, requirements
 from homeassistant.config import async_notify_setup_error
-from homeassistant.const import EVENT_COMPONENT_LOADED, PLATFORM_FORMAT
+from homeassistant.const import (
+    EVENT_COMPONENT_LOADED,
+    EVENT_HOMEASSISTANT_STARTED,
+    PLATFORM_FORMAT,
+)
 from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers.typing import ConfigType
 from homeassistant.util import dt as dt_util
@@ -19,6 +24,15 @@ ATTR_COMPONENT = "component"
 DATA_SETUP_STARTED = "setup_started"
 DATA_SETUP = "setup_tasks"
 DATA_DEPS_REQS = "deps_reqs_processed"
+DATA_SETUP_TIMINGS = "setup_timings"
+DATA_SETUP_TIMINGS_DONE = "setup_timings_done"
+
+PHASE_DEPENDENCIES = "wait_dependencies"
+PHASE_REQUIREMENTS = "requirements"
+PHASE_IMPORT = "import"
+PHASE_SETUP = "setup"
+PHASE_SETUP_ENTRY = "setup_entry"
+PHASE_SETUP_PLATFORM = "setup_platform"
 
 SLOW_SETUP_WARNING = 10
 # Since a pip install can run, we wait
@@ -139,7 +153,8 @@ async def _async_setup_component(
     # Some integrations fail on import because they call functions incorrectly.
     # So we do it before validating config to catch these errors.
     try:
-        component = integration.get_component()
+        with async_time_setup_phase(hass, domain, PHASE_IMPORT):
+            component = integration.get_component()
     except ImportError as err:
         log_error(f"Unable to import component: {err}", integration.documentation)
         return False
@@ -204,6 +219,7 @@ async def _async_setup_component(
         return False
     finally:
         end = timer()
+        _async_add_setup_timing(hass, domain, PHASE_SETUP, PHASE_SETUP, start, end)
         if warn_task:
             warn_task.cancel()
     _LOGGER.info("Setup of domain %s took %.1f seconds.", domain, end - start)
@@ -272,7 +288,8 @@ async def async_prepare_setup_platform(
         return None
 
     try:
-        platform = integration.get_platform(domain)
+        with async_time_setup_phase(hass, platform_name, PHASE_IMPORT, domain):
+            platform = integration.get_platform(domain)
     except ImportError as exc:
         log_error(f"Platform not found ({exc}).")
         return None
@@ -312,15 +329,19 @@ async def async_process_deps_reqs(
     elif integration.domain in processed:
         return
 
-    if integration.dependencies and not await _async_process_dependencies(
-        hass, config, integration.domain, integration.dependencies
-    ):
-        raise HomeAssistantError("Could not set up all dependencies.")
+    if integration.dependencies:
+        with async_time_setup_phase(hass, integration.domain, PHASE_DEPENDENCIES):
+            success = await _async_process_dependencies(
+                hass, config, integration.domain, integration.dependencies
+            )
+        if not success:
+            raise HomeAssistantError("Could not set up all dependencies.")
 
     if not hass.config.skip_pip and integration.requirements:
-        await requirements.async_get_integration_with_requirements(
-            hass, integration.domain
-        )
+        with async_time_setup_phase(hass, integration.domain, PHASE_REQUIREMENTS):
+            await requirements.async_get_integration_with_requirements(
+                hass, integration.domain
+            )
 
     processed.add(integration.domain)
 
@@ -356,3 +377,106 @@ def async_when_setup(
         await when_setup()
 
     unsub = hass.bus.async_listen(EVENT_COMPONENT_LOADED, loaded_event)
+
+
+@contextlib.contextmanager
+def async_time_setup_phase(
+    hass: core.HomeAssistant, integration: str, phase: str, name: Optional[str] = None
+) -> Generator[None, None, None]:
+    """Record the wall time spent in a phase of setting up an integration.
+
+    The name describes the span in the trace, it defaults to the phase.
+    """
+    start = timer()
+    try:
+        yield
+    finally:
+        _async_add_setup_timing(hass, integration, phase, name or phase, start, timer())
+
+
+@core.callback
+def _async_add_setup_timing(
+    hass: core.HomeAssistant,
+    integration: str,
+    phase: str,
+    name: str,
+    start: float,
+    end: float,
+) -> None:
+    """Store a timed span of setting up an integration.
+
+    Spans are only stored until Home Assistant has started, integrations set
+    up later on do not add to them.
+    """
+    spans: Optional[List[Tuple[str, str, str, float, float]]] = hass.data.get(
+        DATA_SETUP_TIMINGS
+    )
+    if spans is None:
+        spans = hass.data[DATA_SETUP_TIMINGS] = []
+
+        @core.callback
+        def _async_started(event: core.Event) -> None:
+            """Stop storing spans."""
+            hass.data[DATA_SETUP_TIMINGS_DONE] = True
+
+        hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STARTED, _async_started)
+    elif DATA_SETUP_TIMINGS_DONE in hass.data:
+        return
+
+    spans.append((integration, phase, name, start, end))
+
+
+@core.callback
+def async_get_setup_timings(hass: core.HomeAssistant) -> Dict[str, Dict[str, float]]:
+    """Return the seconds spent per integration in each phase of its setup."""
+    timings: Dict[str, Dict[str, float]] = {}
+
+    for integration, phase, _, start, end in hass.data.get(DATA_SETUP_TIMINGS, []):
+        phases = timings.setdefault(integration, {})
+        phases[phase] = phases.get(phase, 0) + end - start
+
+    return timings
+
+
+@core.callback
+def async_get_setup_trace(hass: core.HomeAssistant) -> List[Dict[str, Any]]:
+    """Return the setup spans as events in the Chrome trace format.
+
+    Every integration gets its own thread, so the critical path of the
+    startup can be followed in chrome://tracing or Perfetto.
+    """
+    spans = hass.data.get(DATA_SETUP_TIMINGS, [])
+    if not spans:
+        return []
+
+    origin = min(span[3] for span in spans)
+    threads: Dict[str, int] = {}
+    events: List[Dict[str, Any]] = []
+
+    for integration, phase, name, start, end in spans:
+        tid = threads.get(integration)
+        if tid is None:
+            tid = threads[integration] = len(threads) + 1
+            events.append(
+                {
+                    "name": "thread_name",
+                    "ph": "M",
+                    "pid": 1,
+                    "tid": tid,
+                    "args": {"name": integration},
+                }
+            )
+
+        events.append(
+            {
+                "name": name,
+                "cat": phase,
+                "ph": "X",
+                "pid": 1,
+                "tid": tid,
+                "ts": round((start - origin) * 1000000),
+                "dur": round((end - start) * 1000000),
+            }
+        )
+
+    return events
@@ -117,6 +117,30 @@ def get_random_string(length: int = 10) -> str:
     return "".join(generator.choice(source_chars) for _ in range(length))
 
 
+class ReadOnlyDict(dict):
+    """Dictionary that can not be modified.
+
+    Used for representations that are cached and shared by all callers.
+    It is still a dict, so it can be encoded as JSON.
+    """
+
+    def _readonly(self, *args: Any, **kwargs: Any) -> Any:
+        """Raise an exception when a read only dict is modified."""
+        raise RuntimeError("Cannot modify ReadOnlyDict")
+
+    __setitem__ = _readonly
+    __delitem__ = _readonly
+    pop = _readonly  # type: ignore
+    popitem = _readonly
+    clear = _readonly
+    update = _readonly  # type: ignore
+    setdefault = _readonly
+
+    def __reduce__(self) -> Any:
+        """Copy and pickle the dict without modifying it."""
+        return (self.__class__, (dict(self),))
+
+
 class OrderedEnum(enum.Enum):
     """Taken from Python 3.4.0 docs."""
 
@@ -48,13 +48,20 @@ def save_json(
     private: bool = False,
     *,
     encoder: Optional[Type[json.JSONEncoder]] = None,
-) -> None:
+    compact: bool = False,
+) -> int:
     """Save JSON data to a file.
 
-    Returns True on success.
+    Compact JSON is written without indentation, which lets the C encoder
+    of the json module encode it. Returns the number of bytes written.
     """
     try:
-        json_data = json.dumps(data, sort_keys=True, indent=4, cls=encoder)
+        if compact:
+            json_data = json.dumps(
+                data, sort_keys=True, separators=(",", ":"), cls=encoder
+            )
+        else:
+            json_data = json.dumps(data, sort_keys=True, indent=4, cls=encoder)
     except TypeError:
         msg = f"Failed to serialize to JSON: {filename}. Bad data at {format_unserializable_data(find_paths_unserializable_data(data))}"
         _LOGGER.error(msg)
@@ -72,6 +79,7 @@ def save_json(
         if not private:
             os.chmod(tmp_filename, 0o644)
         os.replace(tmp_filename, filename)
+        return len(json_data)
     except OSError as error:
         _LOGGER.exception("Saving JSON file failed: %s", filename)
         raise WriteError(error)
@@ -1,7 +1,7 @@
 """Tests for the auth store."""
 import asyncio
 
-from homeassistant.auth import auth_store
+from homeassistant.auth import auth_store, models
 
 from tests.async_mock import patch
 
@@ -242,3 +242,29 @@ async def test_loading_race_condition(hass):
         mock_dev_registry.assert_called_once_with(hass)
         mock_load.assert_called_once_with()
         assert results[0] == results[1]
+
+
+async def test_permissions_follow_registry_updates(hass):
+    """Test permissions are checked again when the registries change."""
+    store = auth_store.AuthStore(hass)
+    user = await store.async_create_user("Tablet")
+    user.groups = [
+        models.Group(
+            name="Kitchen", policy={"entities": {"area_ids": {"kitchen": True}}}
+        )
+    ]
+
+    dev_reg = await hass.helpers.device_registry.async_get_registry()
+    ent_reg = await hass.helpers.entity_registry.async_get_registry()
+    device = dev_reg.async_get_or_create(
+        config_entry_id="mock-entry", identifiers={("hue", "1234")}
+    )
+    entry = ent_reg.async_get_or_create("light", "hue", "1234", device_id=device.id)
+    await hass.async_block_till_done()
+
+    assert not user.permissions.check_entity(entry.entity_id, "read")
+
+    dev_reg.async_update_device(device.id, area_id="kitchen")
+    await hass.async_block_till_done()
+
+    assert user.permissions.check_entity(entry.entity_id, "read")
@@ -474,6 +474,71 @@ async def test_remove_refresh_token(mock_hass):
     assert await manager.async_validate_access_token(access_token) is None
 
 
+async def test_validate_access_token_cached(mock_hass):
+    """Test validated access tokens are remembered until revoked."""
+    manager = await auth.auth_manager_from_config(mock_hass, [], [])
+    user = MockUser().add_to_auth_manager(manager)
+    refresh_token = await manager.async_create_refresh_token(user, CLIENT_ID)
+    access_token = manager.async_create_access_token(refresh_token)
+
+    assert await manager.async_validate_access_token(access_token) is refresh_token
+
+    with patch("jwt.decode", wraps=jwt.decode) as mock_decode:
+        assert await manager.async_validate_access_token(access_token) is refresh_token
+
+    assert not mock_decode.mock_calls
+
+    user.is_active = False
+    assert await manager.async_validate_access_token(access_token) is None
+
+    user.is_active = True
+    assert await manager.async_validate_access_token(access_token) is refresh_token
+
+    await manager.async_remove_refresh_token(refresh_token)
+
+    assert await manager.async_validate_access_token(access_token) is None
+
+
+async def test_access_token_cache_size(mock_hass):
+    """Test the oldest validated access tokens are forgotten."""
+    manager = await auth.auth_manager_from_config(mock_hass, [], [])
+    user = MockUser().add_to_auth_manager(manager)
+    first_token = manager.async_create_access_token(
+        await manager.async_create_refresh_token(user, CLIENT_ID)
+    )
+    second_token = manager.async_create_access_token(
+        await manager.async_create_refresh_token(user, CLIENT_ID)
+    )
+
+    with patch("homeassistant.auth.ACCESS_TOKEN_CACHE_SIZE", 1):
+        assert await manager.async_validate_access_token(first_token)
+        assert await manager.async_validate_access_token(second_token)
+
+    with patch("jwt.decode", wraps=jwt.decode) as mock_decode:
+        assert await manager.async_validate_access_token(second_token)
+        assert not mock_decode.mock_calls
+        assert await manager.async_validate_access_token(first_token)
+        assert mock_decode.mock_calls
+
+
+async def test_get_refresh_token_by_token(mock_hass):
+    """Test looking up a refresh token by its token."""
+    manager = await auth.auth_manager_from_config(mock_hass, [], [])
+    user = MockUser().add_to_auth_manager(manager)
+    refresh_token = await manager.async_create_refresh_token(user, CLIENT_ID)
+
+    assert (
+        await manager.async_get_refresh_token_by_token(refresh_token.token)
+        is refresh_token
+    )
+    assert await manager.async_get_refresh_token_by_token("invalid") is None
+
+    await manager.async_remove_user(user)
+
+    assert await manager.async_get_refresh_token_by_token(refresh_token.token) is None
+    assert await manager.async_get_refresh_token(refresh_token.id) is None
+
+
 async def test_create_access_token(mock_hass):
     """Test normal refresh_token's jwt_key keep same after used."""
     manager = await auth.auth_manager_from_config(mock_hass, [], [])
@@ -63,6 +63,7 @@ from tests.async_mock import AsyncMock, MagicMock, Mock, patch
 
 _LOGGER = logging.getLogger(__name__)
 INSTANCES = []
+STORAGE_MOCKS = []
 CLIENT_ID = "https://example.com/app"
 CLIENT_REDIRECT_URI = "https://example.com/app/callback"
 
@@ -106,6 +107,12 @@ def get_test_config_dir(*add_path):
     return os.path.join(os.path.dirname(__file__), "testing_config", *add_path)
 
 
+def exit_storage_mocks():
+    """Remove the storage mocks of test instances that were not stopped."""
+    while STORAGE_MOCKS:
+        STORAGE_MOCKS.pop().__exit__(None, None, None)
+
+
 def get_test_home_assistant():
     """Return a Home Assistant object pointing at test config directory."""
     if sys.platform == "win32":
@@ -114,6 +121,13 @@ def get_test_home_assistant():
         loop = asyncio.new_event_loop()
 
     asyncio.set_event_loop(loop)
+
+    # Keep stores out of the test config directory, like the hass fixture.
+    # The mock is removed when hass stops, or after the test otherwise.
+    storage = mock_storage()
+    storage.__enter__()
+    STORAGE_MOCKS.append(storage)
+
     hass = loop.run_until_complete(async_test_home_assistant(loop))
 
     stop_event = threading.Event()
@@ -136,6 +150,9 @@ def get_test_home_assistant():
         orig_stop()
         stop_event.wait()
         loop.close()
+        if storage in STORAGE_MOCKS:
+            STORAGE_MOCKS.remove(storage)
+            storage.__exit__(None, None, None)
 
     hass.start = start_hass
     hass.stop = stop_hass
@@ -906,6 +923,9 @@ class MockEntity(entity.Entity):
         return getattr(super(), attr)
 
 
+_MOCK_STORAGE_DATA = []
+
+
 @contextmanager
 def mock_storage(data=None):
     """Mock storage.
@@ -917,10 +937,24 @@ def mock_storage(data=None):
     if data is None:
         data = {}
 
+    if _MOCK_STORAGE_DATA:
+        # Storage is already mocked, route reads and writes to this data
+        _MOCK_STORAGE_DATA.append(data)
+        try:
+            yield data
+        finally:
+            _MOCK_STORAGE_DATA.pop()
+        return
+
+    def current():
+        """Return the data of the innermost mock_storage."""
+        return _MOCK_STORAGE_DATA[-1]
+
     orig_load = storage.Store._async_load
 
     async def mock_async_load(store):
         """Mock version of load."""
+        data = current()
         if store._data is None:
             # No data to load
             if store.key not in data:
@@ -943,11 +977,26 @@ def mock_storage(data=None):
         """Mock version of write data."""
         _LOGGER.info("Writing data to %s: %s", store.key, data_to_write)
         # To ensure that the data can be serialized
-        data[store.key] = json.loads(json.dumps(data_to_write, cls=store._encoder))
+        current()[store.key] = json.loads(json.dumps(data_to_write, cls=store._encoder))
 
     async def mock_remove(store):
         """Remove data."""
-        data.pop(store.key, None)
+        current().pop(store.key, None)
+
+    def mock_append_journal(store, path, records):
+        """Mock version of appending to the journal."""
+        _LOGGER.info("Appending to journal of %s: %s", store.key, records)
+        current().setdefault(f"{store.key}.journal", []).extend(
+            json.loads(json.dumps(records, cls=store._encoder))
+        )
+
+    def mock_load_journal(store, path):
+        """Mock version of loading the journal."""
+        return list(current().get(f"{store.key}.journal", []))
+
+    async def mock_remove_journal(store):
+        """Remove the journal."""
+        current().pop(f"{store.key}.journal", None)
 
     with patch(
         "homeassistant.helpers.storage.Store._async_load",
@@ -961,8 +1010,24 @@ def mock_storage(data=None):
         "homeassistant.helpers.storage.Store.async_remove",
         side_effect=mock_remove,
         autospec=True,
+    ), patch(
+        "homeassistant.helpers.storage.Store._append_journal",
+        side_effect=mock_append_journal,
+        autospec=True,
+    ), patch(
+        "homeassistant.helpers.storage.Store._load_journal",
+        side_effect=mock_load_journal,
+        autospec=True,
+    ), patch(
+        "homeassistant.helpers.storage.Store.async_remove_journal",
+        side_effect=mock_remove_journal,
+        autospec=True,
     ):
-        yield data
+        _MOCK_STORAGE_DATA.append(data)
+        try:
+            yield data
+        finally:
+            _MOCK_STORAGE_DATA.pop()
 
 
 async def flush_store(store):
@@ -1,8 +1,13 @@
 """Test report state."""
+from datetime import timedelta
+
 from homeassistant.components.alexa import state_report
+from homeassistant.util.dt import utcnow
 
 from . import DEFAULT_CONFIG, TEST_URL
 
+from tests.common import async_fire_time_changed
+
 
 async def test_report_state(hass, aioclient_mock):
     """Test proactive state reports."""
@@ -24,6 +29,12 @@ async def test_report_state(hass, aioclient_mock):
 
     # To trigger event listener
     await hass.async_block_till_done()
+    assert len(aioclient_mock.mock_calls) == 0
+
+    async_fire_time_changed(
+        hass, utcnow() + timedelta(seconds=state_report.REPORT_STATE_WINDOW)
+    )
+    await hass.async_block_till_done()
 
     assert len(aioclient_mock.mock_calls) == 1
     call = aioclient_mock.mock_calls
@@ -70,6 +81,12 @@ async def test_report_state_instance(hass, aioclient_mock):
 
     # To trigger event listener
     await hass.async_block_till_done()
+    assert len(aioclient_mock.mock_calls) == 0
+
+    async_fire_time_changed(
+        hass, utcnow() + timedelta(seconds=state_report.REPORT_STATE_WINDOW)
+    )
+    await hass.async_block_till_done()
 
     assert len(aioclient_mock.mock_calls) == 1
     call = aioclient_mock.mock_calls
@@ -88,6 +105,52 @@ async def test_report_state_instance(hass, aioclient_mock):
     assert call_json["event"]["endpoint"]["endpointId"] == "fan#test_fan"
 
 
+async def test_report_state_coalesce(hass, aioclient_mock):
+    """Test only the last change during the window is reported if it differs."""
+    aioclient_mock.post(TEST_URL, text="", status=202)
+
+    hass.states.async_set("binary_sensor.test_contact", "on", {"device_class": "door"})
+    hass.states.async_set("binary_sensor.test_motion", "on", {"device_class": "door"})
+
+    await state_report.async_enable_proactive_mode(hass, DEFAULT_CONFIG)
+
+    for state in ("off", "on", "off"):
+        hass.states.async_set(
+            "binary_sensor.test_contact", state, {"device_class": "door"}
+        )
+    hass.states.async_set("binary_sensor.test_motion", "off", {"device_class": "door"})
+    await hass.async_block_till_done()
+
+    async_fire_time_changed(
+        hass, utcnow() + timedelta(seconds=state_report.REPORT_STATE_WINDOW)
+    )
+    await hass.async_block_till_done()
+
+    assert len(aioclient_mock.mock_calls) == 2
+    reports = {
+        call[2]["event"]["endpoint"]["endpointId"]: call[2]["event"]["payload"][
+            "change"
+        ]["properties"][0]["value"]
+        for call in aioclient_mock.mock_calls
+    }
+    assert reports == {
+        "binary_sensor#test_contact": "NOT_DETECTED",
+        "binary_sensor#test_motion": "NOT_DETECTED",
+    }
+
+    # Changes that do not change the reported properties are not reported
+    hass.states.async_set(
+        "binary_sensor.test_contact", "off", {"device_class": "door", "extra": 1}
+    )
+    await hass.async_block_till_done()
+    async_fire_time_changed(
+        hass, utcnow() + timedelta(seconds=state_report.REPORT_STATE_WINDOW * 2)
+    )
+    await hass.async_block_till_done()
+
+    assert len(aioclient_mock.mock_calls) == 2
+
+
 async def test_send_add_or_update_message(hass, aioclient_mock):
     """Test sending an AddOrUpdateReport message."""
     aioclient_mock.post(TEST_URL, text="")
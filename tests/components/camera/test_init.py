@@ -6,7 +6,11 @@ import io
 import pytest
 
 from homeassistant.components import camera
-from homeassistant.components.camera.const import DOMAIN, PREF_PRELOAD_STREAM
+from homeassistant.components.camera.const import (
+    DOMAIN,
+    PREF_FRAME_CACHE_TTL,
+    PREF_PRELOAD_STREAM,
+)
 from homeassistant.components.camera.prefs import CameraEntityPreferences
 from homeassistant.components.websocket_api.const import TYPE_RESULT
 from homeassistant.config import async_process_ha_core_config
@@ -354,3 +358,73 @@ async def test_record_service(hass, mock_camera, mock_stream):
         # So long as we call stream.record, the rest should be covered
         # by those tests.
         assert mock_record_service.called
+
+
+async def test_concurrent_image_requests_share_fetch(hass, mock_camera):
+    """Test concurrent requests for an image fetch it from the camera once."""
+    calls = []
+    release = asyncio.Event()
+
+    async def mock_camera_image(self):
+        calls.append(self)
+        await release.wait()
+        return b"Test"
+
+    with patch(
+        "homeassistant.components.demo.camera.DemoCamera.async_camera_image",
+        mock_camera_image,
+    ):
+        tasks = [
+            hass.async_create_task(camera.async_get_image(hass, "camera.demo_camera"))
+            for _ in range(3)
+        ]
+        await asyncio.sleep(0)
+        release.set()
+        images = await asyncio.gather(*tasks)
+
+        assert len(calls) == 1
+        assert [image.content for image in images] == [b"Test"] * 3
+
+        # Without a frame cache TTL the next request fetches a new image
+        await camera.async_get_image(hass, "camera.demo_camera")
+        assert len(calls) == 2
+
+
+async def test_frame_cache_ttl(hass, mock_camera):
+    """Test images are shared with requests within the frame cache TTL."""
+    common.mock_camera_prefs(
+        hass, "camera.demo_camera", {PREF_FRAME_CACHE_TTL: camera.MAX_FRAME_CACHE_TTL}
+    )
+
+    with patch(
+        "homeassistant.components.demo.camera.DemoCamera.async_camera_image",
+        return_value=b"Test",
+    ) as mock_camera_image:
+        await camera.async_get_image(hass, "camera.demo_camera")
+        image = await camera.async_get_image(hass, "camera.demo_camera")
+
+    assert mock_camera_image.call_count == 1
+    assert image.content == b"Test"
+
+
+async def test_mjpeg_streams_share_frames(hass, hass_client, mock_camera):
+    """Test MJPEG streams with the same interval share the camera images."""
+    client = await hass_client()
+    frame = camera._mjpeg_frame("image/jpeg", b"Test")
+
+    with patch(
+        "homeassistant.components.demo.camera.DemoCamera.async_camera_image",
+        return_value=b"Test",
+    ) as mock_camera_image:
+        responses = [
+            await client.get("/api/camera_proxy_stream/camera.demo_camera?interval=1")
+            for _ in range(2)
+        ]
+
+        for response in responses:
+            assert response.status == 200
+            # The first frame is sent twice
+            assert await response.content.readexactly(2 * len(frame)) == 2 * frame
+            response.close()
+
+    assert mock_camera_image.call_count == 1
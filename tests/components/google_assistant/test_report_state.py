@@ -1,4 +1,6 @@
 """Test Google report state."""
+from datetime import timedelta
+
 from homeassistant.components.google_assistant import error, report_state
 from homeassistant.util.dt import utcnow
 
@@ -38,6 +40,14 @@ async def test_report_state(hass, caplog):
         hass.states.async_set("light.kitchen", "on")
         await hass.async_block_till_done()
 
+        # State changes are reported at the end of the window
+        assert len(mock_report.mock_calls) == 0
+
+        async_fire_time_changed(
+            hass, utcnow() + timedelta(seconds=report_state.REPORT_STATE_WINDOW)
+        )
+        await hass.async_block_till_done()
+
     assert len(mock_report.mock_calls) == 1
     assert mock_report.mock_calls[0][1][0] == {
         "devices": {"states": {"light.kitchen": {"on": True, "online": True}}}
@@ -51,6 +61,9 @@ async def test_report_state(hass, caplog):
         hass.states.async_set(
             "light.kitchen", "on", {"irrelevant": "should_be_ignored"}
         )
+        async_fire_time_changed(
+            hass, utcnow() + timedelta(seconds=report_state.REPORT_STATE_WINDOW)
+        )
         await hass.async_block_till_done()
 
     assert len(mock_report.mock_calls) == 0
@@ -63,6 +76,9 @@ async def test_report_state(hass, caplog):
         side_effect=error.SmartHomeError("mock-error", "mock-msg"),
     ):
         hass.states.async_set("light.kitchen", "off")
+        async_fire_time_changed(
+            hass, utcnow() + timedelta(seconds=report_state.REPORT_STATE_WINDOW)
+        )
         await hass.async_block_till_done()
 
     assert "Not reporting state for light.kitchen: mock-error"
@@ -74,6 +90,46 @@ async def test_report_state(hass, caplog):
         BASIC_CONFIG, "async_report_state_all", AsyncMock()
     ) as mock_report:
         hass.states.async_set("light.kitchen", "on")
+        async_fire_time_changed(
+            hass, utcnow() + timedelta(seconds=report_state.REPORT_STATE_WINDOW)
+        )
         await hass.async_block_till_done()
 
     assert len(mock_report.mock_calls) == 0
+
+
+async def test_report_state_coalesce(hass):
+    """Test changes during the window are reported together."""
+    hass.states.async_set("light.ceiling", "off")
+    hass.states.async_set("light.kitchen", "off")
+    hass.states.async_set("switch.ac", "on")
+    unsub = report_state.async_enable_report_state(hass, BASIC_CONFIG)
+
+    with patch.object(
+        BASIC_CONFIG, "async_report_state_all", AsyncMock()
+    ) as mock_report:
+        hass.states.async_set("light.ceiling", "on")
+        hass.states.async_set("light.kitchen", "on")
+        hass.states.async_set("light.kitchen", "off")
+        hass.states.async_set("switch.ac", "off")
+        hass.states.async_set("switch.ac", "on")
+        hass.states.async_set("switch.ac", "off")
+        await hass.async_block_till_done()
+
+        async_fire_time_changed(
+            hass, utcnow() + timedelta(seconds=report_state.REPORT_STATE_WINDOW)
+        )
+        await hass.async_block_till_done()
+
+    # Changes back to the reported state are not reported
+    assert len(mock_report.mock_calls) == 1
+    assert mock_report.mock_calls[0][1][0] == {
+        "devices": {
+            "states": {
+                "light.ceiling": {"on": True, "online": True},
+                "switch.ac": {"on": False, "online": True},
+            }
+        }
+    }
+
+    unsub()
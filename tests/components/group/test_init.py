@@ -14,6 +14,7 @@ from homeassistant.const import (
     STATE_ON,
     STATE_UNKNOWN,
 )
+from homeassistant.helpers.event import TRACK_STATE_CHANGE_CALLBACKS
 from homeassistant.setup import async_setup_component, setup_component
 
 from tests.async_mock import patch
@@ -370,6 +371,16 @@ class TestComponentsGroup(unittest.TestCase):
         self.hass.block_till_done()
         assert STATE_NOT_HOME == self.hass.states.get(f"{group.DOMAIN}.peeps").state
 
+    def _tracked_state_changes(self):
+        """Return the number of registered state change trackers."""
+        return len(
+            {
+                action
+                for actions in self.hass.data[TRACK_STATE_CHANGE_CALLBACKS].values()
+                for action in actions
+            }
+        )
+
     def test_reloading_groups(self):
         """Test reloading the group config."""
         assert setup_component(
@@ -394,7 +405,7 @@ class TestComponentsGroup(unittest.TestCase):
             "group.second_group",
             "group.test_group",
         ]
-        assert self.hass.bus.listeners["state_changed"] == 3
+        assert self._tracked_state_changes() == 3
 
         with patch(
             "homeassistant.config.load_yaml_config_file",
@@ -409,7 +420,7 @@ class TestComponentsGroup(unittest.TestCase):
             "group.all_tests",
             "group.hello",
         ]
-        assert self.hass.bus.listeners["state_changed"] == 2
+        assert self._tracked_state_changes() == 2
 
     def test_modify_group(self):
         """Test modifying a group."""
@@ -485,3 +496,70 @@ async def test_service_group_set_group_remove_group(hass):
 
     group_state = hass.states.get("group.user_test_group")
     assert group_state is None
+
+
+async def test_groups_with_entity(hass):
+    """Test looking up the groups tracking an entity."""
+    with assert_setup_component(0, "group"):
+        await async_setup_component(hass, "group", {"group": {}})
+
+    assert group.groups_with_entity(hass, "light.bowl") == []
+
+    common.async_set_group(hass, "first", entity_ids=["light.bowl", "light.ceiling"])
+    common.async_set_group(hass, "second", entity_ids=["light.bowl"])
+    await hass.async_block_till_done()
+
+    assert sorted(group.groups_with_entity(hass, "light.bowl")) == [
+        "group.first",
+        "group.second",
+    ]
+    assert group.groups_with_entity(hass, "light.ceiling") == ["group.first"]
+
+    common.async_set_group(hass, "first", entity_ids=["light.ceiling"])
+    await hass.async_block_till_done()
+
+    assert group.groups_with_entity(hass, "light.bowl") == ["group.second"]
+
+    common.async_remove(hass, "second")
+    await hass.async_block_till_done()
+
+    assert group.groups_with_entity(hass, "light.bowl") == []
+    assert group.groups_with_entity(hass, "light.ceiling") == ["group.first"]
+
+
+async def test_all_mode_follows_member_changes(hass):
+    """Test a group with all: true as members change state repeatedly."""
+    hass.states.async_set("light.bowl", STATE_ON)
+    hass.states.async_set("light.ceiling", STATE_OFF)
+    await async_setup_component(
+        hass,
+        "group",
+        {
+            "group": {
+                "lights": {"entities": ["light.bowl", "light.ceiling"], "all": True}
+            }
+        },
+    )
+    await hass.async_block_till_done()
+
+    assert hass.states.get("group.lights").state == STATE_OFF
+
+    hass.states.async_set("light.ceiling", STATE_ON)
+    await hass.async_block_till_done()
+    assert hass.states.get("group.lights").state == STATE_ON
+
+    hass.states.async_set("light.bowl", STATE_OFF, {ATTR_ASSUMED_STATE: True})
+    await hass.async_block_till_done()
+    state = hass.states.get("group.lights")
+    assert state.state == STATE_OFF
+    assert state.attributes.get(ATTR_ASSUMED_STATE)
+
+    hass.states.async_set("light.bowl", STATE_ON)
+    await hass.async_block_till_done()
+    state = hass.states.get("group.lights")
+    assert state.state == STATE_ON
+    assert not state.attributes.get(ATTR_ASSUMED_STATE)
+
+    hass.states.async_remove("light.ceiling")
+    await hass.async_block_till_done()
+    assert hass.states.get("group.lights").state == STATE_ON
@@ -5,13 +5,15 @@ import json
 import unittest
 
 from homeassistant.components import history, recorder
-from homeassistant.components.recorder.models import process_timestamp
+from homeassistant.components.recorder.aggregate import compile_hourly_aggregates
+from homeassistant.components.recorder.models import States, process_timestamp
+from homeassistant.components.recorder.util import session_scope
 import homeassistant.core as ha
 from homeassistant.helpers.json import JSONEncoder
 from homeassistant.setup import async_setup_component, setup_component
 import homeassistant.util.dt as dt_util
 
-from tests.async_mock import patch, sentinel
+from tests.async_mock import AsyncMock, Mock, patch, sentinel
 from tests.common import (
     get_test_home_assistant,
     init_recorder_component,
@@ -630,6 +632,99 @@ class TestComponentHistory(unittest.TestCase):
         assert len(hist[entity_id]) == 3
         assert states == hist[entity_id]
 
+    def test_get_aggregated_states(self):
+        """Test aggregating states from the states and the hourly aggregates."""
+        self.init_recorder()
+        hass = self.hass
+        start = (dt_util.utcnow() - timedelta(hours=3)).replace(
+            minute=0, second=0, microsecond=0
+        )
+        end = start + timedelta(hours=2)
+
+        for state, minutes in (("10", 0), ("20", 30), ("unavailable", 60), ("30", 90)):
+            with patch(
+                "homeassistant.components.recorder.dt_util.utcnow",
+                return_value=start + timedelta(minutes=minutes),
+            ):
+                hass.states.set("sensor.power", state)
+                wait_recording_done(hass)
+
+        expected = [
+            {
+                "start": start.isoformat(),
+                "min": 10.0,
+                "max": 20.0,
+                "mean": 15.0,
+                "time_weighted_mean": 15.0,
+                "last": 20.0,
+                "count": 2,
+            },
+            {
+                "start": (start + timedelta(hours=1)).isoformat(),
+                "min": 30.0,
+                "max": 30.0,
+                "mean": 30.0,
+                "time_weighted_mean": 30.0,
+                "last": 30.0,
+                "count": 1,
+            },
+        ]
+
+        hist = history.get_aggregated_states(
+            hass, start, end, ["sensor.power"], timedelta(hours=1)
+        )
+        assert [bucket.as_dict() for bucket in hist["sensor.power"]] == expected
+
+        hist = history.get_aggregated_states(
+            hass, start, end, ["sensor.power"], timedelta(hours=2)
+        )
+        assert hist["sensor.power"][0].count == 3
+        assert hist["sensor.power"][0].time_weighted_mean == 20
+
+        # Compile the hourly aggregates and remove the states they are made of
+        with session_scope(hass=hass) as session:
+            compile_hourly_aggregates(session, start)
+            compile_hourly_aggregates(session, start + timedelta(hours=1))
+            session.query(States).delete()
+
+        hist = history.get_aggregated_states(
+            hass, start, end, ["sensor.power"], timedelta(hours=1)
+        )
+        assert [bucket.as_dict() for bucket in hist["sensor.power"]] == expected
+
+    def test_get_aggregated_states_uncompiled_hours(self):
+        """Test hours that were not compiled are aggregated from the states."""
+        self.init_recorder()
+        hass = self.hass
+        start = (dt_util.utcnow() - timedelta(hours=4)).replace(
+            minute=0, second=0, microsecond=0
+        )
+        end = start + timedelta(hours=3)
+
+        for state, minutes in (("10", 0), ("20", 60), ("30", 120)):
+            with patch(
+                "homeassistant.components.recorder.dt_util.utcnow",
+                return_value=start + timedelta(minutes=minutes),
+            ):
+                hass.states.set("sensor.power", state)
+                wait_recording_done(hass)
+
+        # Only the middle hour is compiled, its states are removed
+        with session_scope(hass=hass) as session:
+            compile_hourly_aggregates(session, start + timedelta(hours=1))
+            session.query(States).filter(States.state == "20").delete()
+
+        hist = history.get_aggregated_states(
+            hass, start, end, ["sensor.power"], timedelta(hours=1)
+        )
+        assert [
+            (bucket.start, bucket.min, bucket.count) for bucket in hist["sensor.power"]
+        ] == [
+            (start, 10.0, 1),
+            (start + timedelta(hours=1), 20.0, 1),
+            (start + timedelta(hours=2), 30.0, 1),
+        ]
+
     def check_significant_states(self, zero, four, states, config):
         """Check if significant states are retrieved."""
         filters = history.Filters()
@@ -790,3 +885,117 @@ async def test_fetch_period_api_with_include_order(hass, hass_client):
         params={"filter_entity_id": "non.existing,something.else"},
     )
     assert response.status == 200
+
+
+async def _async_record_test_states(hass):
+    """Record states of two sensors and return the start of the period."""
+    await hass.async_add_executor_job(init_recorder_component, hass)
+    await async_setup_component(hass, "history", {})
+    start = dt_util.utcnow() - timedelta(minutes=1)
+
+    for state in ("1", "2", "3"):
+        hass.states.async_set("sensor.one", state, {"unit_of_measurement": "W"})
+        hass.states.async_set("sensor.two", state)
+        await hass.async_block_till_done()
+    await hass.async_add_job(hass.data[recorder.DATA_INSTANCE].block_till_done)
+
+    return start
+
+
+async def test_fetch_period_api_stream(hass, hass_client):
+    """Test the fetch period view streams the same states."""
+    start = await _async_record_test_states(hass)
+    client = await hass_client()
+
+    response = await client.get(f"/api/history/period/{start.isoformat()}")
+    assert response.status == 200
+    expected = await response.json()
+
+    response = await client.get(f"/api/history/period/{start.isoformat()}?stream")
+    assert response.status == 200
+    result = await response.json()
+
+    assert len(result) == 2
+    assert sorted(result, key=lambda states: states[0]["entity_id"]) == sorted(
+        expected, key=lambda states: states[0]["entity_id"]
+    )
+
+
+async def test_stream_stops_when_connection_closed(hass, caplog):
+    """Test streaming stops without errors when the client went away."""
+    start = await _async_record_test_states(hass)
+    view = history.HistoryPeriodView(history.Filters(), False)
+    response = Mock(write=AsyncMock(side_effect=[None, None, ConnectionResetError]))
+    streamed = []
+
+    def stream_significant_states(*args):
+        """Record the state lists that were fetched."""
+        for state_list in (
+            [ha.State("sensor.one", "1")],
+            [ha.State("sensor.two", "1")],
+        ):
+            streamed.append(state_list)
+            yield state_list
+
+    with patch.object(
+        history, "_stream_significant_states", side_effect=stream_significant_states
+    ):
+        completed = await hass.async_add_executor_job(
+            view._stream_significant_states_json,
+            hass,
+            response,
+            start,
+            dt_util.utcnow(),
+            None,
+            True,
+            True,
+            False,
+            False,
+        )
+
+    assert completed is False
+    assert len(response.write.mock_calls) == 3
+    assert len(streamed) == 2
+    assert "Error executing query" not in caplog.text
+
+
+async def test_fetch_period_api_columnar_response(hass, hass_client):
+    """Test the fetch period view with columnar and minimal responses."""
+    start = await _async_record_test_states(hass)
+    client = await hass_client()
+
+    for params in ("columnar_response", "columnar_response&stream"):
+        response = await client.get(
+            f"/api/history/period/{start.isoformat()}?minimal_response&{params}",
+            params={"filter_entity_id": "sensor.one"},
+        )
+        assert response.status == 200
+        result = await response.json()
+
+        assert len(result) == 1
+        assert result[0]["entity_id"] == "sensor.one"
+        assert result[0]["attributes"] == {"unit_of_measurement": "W"}
+        assert result[0]["state"] == ["1", "2", "3"]
+        assert len(result[0]["last_changed"]) == 3
+
+
+async def test_fetch_aggregate_api(hass, hass_client):
+    """Test the aggregate view for history."""
+    start = await _async_record_test_states(hass)
+    client = await hass_client()
+
+    response = await client.get(f"/api/history/aggregate/{start.isoformat()}")
+    assert response.status == 400
+
+    response = await client.get(
+        f"/api/history/aggregate/{start.isoformat()}",
+        params={"filter_entity_id": "sensor.one,sensor.two", "period": "600"},
+    )
+    assert response.status == 200
+    result = await response.json()
+
+    assert list(result) == ["sensor.one", "sensor.two"]
+    assert result["sensor.one"][0]["count"] == 3
+    assert result["sensor.one"][0]["min"] == 1
+    assert result["sensor.one"][0]["max"] == 3
+    assert result["sensor.one"][0]["mean"] == 2
@@ -11,6 +11,7 @@ from homeassistant.const import STATE_UNKNOWN
 import homeassistant.core as ha
 from homeassistant.helpers.template import Template
 from homeassistant.setup import setup_component
+from homeassistant.util.async_ import run_callback_threadsafe
 import homeassistant.util.dt as dt_util
 
 from tests.async_mock import patch
@@ -151,6 +152,73 @@ class TestHistoryStatsSensor(unittest.TestCase):
         assert sensor3.state == 2
         assert sensor4.state == 50
 
+    def test_incremental_measure(self):
+        """Test the history is queried once and followed with state changes."""
+        t0 = dt_util.utcnow() - timedelta(minutes=40)
+        fake_states = {
+            "binary_sensor.test_id": [
+                ha.State("binary_sensor.test_id", "on", last_changed=t0)
+            ]
+        }
+
+        start = Template("{{ as_timestamp(now()) - 3600 }}", self.hass)
+        earlier_start = Template("{{ as_timestamp(now()) - 7200 }}", self.hass)
+        end = Template("{{ now() }}", self.hass)
+
+        sensor1 = HistoryStatsSensor(
+            self.hass, "binary_sensor.test_id", "on", start, end, None, "time", "Test"
+        )
+        sensor2 = HistoryStatsSensor(
+            self.hass, "binary_sensor.test_id", "on", start, end, None, "count", "Test"
+        )
+        sensor3 = HistoryStatsSensor(
+            self.hass,
+            "binary_sensor.test_id",
+            "on",
+            earlier_start,
+            end,
+            None,
+            "count",
+            "Test",
+        )
+        assert sensor1._data is sensor2._data is sensor3._data
+
+        for sensor in (sensor1, sensor2, sensor3):
+            run_callback_threadsafe(
+                self.hass.loop, sensor._data.async_add_sensor, sensor
+            ).result()
+
+        with patch(
+            "homeassistant.components.history.state_changes_during_period",
+            return_value=fake_states,
+        ) as mock_history:
+            sensor1.update()
+            sensor2.update()
+            assert mock_history.call_count == 1
+            assert sensor1.state == 0.67
+            assert sensor2.state == 1
+
+            self.hass.states.set("binary_sensor.test_id", "off")
+            self.hass.block_till_done()
+
+            sensor1.update()
+            sensor2.update()
+            assert mock_history.call_count == 1
+            assert sensor1.state == 0.67
+            assert sensor2.state == 1
+
+            self.hass.states.set("binary_sensor.test_id", "on")
+            self.hass.block_till_done()
+
+            sensor2.update()
+            assert mock_history.call_count == 1
+            assert sensor2.state == 2
+
+            # The start moved back, so the history has to be queried again
+            sensor3.update()
+            assert mock_history.call_count == 2
+            assert sensor3.state == 2
+
     def test_wrong_date(self):
         """Test when start or end value is not a timestamp or a date."""
         good = Template("{{ now() }}", self.hass)
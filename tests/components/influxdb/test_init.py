@@ -1,5 +1,8 @@
 """The tests for the InfluxDB component."""
 import datetime
+import gzip
+import os
+import tempfile
 import unittest
 from unittest import mock
 
@@ -16,6 +19,11 @@ from homeassistant.setup import setup_component
 from tests.common import get_test_home_assistant
 
 
+def write_call(body):
+    """Return the call that writes the points of a body in the line protocol."""
+    return mock.call(influxdb._lines(body), protocol="line")
+
+
 @mock.patch("homeassistant.components.influxdb.InfluxDBClient")
 @mock.patch(
     "homeassistant.components.influxdb.InfluxThread.batch_timeout",
@@ -96,10 +104,10 @@ class TestInfluxDB(unittest.TestCase):
 
         # map of HA State to valid influxdb [state, value] fields
         valid = {
-            "1": [None, 1],
+            "1": [None, 1.0],
             "1.0": [None, 1.0],
-            STATE_ON: [STATE_ON, 1],
-            STATE_OFF: [STATE_OFF, 0],
+            STATE_ON: [STATE_ON, 1.0],
+            STATE_OFF: [STATE_OFF, 0.0],
             STATE_STANDBY: [STATE_STANDBY, None],
             "foo": ["foo", None],
         }
@@ -137,7 +145,7 @@ class TestInfluxDB(unittest.TestCase):
                         "last_seen_str": "Last seen 23 minutes ago",
                         "last_seen": 23.0,
                         "updated_at_str": "2017-01-01 00:00:00",
-                        "updated_at": 20170101000000,
+                        "updated_at": 20170101000000.0,
                         "multi_periods_str": "0.120.240.2023873",
                     },
                 }
@@ -151,7 +159,7 @@ class TestInfluxDB(unittest.TestCase):
             self.hass.data[influxdb.DOMAIN].block_till_done()
 
             assert mock_client.return_value.write_points.call_count == 1
-            assert mock_client.return_value.write_points.call_args == mock.call(body)
+            assert mock_client.return_value.write_points.call_args == write_call(body)
             mock_client.return_value.write_points.reset_mock()
 
     def test_event_listener_no_units(self, mock_client):
@@ -176,13 +184,13 @@ class TestInfluxDB(unittest.TestCase):
                     "measurement": "fake.entity-id",
                     "tags": {"domain": "fake", "entity_id": "entity"},
                     "time": 12345,
-                    "fields": {"value": 1},
+                    "fields": {"value": 1.0},
                 }
             ]
             self.handler_method(event)
             self.hass.data[influxdb.DOMAIN].block_till_done()
             assert mock_client.return_value.write_points.call_count == 1
-            assert mock_client.return_value.write_points.call_args == mock.call(body)
+            assert mock_client.return_value.write_points.call_args == write_call(body)
             mock_client.return_value.write_points.reset_mock()
 
     def test_event_listener_inf(self, mock_client):
@@ -203,13 +211,13 @@ class TestInfluxDB(unittest.TestCase):
                 "measurement": "fake.entity-id",
                 "tags": {"domain": "fake", "entity_id": "entity"},
                 "time": 12345,
-                "fields": {"value": 8},
+                "fields": {"value": 8.0},
             }
         ]
         self.handler_method(event)
         self.hass.data[influxdb.DOMAIN].block_till_done()
         assert mock_client.return_value.write_points.call_count == 1
-        assert mock_client.return_value.write_points.call_args == mock.call(body)
+        assert mock_client.return_value.write_points.call_args == write_call(body)
         mock_client.return_value.write_points.reset_mock()
 
     def test_event_listener_states(self, mock_client):
@@ -230,14 +238,14 @@ class TestInfluxDB(unittest.TestCase):
                     "measurement": "fake.entity-id",
                     "tags": {"domain": "fake", "entity_id": "entity"},
                     "time": 12345,
-                    "fields": {"value": 1},
+                    "fields": {"value": 1.0},
                 }
             ]
             self.handler_method(event)
             self.hass.data[influxdb.DOMAIN].block_till_done()
             if state_state == 1:
                 assert mock_client.return_value.write_points.call_count == 1
-                assert mock_client.return_value.write_points.call_args == mock.call(
+                assert mock_client.return_value.write_points.call_args == write_call(
                     body
                 )
             else:
@@ -262,14 +270,14 @@ class TestInfluxDB(unittest.TestCase):
                     "measurement": f"fake.{entity_id}",
                     "tags": {"domain": "fake", "entity_id": entity_id},
                     "time": 12345,
-                    "fields": {"value": 1},
+                    "fields": {"value": 1.0},
                 }
             ]
             self.handler_method(event)
             self.hass.data[influxdb.DOMAIN].block_till_done()
             if entity_id == "ok":
                 assert mock_client.return_value.write_points.call_count == 1
-                assert mock_client.return_value.write_points.call_args == mock.call(
+                assert mock_client.return_value.write_points.call_args == write_call(
                     body
                 )
             else:
@@ -294,14 +302,14 @@ class TestInfluxDB(unittest.TestCase):
                     "measurement": f"{domain}.something",
                     "tags": {"domain": domain, "entity_id": "something"},
                     "time": 12345,
-                    "fields": {"value": 1},
+                    "fields": {"value": 1.0},
                 }
             ]
             self.handler_method(event)
             self.hass.data[influxdb.DOMAIN].block_till_done()
             if domain == "ok":
                 assert mock_client.return_value.write_points.call_count == 1
-                assert mock_client.return_value.write_points.call_args == mock.call(
+                assert mock_client.return_value.write_points.call_args == write_call(
                     body
                 )
             else:
@@ -336,14 +344,14 @@ class TestInfluxDB(unittest.TestCase):
                     "measurement": f"fake.{entity_id}",
                     "tags": {"domain": "fake", "entity_id": entity_id},
                     "time": 12345,
-                    "fields": {"value": 1},
+                    "fields": {"value": 1.0},
                 }
             ]
             self.handler_method(event)
             self.hass.data[influxdb.DOMAIN].block_till_done()
             if entity_id == "included":
                 assert mock_client.return_value.write_points.call_count == 1
-                assert mock_client.return_value.write_points.call_args == mock.call(
+                assert mock_client.return_value.write_points.call_args == write_call(
                     body
                 )
             else:
@@ -378,14 +386,14 @@ class TestInfluxDB(unittest.TestCase):
                     "measurement": f"{domain}.something",
                     "tags": {"domain": domain, "entity_id": "something"},
                     "time": 12345,
-                    "fields": {"value": 1},
+                    "fields": {"value": 1.0},
                 }
             ]
             self.handler_method(event)
             self.hass.data[influxdb.DOMAIN].block_till_done()
             if domain == "fake":
                 assert mock_client.return_value.write_points.call_count == 1
-                assert mock_client.return_value.write_points.call_args == mock.call(
+                assert mock_client.return_value.write_points.call_args == write_call(
                     body
                 )
             else:
@@ -420,14 +428,14 @@ class TestInfluxDB(unittest.TestCase):
                     "measurement": f"{domain}.something",
                     "tags": {"domain": domain, "entity_id": "something"},
                     "time": 12345,
-                    "fields": {"value": 1},
+                    "fields": {"value": 1.0},
                 }
             ]
             self.handler_method(event)
             self.hass.data[influxdb.DOMAIN].block_till_done()
             if domain == "fake":
                 assert mock_client.return_value.write_points.call_count == 1
-                assert mock_client.return_value.write_points.call_args == mock.call(
+                assert mock_client.return_value.write_points.call_args == write_call(
                     body
                 )
             else:
@@ -448,14 +456,14 @@ class TestInfluxDB(unittest.TestCase):
                     "measurement": f"other.{entity_id}",
                     "tags": {"domain": "other", "entity_id": entity_id},
                     "time": 12345,
-                    "fields": {"value": 1},
+                    "fields": {"value": 1.0},
                 }
             ]
             self.handler_method(event)
             self.hass.data[influxdb.DOMAIN].block_till_done()
             if entity_id == "one":
                 assert mock_client.return_value.write_points.call_count == 1
-                assert mock_client.return_value.write_points.call_args == mock.call(
+                assert mock_client.return_value.write_points.call_args == write_call(
                     body
                 )
             else:
@@ -468,10 +476,10 @@ class TestInfluxDB(unittest.TestCase):
 
         # map of HA State to valid influxdb [state, value] fields
         valid = {
-            "1": [None, 1],
+            "1": [None, 1.0],
             "1.0": [None, 1.0],
-            STATE_ON: [STATE_ON, 1],
-            STATE_OFF: [STATE_OFF, 0],
+            STATE_ON: [STATE_ON, 1.0],
+            STATE_OFF: [STATE_OFF, 0.0],
             STATE_STANDBY: [STATE_STANDBY, None],
             "foo": ["foo", None],
         }
@@ -510,7 +518,7 @@ class TestInfluxDB(unittest.TestCase):
             self.handler_method(event)
             self.hass.data[influxdb.DOMAIN].block_till_done()
             assert mock_client.return_value.write_points.call_count == 1
-            assert mock_client.return_value.write_points.call_args == mock.call(body)
+            assert mock_client.return_value.write_points.call_args == write_call(body)
             mock_client.return_value.write_points.reset_mock()
 
     def test_event_listener_default_measurement(self, mock_client):
@@ -542,14 +550,14 @@ class TestInfluxDB(unittest.TestCase):
                     "measurement": "state",
                     "tags": {"domain": "fake", "entity_id": entity_id},
                     "time": 12345,
-                    "fields": {"value": 1},
+                    "fields": {"value": 1.0},
                 }
             ]
             self.handler_method(event)
             self.hass.data[influxdb.DOMAIN].block_till_done()
             if entity_id == "ok":
                 assert mock_client.return_value.write_points.call_count == 1
-                assert mock_client.return_value.write_points.call_args == mock.call(
+                assert mock_client.return_value.write_points.call_args == write_call(
                     body
                 )
             else:
@@ -590,7 +598,7 @@ class TestInfluxDB(unittest.TestCase):
         self.handler_method(event)
         self.hass.data[influxdb.DOMAIN].block_till_done()
         assert mock_client.return_value.write_points.call_count == 1
-        assert mock_client.return_value.write_points.call_args == mock.call(body)
+        assert mock_client.return_value.write_points.call_args == write_call(body)
         mock_client.return_value.write_points.reset_mock()
 
     def test_event_listener_tags_attributes(self, mock_client):
@@ -625,13 +633,13 @@ class TestInfluxDB(unittest.TestCase):
                     "friendly_fake": "tag_str",
                 },
                 "time": 12345,
-                "fields": {"value": 1, "field_fake_str": "field_str"},
+                "fields": {"value": 1.0, "field_fake_str": "field_str"},
             }
         ]
         self.handler_method(event)
         self.hass.data[influxdb.DOMAIN].block_till_done()
         assert mock_client.return_value.write_points.call_count == 1
-        assert mock_client.return_value.write_points.call_args == mock.call(body)
+        assert mock_client.return_value.write_points.call_args == write_call(body)
         mock_client.return_value.write_points.reset_mock()
 
     def test_event_listener_component_override_measurement(self, mock_client):
@@ -676,13 +684,13 @@ class TestInfluxDB(unittest.TestCase):
                     "measurement": comp["res"],
                     "tags": {"domain": comp["domain"], "entity_id": comp["id"]},
                     "time": 12345,
-                    "fields": {"value": 1},
+                    "fields": {"value": 1.0},
                 }
             ]
             self.handler_method(event)
             self.hass.data[influxdb.DOMAIN].block_till_done()
             assert mock_client.return_value.write_points.call_count == 1
-            assert mock_client.return_value.write_points.call_args == mock.call(body)
+            assert mock_client.return_value.write_points.call_args == write_call(body)
             mock_client.return_value.write_points.reset_mock()
 
     def test_scheduled_write(self, mock_client):
@@ -693,6 +701,7 @@ class TestInfluxDB(unittest.TestCase):
                 "username": "user",
                 "password": "pass",
                 "max_retries": 1,
+                "max_spill_points": 0,
             }
         }
         assert setup_component(self.hass, influxdb.DOMAIN, config)
@@ -716,7 +725,9 @@ class TestInfluxDB(unittest.TestCase):
             assert mock_sleep.called
         json_data = mock_client.return_value.write_points.call_args[0][0]
         assert mock_client.return_value.write_points.call_count == 2
-        mock_client.return_value.write_points.assert_called_with(json_data)
+        mock_client.return_value.write_points.assert_called_with(
+            json_data, protocol="line"
+        )
 
         # Write works again
         mock_client.return_value.write_points.side_effect = None
@@ -756,3 +767,154 @@ class TestInfluxDB(unittest.TestCase):
             assert mock_client.return_value.write_points.call_count == 0
 
         mock_client.return_value.write_points.reset_mock()
+
+    def test_spill_on_write_error(self, mock_client):
+        """Test points are kept on disk while writing fails."""
+        with tempfile.TemporaryDirectory() as tmpdir, mock.patch.object(
+            self.hass.config, "config_dir", tmpdir
+        ):
+            self._setup(mock_client, max_spill_points=3, batch_size=2)
+            instance = self.hass.data[influxdb.DOMAIN]
+            events = [
+                mock.MagicMock(
+                    data={
+                        "new_state": mock.MagicMock(
+                            state=value,
+                            domain="fake",
+                            entity_id="fake.entity",
+                            object_id="entity",
+                            attributes={},
+                        )
+                    },
+                    time_fired=value,
+                )
+                for value in range(3)
+            ]
+
+            write_points = mock_client.return_value.write_points
+            write_points.side_effect = IOError("foo")
+            for event in events[:2]:
+                self.handler_method(event)
+                instance.block_till_done()
+
+            # Writes are not retried while new points keep coming in
+            assert write_points.call_count == 1
+            assert instance.buffered == 2
+
+            write_points.side_effect = None
+            write_points.reset_mock()
+            instance._retry_at = 0
+            self.handler_method(events[2])
+            instance.block_till_done()
+
+            assert write_points.call_args_list == [
+                mock.call(
+                    [
+                        "fake.entity,domain=fake,entity_id=entity value=0.0 0",
+                        "fake.entity,domain=fake,entity_id=entity value=1.0 1",
+                    ],
+                    protocol="line",
+                ),
+                mock.call(
+                    ["fake.entity,domain=fake,entity_id=entity value=2.0 2"],
+                    protocol="line",
+                ),
+            ]
+            assert instance.buffered == 0
+            assert instance.written == 3
+            assert not os.path.exists(os.path.join(tmpdir, influxdb.SPILL_FILE))
+
+    def test_gzip(self, mock_client):
+        """Test writing gzip compressed points."""
+        self._setup(mock_client, gzip=True)
+
+        state = mock.MagicMock(
+            state=1,
+            domain="fake",
+            entity_id="fake.entity",
+            object_id="entity",
+            attributes={},
+        )
+        event = mock.MagicMock(data={"new_state": state}, time_fired=12345)
+        self.handler_method(event)
+        self.hass.data[influxdb.DOMAIN].block_till_done()
+
+        assert not mock_client.return_value.write_points.called
+        kwargs = mock_client.return_value.request.call_args[1]
+        assert kwargs["params"] == {"db": "home_assistant"}
+        assert kwargs["headers"]["Content-Encoding"] == "gzip"
+        assert gzip.decompress(kwargs["data"]) == (
+            b"fake.entity,domain=fake,entity_id=entity value=1.0 12345\n"
+        )
+
+    def test_statistics_sensors(self, mock_client):
+        """Test the statistics of the writer are exposed as sensors."""
+        self._setup(mock_client, statistics_sensors=True)
+        self.hass.block_till_done()
+
+        state = mock.MagicMock(
+            state=1,
+            domain="fake",
+            entity_id="fake.entity",
+            object_id="entity",
+            attributes={},
+        )
+        event = mock.MagicMock(data={"new_state": state}, time_fired=12345)
+        self.handler_method(event)
+        self.hass.data[influxdb.DOMAIN].block_till_done()
+
+        for entity_id in (
+            "sensor.influxdb_points_written",
+            "sensor.influxdb_dropped_points",
+            "sensor.influxdb_buffered_points",
+        ):
+            self.hass.add_job(
+                self.hass.helpers.entity_component.async_update_entity(entity_id)
+            )
+        self.hass.block_till_done()
+
+        assert self.hass.states.get("sensor.influxdb_points_written").state == "1"
+        assert self.hass.states.get("sensor.influxdb_dropped_points").state == "0"
+        assert self.hass.states.get("sensor.influxdb_buffered_points").state == "0"
+        assert self.hass.states.get("sensor.influxdb_throughput") is not None
+        assert self.hass.states.get("sensor.influxdb_lag") is not None
+
+    def test_no_statistics_sensors(self, mock_client):
+        """Test the statistics sensors are only added when asked for."""
+        self._setup(mock_client)
+        self.hass.block_till_done()
+
+        assert self.hass.states.get("sensor.influxdb_points_written") is None
+
+    def test_spill_file_error(self, mock_client):
+        """Test points are dropped and spilling stops when the file fails."""
+        with tempfile.TemporaryDirectory() as tmpdir, mock.patch.object(
+            self.hass.config, "config_dir", tmpdir
+        ):
+            self._setup(mock_client, max_spill_points=3)
+            instance = self.hass.data[influxdb.DOMAIN]
+            state = mock.MagicMock(
+                state=1,
+                domain="fake",
+                entity_id="fake.entity",
+                object_id="entity",
+                attributes={},
+            )
+            event = mock.MagicMock(data={"new_state": state}, time_fired=12345)
+
+            write_points = mock_client.return_value.write_points
+            write_points.side_effect = IOError("foo")
+            with mock.patch(
+                "homeassistant.components.influxdb.spill.open", side_effect=OSError
+            ):
+                self.handler_method(event)
+                instance.block_till_done()
+
+            assert instance.spill is None
+            assert instance.dropped == 1
+
+            # Write errors are no longer kept on disk
+            self.handler_method(event)
+            instance.block_till_done()
+            assert instance.dropped == 2
+            assert write_points.call_count == 2
@@ -0,0 +1,30 @@
+"""The tests for the InfluxDB spill buffer."""
+import os
+
+from homeassistant.components.influxdb.spill import SpillBuffer
+
+
+def test_spill_buffer(tmpdir):
+    """Test points are read back in order and the size is bounded."""
+    path = os.path.join(tmpdir, "spill")
+    spill = SpillBuffer(path, 3)
+
+    assert spill.append(["a 1", "b 2"]) == 0
+    assert spill.append(["c 3", "d 4"]) == 1
+    assert spill.count == 3
+
+    lines = spill.read(2)
+    assert lines == ["a 1", "b 2"]
+    spill.consume(lines)
+    assert spill.count == 1
+
+    # Points that were not read are kept for the next run
+    spill.close()
+    spill = SpillBuffer(path, 3)
+    assert spill.count == 1
+    lines = spill.read(2)
+    assert lines == ["c 3"]
+
+    spill.consume(lines)
+    assert spill.count == 0
+    assert not os.path.exists(path)
@@ -95,6 +95,27 @@ class TestComponentLogbook(unittest.TestCase):
         assert last_call.data.get(logbook.ATTR_DOMAIN) == "switch"
         assert last_call.data.get(logbook.ATTR_ENTITY_ID) == "switch.test_switch"
 
+    def test_state_attributes_from_database(self):
+        """Test the attributes of recorded states are joined to their events."""
+        self.hass.states.set("switch.hidden", STATE_OFF, {ATTR_HIDDEN: True})
+        self.hass.states.set("switch.shown", STATE_OFF, {"friendly_name": "Shown"})
+        self.hass.block_till_done()
+        self.hass.states.set("switch.hidden", STATE_ON, {ATTR_HIDDEN: True})
+        self.hass.states.set("switch.shown", STATE_ON, {"friendly_name": "Shown"})
+        self.hass.block_till_done()
+        self.hass.data[recorder.DATA_INSTANCE].block_till_done()
+
+        entries = logbook._get_events(
+            self.hass,
+            {},
+            dt_util.utcnow() - timedelta(hours=1),
+            dt_util.utcnow() + timedelta(hours=1),
+        )
+
+        assert [entry["entity_id"] for entry in entries] == ["switch.shown"]
+        assert entries[0]["name"] == "Shown"
+        assert entries[0]["message"] == "turned on"
+
     def test_service_call_create_log_book_entry_no_message(self):
         """Test if service call create log book entry without message."""
         calls = []
@@ -554,6 +554,29 @@ class TestMQTTCallbacks(unittest.TestCase):
         assert self.calls[0][0].topic == "$test-topic/subtree/some-topic"
         assert self.calls[0][0].payload == "test-payload"
 
+    def test_subscribe_overlapping_wildcards(self):
+        """Test a message is routed once to every matching subscription."""
+        mqtt.subscribe(self.hass, "test/state", self.record_calls)
+        mqtt.subscribe(self.hass, "test/+", self.record_calls)
+        unsub = mqtt.subscribe(self.hass, "test/#", self.record_calls)
+        mqtt.subscribe(self.hass, "other/#", self.record_calls)
+
+        fire_mqtt_message(self.hass, "test/state", "test-payload")
+
+        self.hass.block_till_done()
+        assert sorted(call[0].subscribed_topic for call in self.calls) == [
+            "test/#",
+            "test/+",
+            "test/state",
+        ]
+
+        unsub()
+
+        fire_mqtt_message(self.hass, "test/state/nested", "test-payload")
+
+        self.hass.block_till_done()
+        assert len(self.calls) == 3
+
     def test_subscribe_special_characters(self):
         """Test the subscription to topics with special characters."""
         topic = "/test-topic/$(.)[^]{-}"
@@ -653,6 +676,34 @@ class TestMQTTCallbacks(unittest.TestCase):
         assert self.hass.data["mqtt"]._mqttc.subscribe.mock_calls == expected
 
 
+async def test_unsubscribe_during_message(hass):
+    """Test unsubscribing from a message callback."""
+    await async_mock_mqtt_component(hass)
+    unsub_calls = []
+    other_calls = []
+
+    @callback
+    def record_and_unsubscribe(msg):
+        """Record the message and unsubscribe."""
+        unsub_calls.append(msg)
+        unsub()
+
+    @callback
+    def record_calls(msg):
+        """Record the message."""
+        other_calls.append(msg)
+
+    unsub = await mqtt.async_subscribe(hass, "test/#", record_and_unsubscribe)
+    await mqtt.async_subscribe(hass, "test/#", record_calls)
+
+    async_fire_mqtt_message(hass, "test/state", "test-payload")
+    async_fire_mqtt_message(hass, "test/state", "test-payload")
+    await hass.async_block_till_done()
+
+    assert len(unsub_calls) == 1
+    assert len(other_calls) == 2
+
+
 async def test_setup_embedded_starts_with_no_config(hass):
     """Test setting up embedded server with no config."""
     client_config = ("localhost", 1883, "user", "pass", None, "3.1.1")
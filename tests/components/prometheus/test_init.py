@@ -1,4 +1,6 @@
 """The tests for the Prometheus exporter."""
+# pylint: disable=protected-access,redefined-outer-name
+from prometheus_client import REGISTRY
 import pytest
 
 from homeassistant import setup
@@ -13,9 +15,20 @@ from homeassistant.const import (
 )
 from homeassistant.setup import async_setup_component
 
+from tests.async_mock import patch
+
+
+@pytest.fixture
+def registry():
+    """Remove the metrics added during a test from the global registry."""
+    collectors = set(REGISTRY._collector_to_names)
+    yield
+    for collector in set(REGISTRY._collector_to_names) - collectors:
+        REGISTRY.unregister(collector)
+
 
 @pytest.fixture
-async def prometheus_client(loop, hass, hass_client):
+async def prometheus_client(loop, hass, hass_client, registry):
     """Initialize an hass_client with Prometheus component."""
     await async_setup_component(hass, prometheus.DOMAIN, {prometheus.DOMAIN: {}})
 
@@ -74,6 +87,8 @@ async def test_view(prometheus_client):  # pylint: disable=redefined-outer-name
 
     assert resp.status == 200
     assert resp.headers["content-type"] == "text/plain"
+    assert resp.headers["content-encoding"] == "gzip"
+    assert resp.headers["vary"] == "Accept-Encoding"
     body = await resp.text()
     body = body.split("\n")
 
@@ -138,3 +153,81 @@ async def test_view(prometheus_client):  # pylint: disable=redefined-outer-name
         'entity="sensor.sps30_pm_1um_weight_concentration",'
         'friendly_name="SPS30 PM <1µm Weight concentration"} 3.7069' in body
     )
+
+
+async def test_view_openmetrics(prometheus_client):
+    """Test the OpenMetrics format is returned when accepted."""
+    resp = await prometheus_client.get(
+        prometheus.API_ENDPOINT, headers={"Accept": "application/openmetrics-text"}
+    )
+
+    assert resp.status == 200
+    assert resp.headers["content-type"].startswith("application/openmetrics-text")
+    body = await resp.text()
+    assert body.endswith("# EOF\n")
+
+
+async def test_view_cached(hass, prometheus_client):
+    """Test the exposition is only generated again after a change."""
+    with patch(
+        "homeassistant.components.prometheus._generate", return_value=b"metrics"
+    ) as mock_generate:
+        for _ in range(2):
+            resp = await prometheus_client.get(
+                prometheus.API_ENDPOINT, headers={"Accept-Encoding": "identity"}
+            )
+            assert await resp.text() == "metrics"
+            assert "content-encoding" not in resp.headers
+            assert resp.headers["vary"] == "Accept-Encoding"
+        assert len(mock_generate.mock_calls) == 1
+
+        hass.states.async_set("sensor.outside_temperature", "16.0")
+        await hass.async_block_till_done()
+
+        resp = await prometheus_client.get(
+            prometheus.API_ENDPOINT, headers={"Accept-Encoding": "identity"}
+        )
+        assert len(mock_generate.mock_calls) == 2
+
+        # The process metrics change without state changes
+        with patch("homeassistant.components.prometheus.CACHE_TTL", 0):
+            resp = await prometheus_client.get(
+                prometheus.API_ENDPOINT, headers={"Accept-Encoding": "identity"}
+            )
+        assert len(mock_generate.mock_calls) == 3
+
+    assert mock_generate.mock_calls[0][1][1] is REGISTRY
+
+
+@pytest.mark.parametrize(
+    "accept_encoding,compressed",
+    [
+        ("gzip", True),
+        ("deflate, gzip;q=1.0, *;q=0.5", True),
+        ("GZIP; q=0.5", True),
+        ("*", True),
+        ("", False),
+        ("identity", False),
+        ("gzip;q=0", False),
+        ("gzip;q=0.000, *", False),
+        ("x-gzip-like", False),
+        ("*;q=0", False),
+    ],
+)
+def test_accepts_gzip(accept_encoding, compressed):
+    """Test the gzip coding is read from the Accept-Encoding header."""
+    assert prometheus._accepts_gzip(accept_encoding) is compressed
+
+
+async def test_include_entities(hass, registry):
+    """Test only the state changes of included entities are listened to."""
+    with patch(
+        "homeassistant.components.prometheus.track_state_change_event"
+    ) as mock_track:
+        await async_setup_component(
+            hass,
+            prometheus.DOMAIN,
+            {prometheus.DOMAIN: {"filter": {"include_entities": ["sensor.one"]}}},
+        )
+
+    assert mock_track.mock_calls[0][1][1] == ["sensor.one"]
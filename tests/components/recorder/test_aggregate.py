@@ -0,0 +1,158 @@
+"""The tests for the recorder aggregates."""
+from datetime import datetime, timedelta
+
+import pytest
+
+from homeassistant.components.recorder import aggregate
+from homeassistant.components.recorder.const import DATA_INSTANCE
+from homeassistant.components.recorder.models import States, StatesHourly
+from homeassistant.components.recorder.util import session_scope
+from homeassistant.const import EVENT_TIME_CHANGED
+from homeassistant.core import ATTR_NOW
+import homeassistant.util.dt as dt_util
+
+from .common import wait_recording_done
+
+from tests.common import get_test_home_assistant, init_recorder_component
+
+START = datetime(2020, 6, 1, 12, 0, 0, tzinfo=dt_util.UTC)
+
+
+@pytest.fixture
+def hass_recorder():
+    """Home Assistant fixture with in-memory recorder."""
+    hass = get_test_home_assistant()
+
+    def setup_recorder(config=None):
+        """Set up with params."""
+        init_recorder_component(hass, config)
+        hass.start()
+        hass.block_till_done()
+        hass.data[DATA_INSTANCE].block_till_done()
+        return hass
+
+    yield setup_recorder
+    hass.stop()
+
+
+def test_state_to_float():
+    """Test only finite numeric states have a value."""
+    assert aggregate.state_to_float("21.5") == 21.5
+    assert aggregate.state_to_float("unavailable") is None
+    assert aggregate.state_to_float("nan") is None
+    assert aggregate.state_to_float(None) is None
+
+
+def test_bucket_aggregator():
+    """Test states are aggregated into buckets."""
+    aggregator = aggregate.BucketAggregator(
+        START, START + timedelta(hours=3), aggregate.HOUR
+    )
+    aggregator.add("10", START - timedelta(minutes=5))
+    aggregator.add("20", START + timedelta(minutes=30))
+    aggregator.add("unavailable", START + timedelta(minutes=60))
+    aggregator.add("30", START + timedelta(minutes=90))
+
+    buckets = aggregator.finish(START + timedelta(hours=2, minutes=30))
+
+    assert [bucket.as_dict() for bucket in buckets] == [
+        {
+            "start": START.isoformat(),
+            "min": 10.0,
+            "max": 20.0,
+            "mean": 20.0,
+            "time_weighted_mean": 15.0,
+            "last": 20.0,
+            "count": 1,
+        },
+        {
+            "start": (START + timedelta(hours=1)).isoformat(),
+            "min": 30.0,
+            "max": 30.0,
+            "mean": 30.0,
+            "time_weighted_mean": 30.0,
+            "last": 30.0,
+            "count": 1,
+        },
+        {
+            "start": (START + timedelta(hours=2)).isoformat(),
+            "min": 30.0,
+            "max": 30.0,
+            "mean": None,
+            "time_weighted_mean": 30.0,
+            "last": 30.0,
+            "count": 0,
+        },
+    ]
+    assert buckets[1].duration == 1800
+    assert buckets[2].duration == 1800
+
+
+def test_bucket_merge():
+    """Test merging the aggregates of consecutive periods."""
+    aggregator = aggregate.BucketAggregator(
+        START, START + timedelta(hours=2), aggregate.HOUR
+    )
+    aggregator.add("10", START)
+    aggregator.add("30", START + timedelta(hours=1))
+    first, second = aggregator.finish(START + timedelta(hours=2))
+
+    first.merge(second)
+
+    assert first.min == 10
+    assert first.max == 30
+    assert first.mean == 20
+    assert first.time_weighted_mean == 20
+    assert first.last == 30
+    assert first.count == 2
+
+
+# pylint: disable=redefined-outer-name
+def test_compile_hourly_aggregates(hass_recorder):
+    """Test compiling hourly aggregates carries values over hours."""
+    hass = hass_recorder()
+
+    with session_scope(hass=hass) as session:
+        for entity_id, state, minutes in (
+            ("sensor.power", "10", 0),
+            ("sensor.power", "20", 30),
+            ("sensor.mode", "eco", 10),
+        ):
+            timestamp = START + timedelta(minutes=minutes)
+            session.add(
+                States(
+                    entity_id=entity_id,
+                    domain="sensor",
+                    state=state,
+                    last_changed=timestamp,
+                    last_updated=timestamp,
+                )
+            )
+
+    with session_scope(hass=hass) as session:
+        assert aggregate.compile_hourly_aggregates(session, START) == 1
+        assert aggregate.compile_hourly_aggregates(session, START + aggregate.HOUR) == 1
+
+    with session_scope(hass=hass) as session:
+        rows = list(session.query(StatesHourly).order_by(StatesHourly.start))
+        assert [row.entity_id for row in rows] == ["sensor.power", "sensor.power"]
+        assert [row.count for row in rows] == [2, 0]
+        assert [row.weighted_sum / row.duration for row in rows] == [15, 20]
+        assert [row.last for row in rows] == [20, 20]
+
+
+def test_recorder_compiles_hourly_aggregates(hass_recorder):
+    """Test the recorder compiles the aggregates of hours that ended."""
+    hass = hass_recorder()
+    hass.states.set("sensor.power", "10")
+    wait_recording_done(hass)
+
+    hass.bus.fire(EVENT_TIME_CHANGED, {ATTR_NOW: dt_util.utcnow() + timedelta(hours=2)})
+    wait_recording_done(hass)
+
+    with session_scope(hass=hass) as session:
+        rows = list(session.query(StatesHourly).order_by(StatesHourly.start))
+        assert [row.entity_id for row in rows] == ["sensor.power", "sensor.power"]
+        assert [row.count for row in rows] == [1, 0]
+        assert rows[1].duration == 3600
+        assert rows[1].last == 10
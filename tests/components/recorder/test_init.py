@@ -5,12 +5,18 @@ import unittest
 
 import pytest
 
-from homeassistant.components.recorder import Recorder
+from homeassistant.components.recorder import (
+    CONF_MAX_QUEUE_SIZE,
+    CONF_QUEUE_OVERFLOW,
+    QUEUE_OVERFLOW_DROP_OLDEST,
+    Recorder,
+    RecorderQueue,
+)
 from homeassistant.components.recorder.const import DATA_INSTANCE
-from homeassistant.components.recorder.models import Events, States
+from homeassistant.components.recorder.models import Events, StateAttributes, States
 from homeassistant.components.recorder.util import session_scope
 from homeassistant.const import MATCH_ALL
-from homeassistant.core import ATTR_NOW, EVENT_TIME_CHANGED, callback
+from homeassistant.core import ATTR_NOW, EVENT_TIME_CHANGED, Event, callback
 from homeassistant.setup import async_setup_component
 from homeassistant.util import dt as dt_util
 
@@ -254,6 +260,149 @@ def test_auto_purge(hass_recorder):
             hass.block_till_done()
             hass.data[DATA_INSTANCE].block_till_done()
 
-        assert len(purge_old_data.mock_calls) == 1
+        assert len(purge_old_data.call_args_list) == 1
 
     dt_util.set_default_time_zone(original_tz)
+
+
+def test_saving_many_states_in_batches(hass_recorder):
+    """Test states queued as a backlog are saved with their events."""
+    hass = hass_recorder()
+    instance = hass.data[DATA_INSTANCE]
+
+    with patch.object(instance.queue, "qsize", return_value=1):
+        states = _add_entities(hass, [f"test.recorder_{idx}" for idx in range(25)])
+
+    assert len(states) == 25
+    assert instance.last_batch_size == 25
+    assert instance.last_commit_latency is not None
+
+    with session_scope(hass=hass) as session:
+        for db_state in session.query(States):
+            db_event = session.query(Events).get(db_state.event_id)
+            assert db_event.event_type == "state_changed"
+            assert db_state.entity_id in db_event.event_data
+
+
+def test_saving_batch_with_failing_event(hass_recorder):
+    """Test a batch that fails to be written only drops the failing event."""
+    hass = hass_recorder()
+    instance = hass.data[DATA_INSTANCE]
+    from_event = Events.from_event
+
+    def mock_from_event(event):
+        """Create an event row that can not be inserted."""
+        dbevent = from_event(event)
+        if event.event_type == "bad_event":
+            dbevent.time_fired = "not a datetime"
+        return dbevent
+
+    with patch.object(instance.queue, "qsize", return_value=1), patch(
+        "homeassistant.components.recorder.Events.from_event",
+        side_effect=mock_from_event,
+    ):
+        hass.states.set("test.before", "on")
+        hass.bus.fire("bad_event")
+        hass.states.set("test.after", "on")
+        wait_recording_done(hass)
+
+    hass.states.set("test.later", "on")
+    wait_recording_done(hass)
+
+    with session_scope(hass=hass) as session:
+        assert session.query(Events).filter_by(event_type="bad_event").count() == 0
+        assert sorted(db_state.entity_id for db_state in session.query(States)) == [
+            "test.after",
+            "test.before",
+            "test.later",
+        ]
+
+
+def test_saving_shared_state_attributes(hass_recorder):
+    """Test states with the same attributes share a state attributes row."""
+    hass = hass_recorder()
+    instance = hass.data[DATA_INSTANCE]
+
+    hass.states.set("test.recorder", "on", {"friendly_name": "Test"})
+    hass.states.set("test.recorder", "off", {"friendly_name": "Test"})
+    hass.states.set("test.other", "on", {"friendly_name": "Other"})
+    wait_recording_done(hass)
+
+    # Stored attributes are looked up by hash once they left the cache
+    instance._attributes_ids.clear()
+    hass.states.set("test.recorder", "on", {"friendly_name": "Test"})
+    wait_recording_done(hass)
+
+    with session_scope(hass=hass) as session:
+        assert session.query(StateAttributes).count() == 2
+
+        db_states = list(
+            session.query(States)
+            .filter_by(entity_id="test.recorder")
+            .order_by(States.state_id)
+        )
+        assert len(db_states) == 3
+        assert db_states[0].attributes is None
+        assert len({db_state.attributes_id for db_state in db_states}) == 1
+        assert [db_state.to_native().state for db_state in db_states] == [
+            "on",
+            "off",
+            "on",
+        ]
+        assert db_states[2].to_native() == hass.states.get("test.recorder")
+
+
+def test_recorder_queue_drop_new():
+    """Test the recorder queue drops new events when full."""
+    rec_queue = RecorderQueue(2)
+    events = [Event(f"test_{idx}") for idx in range(3)]
+
+    for event in events:
+        rec_queue.put_event(event)
+    rec_queue.put(None)
+
+    assert rec_queue.dropped == 1
+    assert [rec_queue.get() for _ in range(3)] == [events[0], events[1], None]
+
+
+def test_recorder_queue_drop_oldest():
+    """Test the recorder queue drops the oldest events when full."""
+    rec_queue = RecorderQueue(2, drop_oldest=True)
+    events = [Event(f"test_{idx}") for idx in range(3)]
+
+    rec_queue.put(None)
+    for event in events:
+        rec_queue.put_event(event)
+
+    assert rec_queue.dropped == 2
+    assert [rec_queue.get() for _ in range(2)] == [None, events[2]]
+
+    for _ in range(2):
+        rec_queue.task_done()
+    rec_queue.join()
+
+
+def test_recorder_queue_config(hass_recorder):
+    """Test the queue limit is configurable."""
+    hass = hass_recorder(
+        {CONF_MAX_QUEUE_SIZE: 100, CONF_QUEUE_OVERFLOW: QUEUE_OVERFLOW_DROP_OLDEST}
+    )
+    rec_queue = hass.data[DATA_INSTANCE].queue
+    assert rec_queue.max_events == 100
+    assert rec_queue.drop_oldest
+
+
+async def test_websocket_info(hass, hass_ws_client):
+    """Test the recorder info websocket command."""
+    await hass.async_add_executor_job(init_recorder_component, hass)
+    await hass.async_add_job(hass.data[DATA_INSTANCE].block_till_done)
+    client = await hass_ws_client(hass)
+
+    await client.send_json({"id": 5, "type": "recorder/info"})
+    msg = await client.receive_json()
+    assert msg["success"]
+    assert msg["result"]["backlog"] == 0
+    assert msg["result"]["max_backlog"] == 0
+    assert msg["result"]["events_dropped"] == 0
+    assert msg["result"]["thread_running"]
+    assert msg["result"]["purge"] is None
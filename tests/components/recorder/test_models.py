@@ -5,7 +5,13 @@ import unittest
 from sqlalchemy import create_engine
 from sqlalchemy.orm import scoped_session, sessionmaker
 
-from homeassistant.components.recorder.models import Base, Events, RecorderRuns, States
+from homeassistant.components.recorder.models import (
+    Base,
+    Events,
+    RecorderRuns,
+    StateAttributes,
+    States,
+)
 from homeassistant.const import EVENT_STATE_CHANGED
 import homeassistant.core as ha
 from homeassistant.util import dt
@@ -44,6 +50,27 @@ class TestEvents(unittest.TestCase):
         event = ha.Event("test_event", {"some_data": 15})
         assert event == Events.from_event(event).to_native()
 
+    def test_from_state_changed_event(self):
+        """Test the attributes of states are not stored with the event."""
+        old_state = ha.State("light.kitchen", "off", {"friendly_name": "Kitchen"})
+        new_state = ha.State("light.kitchen", "on", {"friendly_name": "Kitchen"})
+        event = ha.Event(
+            EVENT_STATE_CHANGED,
+            {
+                "entity_id": "light.kitchen",
+                "old_state": old_state,
+                "new_state": new_state,
+            },
+        )
+
+        data = Events.from_event(event).to_native().data
+        assert data["entity_id"] == "light.kitchen"
+        assert data["old_state"]["state"] == "off"
+        assert data["new_state"]["state"] == "on"
+        assert "attributes" not in data["old_state"]
+        assert "attributes" not in data["new_state"]
+        assert "Kitchen" not in Events.from_event(event).event_data
+
 
 class TestStates(unittest.TestCase):
     """Test States model."""
@@ -52,13 +79,17 @@ class TestStates(unittest.TestCase):
 
     def test_from_event(self):
         """Test converting event to db state."""
-        state = ha.State("sensor.temperature", "18")
+        state = ha.State("sensor.temperature", "18", {"unit_of_measurement": "°C"})
         event = ha.Event(
             EVENT_STATE_CHANGED,
             {"entity_id": "sensor.temperature", "old_state": None, "new_state": state},
             context=state.context,
         )
-        assert state == States.from_event(event).to_native()
+        db_state = States.from_event(event)
+        db_state.state_attributes = StateAttributes.from_shared_attrs(
+            StateAttributes.shared_attrs_from_event(event)
+        )
+        assert state == db_state.to_native()
 
     def test_from_event_to_delete_state(self):
         """Test converting deleting state event to db state."""
@@ -77,6 +108,25 @@ class TestStates(unittest.TestCase):
         assert db_state.state == ""
         assert db_state.last_changed == event.time_fired
         assert db_state.last_updated == event.time_fired
+        assert StateAttributes.shared_attrs_from_event(event) == "{}"
+
+
+class TestStateAttributes(unittest.TestCase):
+    """Test StateAttributes model."""
+
+    # pylint: disable=no-self-use
+
+    def test_hash_shared_attrs(self):
+        """Test the hash is stable and fits a signed 64 bit column."""
+        attr_hash = StateAttributes.hash_shared_attrs('{"friendly_name": "Lux"}')
+
+        assert attr_hash == StateAttributes.hash_shared_attrs(
+            '{"friendly_name": "Lux"}'
+        )
+        assert attr_hash != StateAttributes.hash_shared_attrs(
+            '{"friendly_name": "Sound"}'
+        )
+        assert -(2 ** 63) <= attr_hash < 2 ** 63
 
 
 class TestRecorderRuns(unittest.TestCase):
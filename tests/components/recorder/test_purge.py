@@ -5,7 +5,13 @@ import unittest
 
 from homeassistant.components import recorder
 from homeassistant.components.recorder.const import DATA_INSTANCE
-from homeassistant.components.recorder.models import Events, States
+from homeassistant.components.recorder.models import (
+    Events,
+    StateAttributes,
+    States,
+    StatesHourly,
+    StatesHourlyRuns,
+)
 from homeassistant.components.recorder.purge import purge_old_data
 from homeassistant.components.recorder.util import session_scope
 
@@ -121,6 +127,119 @@ class TestRecorderPurge(unittest.TestCase):
             # we should only have 2 events left
             assert events.count() == 2
 
+    def test_purge_old_state_attributes(self):
+        """Test deleting state attributes no state refers to anymore."""
+        now = datetime.now()
+        eleven_days_ago = now - timedelta(days=11)
+
+        self.hass.block_till_done()
+        self.hass.data[DATA_INSTANCE].block_till_done()
+
+        with recorder.session_scope(hass=self.hass) as session:
+            old_attributes = StateAttributes.from_shared_attrs('{"old": true}')
+            shared_attributes = StateAttributes.from_shared_attrs('{"shared": true}')
+            session.add_all([old_attributes, shared_attributes])
+            session.flush()
+
+            for timestamp, attributes in (
+                (eleven_days_ago, old_attributes),
+                (eleven_days_ago, shared_attributes),
+                (now, shared_attributes),
+            ):
+                session.add(
+                    States(
+                        entity_id="test.recorder2",
+                        domain="sensor",
+                        state="on",
+                        attributes_id=attributes.attributes_id,
+                        last_changed=timestamp,
+                        last_updated=timestamp,
+                        created=timestamp,
+                    )
+                )
+
+        with session_scope(hass=self.hass) as session:
+            state_attributes = session.query(StateAttributes)
+            assert state_attributes.count() == 2
+
+            purge_old_data(self.hass.data[DATA_INSTANCE], 4, repack=False)
+
+            assert [attrs.shared_attrs for attrs in state_attributes] == [
+                '{"shared": true}'
+            ]
+
+    def test_purge_old_hourly_aggregates(self):
+        """Test deleting old hourly aggregates and their compiled hours."""
+        now = datetime.now().replace(minute=0, second=0, microsecond=0)
+        eleven_days_ago = now - timedelta(days=11)
+
+        self.hass.block_till_done()
+        self.hass.data[DATA_INSTANCE].block_till_done()
+
+        with recorder.session_scope(hass=self.hass) as session:
+            for start in (eleven_days_ago, now):
+                session.add(StatesHourly(entity_id="sensor.power", start=start))
+                session.add(StatesHourlyRuns(start=start))
+
+        with session_scope(hass=self.hass) as session:
+            purge_old_data(self.hass.data[DATA_INSTANCE], 4, repack=False)
+
+            assert [row.start for row in session.query(StatesHourly)] == [now]
+            assert [row.start for row in session.query(StatesHourlyRuns)] == [now]
+
+    def test_purge_keep_days_domains_and_entities(self):
+        """Test entities and domains can be kept longer than other states."""
+        instance = self.hass.data[DATA_INSTANCE]
+        self._add_test_states()
+
+        with session_scope(hass=self.hass) as session:
+            states = session.query(States)
+
+            # The entity is kept longer than its domain
+            instance.keep_days_domains = {"sensor": 8}
+            instance.keep_days_entities = {"test.recorder2": 12}
+            assert purge_old_data(instance, 4, repack=False)
+            assert states.count() == 6
+
+            instance.keep_days_entities = {}
+            assert purge_old_data(instance, 4, repack=False)
+            assert states.count() == 4
+
+            instance.keep_days_domains = {"other": 8}
+            assert purge_old_data(instance, 4, repack=False)
+            assert states.count() == 2
+
+    def test_purge_in_batches(self):
+        """Test the purge service deletes rows in batches."""
+        instance = self.hass.data[DATA_INSTANCE]
+        self._add_test_events()
+        self._add_test_states()
+
+        with patch(
+            "homeassistant.components.recorder.purge.MAX_ROWS_TO_PURGE", 1
+        ), patch(
+            "homeassistant.components.recorder.purge.purge_old_data",
+            wraps=purge_old_data,
+        ) as purge_mock:
+            self.hass.services.call("recorder", "purge", {"keep_days": 4})
+            self.hass.block_till_done()
+            instance.block_till_done()
+
+        # One batch per state and event, and one to find nothing is left
+        assert purge_mock.call_count == 9
+        assert instance.purge_progress.finished
+        assert instance.purge_progress.deleted_states == 4
+        assert instance.purge_progress.deleted_events == 4
+
+        with session_scope(hass=self.hass) as session:
+            assert session.query(States).count() == 2
+            assert (
+                session.query(Events)
+                .filter(Events.event_type.like("EVENT_TEST%"))
+                .count()
+                == 2
+            )
+
     def test_purge_method(self):
         """Test purge method."""
         service_data = {"keep_days": 4}
@@ -173,7 +292,4 @@ class TestRecorderPurge(unittest.TestCase):
                 self.hass.services.call("recorder", "purge", service_data=service_data)
                 self.hass.block_till_done()
                 self.hass.data[DATA_INSTANCE].block_till_done()
-                assert (
-                    mock_logger.debug.mock_calls[3][1][0]
-                    == "Vacuuming SQL DB to free space"
-                )
+                mock_logger.debug.assert_called_with("Vacuuming SQL DB to free space")
@@ -7,6 +7,7 @@ from homeassistant.const import (
 )
 from homeassistant.setup import async_setup_component, setup_component
 
+from tests.async_mock import patch
 from tests.common import assert_setup_component, get_test_home_assistant
 
 
@@ -518,7 +519,7 @@ async def test_invalid_availability_template_keeps_component_available(hass, cap
 
 
 async def test_no_template_match_all(hass, caplog):
-    """Test that we do not allow sensors that match on all."""
+    """Test templates that use no states are only updated manually."""
     hass.states.async_set("sensor.test_sensor", "startup")
 
     await async_setup_component(
@@ -557,6 +558,17 @@ async def test_no_template_match_all(hass, caplog):
 
     await hass.async_block_till_done()
     assert len(hass.states.async_all()) == 6
+
+    assert hass.states.get("sensor.invalid_state").state == "unknown"
+    assert hass.states.get("sensor.invalid_icon").state == "unknown"
+    assert hass.states.get("sensor.invalid_entity_picture").state == "unknown"
+    assert hass.states.get("sensor.invalid_friendly_name").state == "unknown"
+    assert hass.states.get("sensor.invalid_attribute").state == "unknown"
+
+    hass.bus.async_fire(EVENT_HOMEASSISTANT_START)
+    await hass.async_block_till_done()
+
+    # The templates are rendered on startup to find the states they use
     assert (
         "Template sensor 'invalid_state' has no entity ids "
         "configured to track nor were we able to extract the entities to "
@@ -583,15 +595,6 @@ async def test_no_template_match_all(hass, caplog):
         "track from the test_attribute template"
     ) in caplog.text
 
-    assert hass.states.get("sensor.invalid_state").state == "unknown"
-    assert hass.states.get("sensor.invalid_icon").state == "unknown"
-    assert hass.states.get("sensor.invalid_entity_picture").state == "unknown"
-    assert hass.states.get("sensor.invalid_friendly_name").state == "unknown"
-    assert hass.states.get("sensor.invalid_attribute").state == "unknown"
-
-    hass.bus.async_fire(EVENT_HOMEASSISTANT_START)
-    await hass.async_block_till_done()
-
     assert hass.states.get("sensor.invalid_state").state == "2"
     assert hass.states.get("sensor.invalid_icon").state == "startup"
     assert hass.states.get("sensor.invalid_entity_picture").state == "startup"
@@ -601,11 +604,12 @@ async def test_no_template_match_all(hass, caplog):
     hass.states.async_set("sensor.test_sensor", "hello")
     await hass.async_block_till_done()
 
+    # The value templates are tracked even though the other templates are not
     assert hass.states.get("sensor.invalid_state").state == "2"
-    assert hass.states.get("sensor.invalid_icon").state == "startup"
-    assert hass.states.get("sensor.invalid_entity_picture").state == "startup"
-    assert hass.states.get("sensor.invalid_friendly_name").state == "startup"
-    assert hass.states.get("sensor.invalid_attribute").state == "startup"
+    assert hass.states.get("sensor.invalid_icon").state == "hello"
+    assert hass.states.get("sensor.invalid_entity_picture").state == "hello"
+    assert hass.states.get("sensor.invalid_friendly_name").state == "hello"
+    assert hass.states.get("sensor.invalid_attribute").state == "hello"
 
     await hass.helpers.entity_component.async_update_entity("sensor.invalid_state")
     await hass.helpers.entity_component.async_update_entity("sensor.invalid_icon")
@@ -622,3 +626,81 @@ async def test_no_template_match_all(hass, caplog):
     assert hass.states.get("sensor.invalid_entity_picture").state == "hello"
     assert hass.states.get("sensor.invalid_friendly_name").state == "hello"
     assert hass.states.get("sensor.invalid_attribute").state == "hello"
+
+
+async def test_availability_template_after_value_change(hass):
+    """Test a value change keeps the availability of the availability template."""
+    hass.states.async_set("sensor.a", "1")
+    hass.states.async_set("sensor.b", "off")
+
+    await async_setup_component(
+        hass,
+        "sensor",
+        {
+            "sensor": {
+                "platform": "template",
+                "sensors": {
+                    "test": {
+                        "value_template": "{{ states('sensor.a') }}",
+                        "availability_template": "{{ is_state('sensor.b', 'on') }}",
+                    }
+                },
+            }
+        },
+    )
+    hass.bus.async_fire(EVENT_HOMEASSISTANT_START)
+    await hass.async_block_till_done()
+
+    assert hass.states.get("sensor.test").state == STATE_UNAVAILABLE
+
+    hass.states.async_set("sensor.a", "2")
+    await hass.async_block_till_done()
+
+    assert hass.states.get("sensor.test").state == STATE_UNAVAILABLE
+
+    hass.states.async_set("sensor.b", "on")
+    await hass.async_block_till_done()
+
+    assert hass.states.get("sensor.test").state == "2"
+
+
+async def test_tracked_templates_write_results(hass):
+    """Test results of tracked templates are written without rendering again."""
+    hass.states.async_set("sensor.test_sensor", "startup")
+
+    await async_setup_component(
+        hass,
+        "sensor",
+        {
+            "sensor": {
+                "platform": "template",
+                "sensors": {
+                    "test": {
+                        "value_template": "{{ states.sensor.test_sensor.state }}",
+                        "icon_template": "{{ 'mdi:' ~ states('sensor.test_sensor') }}",
+                    },
+                    "now": {"value_template": "{{ now().microsecond }}"},
+                },
+            }
+        },
+    )
+    hass.bus.async_fire(EVENT_HOMEASSISTANT_START)
+    await hass.async_block_till_done()
+
+    state = hass.states.get("sensor.test")
+    assert state.state == "startup"
+    assert state.attributes["icon"] == "mdi:startup"
+    now_state = hass.states.get("sensor.now").state
+
+    with patch(
+        "homeassistant.components.template.sensor.SensorTemplate.async_update"
+    ) as mock_update:
+        hass.states.async_set("sensor.test_sensor", "hello")
+        await hass.async_block_till_done()
+
+    assert not mock_update.mock_calls
+    state = hass.states.get("sensor.test")
+    assert state.state == "hello"
+    assert state.attributes["icon"] == "mdi:hello"
+    # Templates that use no states are not rendered on state changes
+    assert hass.states.get("sensor.now").state == now_state
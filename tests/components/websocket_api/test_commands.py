@@ -1,18 +1,23 @@
 """Tests for WebSocket API commands."""
 from async_timeout import timeout
 
+from homeassistant import core
 from homeassistant.components.websocket_api import const
 from homeassistant.components.websocket_api.auth import (
     TYPE_AUTH,
     TYPE_AUTH_OK,
     TYPE_AUTH_REQUIRED,
 )
+from homeassistant.components.websocket_api.commands import (
+    DATA_STATE_CHANGED_FORWARDERS,
+)
 from homeassistant.components.websocket_api.const import URL
 from homeassistant.core import callback
 from homeassistant.exceptions import HomeAssistantError
 from homeassistant.loader import async_get_integration
 from homeassistant.setup import async_setup_component
 
+from tests.async_mock import patch
 from tests.common import async_mock_service
 
 
@@ -388,6 +393,99 @@ async def test_subscribe_unsubscribe_events_state_changed(
     assert msg["event"]["data"]["entity_id"] == "light.permitted"
 
 
+async def test_subscribe_events_state_changed_filters(hass, websocket_client):
+    """Test subscribe state_changed events filtered by entity, domain and attribute."""
+    await websocket_client.send_json(
+        {
+            "id": 7,
+            "type": "subscribe_events",
+            "event_type": "state_changed",
+            "entity_id": ["light.kitchen", "switch.fan"],
+            "domain": "light",
+            "attributes": ["brightness"],
+        }
+    )
+
+    msg = await websocket_client.receive_json()
+    assert msg["id"] == 7
+    assert msg["type"] == const.TYPE_RESULT
+    assert msg["success"]
+
+    hass.states.async_set("light.kitchen", "on", {"brightness": 100})
+    hass.states.async_set("light.kitchen", "on", {"brightness": 100, "other": 1})
+    hass.states.async_set("switch.fan", "on")
+    hass.states.async_set("light.bedroom", "on")
+    hass.states.async_set("light.kitchen", "on", {"brightness": 200, "other": 1})
+
+    msg = await websocket_client.receive_json()
+    assert msg["id"] == 7
+    assert msg["type"] == "event"
+    assert msg["event"]["data"]["entity_id"] == "light.kitchen"
+    assert msg["event"]["data"]["old_state"] is None
+
+    msg = await websocket_client.receive_json()
+    assert msg["id"] == 7
+    assert msg["event"]["data"]["entity_id"] == "light.kitchen"
+    assert msg["event"]["data"]["new_state"]["attributes"]["brightness"] == 200
+
+    await websocket_client.send_json(
+        {"id": 8, "type": "unsubscribe_events", "subscription": 7}
+    )
+
+    msg = await websocket_client.receive_json()
+    assert msg["id"] == 8
+    assert msg["success"]
+    assert hass.data[DATA_STATE_CHANGED_FORWARDERS] == {}
+
+
+async def test_subscribe_events_filters_require_state_changed(hass, websocket_client):
+    """Test filters are only accepted for state_changed events."""
+    await websocket_client.send_json(
+        {
+            "id": 7,
+            "type": "subscribe_events",
+            "event_type": "test_event",
+            "entity_id": "light.kitchen",
+        }
+    )
+
+    msg = await websocket_client.receive_json()
+    assert msg["id"] == 7
+    assert msg["type"] == const.TYPE_RESULT
+    assert not msg["success"]
+    assert msg["error"]["code"] == const.ERR_INVALID_FORMAT
+
+
+async def test_subscribe_events_state_changed_shared(hass, websocket_client):
+    """Test subscriptions with the same filter share one encoded event."""
+    for iden in (7, 8):
+        await websocket_client.send_json(
+            {
+                "id": iden,
+                "type": "subscribe_events",
+                "event_type": "state_changed",
+                "domain": "light",
+            }
+        )
+        msg = await websocket_client.receive_json()
+        assert msg["success"]
+
+    assert len(hass.data[DATA_STATE_CHANGED_FORWARDERS]) == 1
+
+    with patch(
+        "homeassistant.core._json_dumps_data", wraps=core._json_dumps_data
+    ) as mock_dump:
+        hass.states.async_set("switch.fan", "on")
+        hass.states.async_set("light.kitchen", "on")
+
+        msgs = [await websocket_client.receive_json() for _ in range(2)]
+
+    assert mock_dump.call_count == 1
+    assert sorted(msg["id"] for msg in msgs) == [7, 8]
+    assert msgs[0]["event"] == msgs[1]["event"]
+    assert msgs[0]["event"]["data"]["entity_id"] == "light.kitchen"
+
+
 async def test_render_template_renders_template(
     hass, websocket_client, hass_admin_user
 ):
@@ -511,3 +609,27 @@ async def test_manifest_get(hass, websocket_client):
     assert msg["type"] == const.TYPE_RESULT
     assert not msg["success"]
     assert msg["error"]["code"] == "not_found"
+
+
+async def test_integration_setup_timings(hass, websocket_client):
+    """Test getting the setup timings of integrations."""
+    await websocket_client.send_json({"id": 5, "type": "integration/setup_timings"})
+
+    msg = await websocket_client.receive_json()
+    assert msg["id"] == 5
+    assert msg["type"] == const.TYPE_RESULT
+    assert msg["success"]
+    assert set(msg["result"]["websocket_api"]) >= {"import", "setup"}
+
+    await websocket_client.send_json(
+        {"id": 6, "type": "integration/setup_timings", "format": "trace"}
+    )
+
+    msg = await websocket_client.receive_json()
+    assert msg["id"] == 6
+    assert msg["type"] == const.TYPE_RESULT
+    assert msg["success"]
+    assert {"name": "thread_name", "ph": "M"}.items() <= msg["result"][0].items()
+    assert any(
+        event["ph"] == "X" and event["cat"] == "setup" for event in msg["result"]
+    )
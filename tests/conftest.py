@@ -28,6 +28,7 @@ from tests.common import (  # noqa: E402, isort:skip
     INSTANCES,
     MockUser,
     async_test_home_assistant,
+    exit_storage_mocks,
     mock_storage as mock_storage,
 )
 from tests.test_util.aiohttp import mock_aiohttp_client  # noqa: E402, isort:skip
@@ -77,6 +78,8 @@ def verify_cleanup():
             inst.stop()
         pytest.exit(f"Detected non stopped instances ({count}), aborting test run")
 
+    exit_storage_mocks()
+
 
 @pytest.fixture
 def hass_storage():
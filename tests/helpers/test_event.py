@@ -9,15 +9,21 @@ from homeassistant.components import sun
 from homeassistant.const import MATCH_ALL
 import homeassistant.core as ha
 from homeassistant.core import callback
+from homeassistant.exceptions import TemplateError
 from homeassistant.helpers.event import (
+    ALL_STATES_RATE_LIMIT,
+    SCHEDULER_COMPACT_THRESHOLD,
+    TRACK_TIME_CHANGE_SCHEDULER,
     async_call_later,
     async_track_point_in_time,
     async_track_point_in_utc_time,
     async_track_same_state,
     async_track_state_change,
+    async_track_state_change_event,
     async_track_sunrise,
     async_track_sunset,
     async_track_template,
+    async_track_template_result,
     async_track_time_change,
     async_track_time_interval,
     async_track_utc_time_change,
@@ -85,6 +91,76 @@ async def test_track_point_in_time(hass):
     assert len(runs) == 2
 
 
+async def test_track_point_in_time_ordering(hass):
+    """Test point in time listeners fire in order of their point in time."""
+    now = datetime(2020, 1, 1, 12, 0, 0, tzinfo=dt_util.UTC)
+    runs = []
+
+    for delay, name in ((3, "third"), (1, "first"), (2, "second"), (1, "first2")):
+        async_track_point_in_utc_time(
+            hass,
+            callback(lambda x, name=name: runs.append(name)),
+            now + timedelta(seconds=delay),
+        )
+
+    _send_time_changed(hass, now)
+    await hass.async_block_till_done()
+    assert runs == []
+
+    _send_time_changed(hass, now + timedelta(seconds=1))
+    await hass.async_block_till_done()
+    assert runs == ["first", "first2"]
+
+    _send_time_changed(hass, now + timedelta(seconds=10))
+    await hass.async_block_till_done()
+    assert runs == ["first", "first2", "second", "third"]
+
+
+async def test_track_point_in_time_cancel_compacts(hass):
+    """Test cancelled point in time listeners are dropped from the scheduler."""
+    now = datetime(2020, 1, 1, 12, 0, 0, tzinfo=dt_util.UTC)
+    runs = []
+
+    unsubs = [
+        async_track_point_in_utc_time(
+            hass, callback(lambda x: runs.append(1)), now + timedelta(seconds=5)
+        )
+        for _ in range(SCHEDULER_COMPACT_THRESHOLD * 2)
+    ]
+    for unsub in unsubs[1:]:
+        unsub()
+
+    _send_time_changed(hass, now)
+    await hass.async_block_till_done()
+    assert len(hass.data[TRACK_TIME_CHANGE_SCHEDULER]._heap) == 1
+
+    _send_time_changed(hass, now + timedelta(seconds=5))
+    await hass.async_block_till_done()
+    assert len(runs) == 1
+    assert len(hass.data[TRACK_TIME_CHANGE_SCHEDULER]._heap) == 0
+
+    # Cancelling after the listener has fired is a no-op
+    unsubs[0]()
+
+
+async def test_track_point_in_time_exception(hass, caplog):
+    """Test an exception in one timer does not affect the others."""
+    now = datetime(2020, 1, 1, 12, 0, 0, tzinfo=dt_util.UTC)
+    runs = []
+
+    @callback
+    def bad_action(now):
+        raise ValueError
+
+    async_track_point_in_utc_time(hass, bad_action, now)
+    async_track_point_in_utc_time(hass, callback(lambda x: runs.append(1)), now)
+
+    _send_time_changed(hass, now)
+    await hass.async_block_till_done()
+    assert len(runs) == 1
+    assert "Error while running scheduled action" in caplog.text
+
+
 async def test_track_state_change(hass):
     """Test track_state_change."""
     # 2 lists to track how often our callbacks get called
@@ -163,6 +239,100 @@ async def test_track_state_change(hass):
     assert len(wildercard_runs) == 6
 
 
+async def test_track_state_change_event(hass):
+    """Test async_track_state_change_event."""
+    single_entity_id_tracker = []
+    multiple_entity_id_tracker = []
+    match_all_tracker = []
+
+    @ha.callback
+    def single_run_callback(event):
+        single_entity_id_tracker.append(event)
+
+    @ha.callback
+    def multiple_run_callback(event):
+        multiple_entity_id_tracker.append(event)
+
+    @ha.callback
+    def match_all_run_callback(event):
+        match_all_tracker.append(event)
+
+    unsub_single = async_track_state_change_event(
+        hass, "light.Bowl", single_run_callback
+    )
+    unsub_multi = async_track_state_change_event(
+        hass, ["light.bowl", "switch.kitchen"], multiple_run_callback
+    )
+    unsub_match_all = async_track_state_change_event(
+        hass, MATCH_ALL, match_all_run_callback
+    )
+
+    # A single bus listener dispatches to all trackers
+    assert hass.bus.async_listeners()[ha.EVENT_STATE_CHANGED] == 1
+
+    hass.states.async_set("light.Bowl", "on")
+    await hass.async_block_till_done()
+    assert len(single_entity_id_tracker) == 1
+    assert len(multiple_entity_id_tracker) == 1
+    assert len(match_all_tracker) == 1
+    assert single_entity_id_tracker[-1].data["entity_id"] == "light.bowl"
+
+    hass.states.async_set("switch.kitchen", "on")
+    await hass.async_block_till_done()
+    assert len(single_entity_id_tracker) == 1
+    assert len(multiple_entity_id_tracker) == 2
+    assert len(match_all_tracker) == 2
+
+    hass.states.async_set("sensor.other", "on")
+    await hass.async_block_till_done()
+    assert len(single_entity_id_tracker) == 1
+    assert len(multiple_entity_id_tracker) == 2
+    assert len(match_all_tracker) == 3
+
+    unsub_single()
+    unsub_match_all()
+
+    hass.states.async_set("light.Bowl", "off")
+    await hass.async_block_till_done()
+    assert len(single_entity_id_tracker) == 1
+    assert len(multiple_entity_id_tracker) == 3
+    assert len(match_all_tracker) == 3
+
+    unsub_multi()
+    assert ha.EVENT_STATE_CHANGED not in hass.bus.async_listeners()
+
+
+async def test_track_state_change_event_exception(hass, caplog):
+    """Test an exception in one tracker does not affect the others."""
+    tracker_called = []
+
+    @ha.callback
+    def bad_callback(event):
+        raise ValueError
+
+    @ha.callback
+    def good_callback(event):
+        tracker_called.append(event)
+
+    async_track_state_change_event(hass, "light.bowl", bad_callback)
+    async_track_state_change_event(hass, "light.bowl", good_callback)
+
+    hass.states.async_set("light.bowl", "on")
+    await hass.async_block_till_done()
+    assert len(tracker_called) == 1
+    assert "Error while processing state changed for light.bowl" in caplog.text
+
+
+async def test_track_state_change_event_no_entities(hass):
+    """Test tracking no entities does not listen for state changes."""
+    unsub = async_track_state_change_event(hass, [], ha.callback(lambda event: None))
+
+    assert ha.EVENT_STATE_CHANGED not in hass.bus.async_listeners()
+
+    unsub()
+    assert ha.EVENT_STATE_CHANGED not in hass.bus.async_listeners()
+
+
 async def test_track_template(hass):
     """Test tracking template."""
     specific_runs = []
@@ -230,6 +400,157 @@ async def test_track_template(hass):
     assert len(wildercard_runs) == 2
 
 
+async def test_track_template_result(hass):
+    """Test tracking the result of a template."""
+    runs = []
+    template = Template("{{ states('sensor.test') }}", hass)
+
+    hass.states.async_set("sensor.test", "5")
+
+    @ha.callback
+    def result_callback(event, last_result, result):
+        runs.append((last_result, result))
+
+    info = async_track_template_result(hass, template, result_callback)
+    assert info.last_result == "5"
+
+    hass.states.async_set("sensor.test", "6")
+    await hass.async_block_till_done()
+    assert runs == [("5", "6")]
+
+    # States the template did not use do not render it again
+    hass.states.async_set("sensor.other", "7")
+    await hass.async_block_till_done()
+    assert runs == [("5", "6")]
+
+    info.async_remove()
+    hass.states.async_set("sensor.test", "7")
+    await hass.async_block_till_done()
+    assert runs == [("5", "6")]
+
+
+async def test_track_template_result_follows_render(hass):
+    """Test the tracked entities follow those of the last render."""
+    runs = []
+    template = Template(
+        "{{ states('sensor.a') if is_state('input_boolean.switch', 'on') "
+        "else states('sensor.b') }}",
+        hass,
+    )
+
+    hass.states.async_set("input_boolean.switch", "on")
+    hass.states.async_set("sensor.a", "a")
+    hass.states.async_set("sensor.b", "b")
+
+    @ha.callback
+    def result_callback(event, last_result, result):
+        runs.append(result)
+
+    async_track_template_result(hass, template, result_callback)
+
+    hass.states.async_set("sensor.b", "b2")
+    await hass.async_block_till_done()
+    assert runs == []
+
+    hass.states.async_set("input_boolean.switch", "off")
+    await hass.async_block_till_done()
+    assert runs == ["b2"]
+
+    hass.states.async_set("sensor.a", "a2")
+    await hass.async_block_till_done()
+    assert runs == ["b2"]
+
+
+async def test_track_template_result_domain(hass):
+    """Test templates iterating a domain render when its entities come and go."""
+    runs = []
+    template = Template("{{ states.light | count }}", hass)
+
+    @ha.callback
+    def result_callback(event, last_result, result):
+        runs.append(result)
+
+    async_track_template_result(hass, template, result_callback)
+
+    hass.states.async_set("light.one", "on")
+    await hass.async_block_till_done()
+    assert runs == ["1"]
+
+    hass.states.async_set("switch.one", "on")
+    await hass.async_block_till_done()
+    assert runs == ["1"]
+
+    hass.states.async_remove("light.one")
+    await hass.async_block_till_done()
+    assert runs == ["1", "0"]
+
+
+async def test_track_template_result_all_states_rate_limit(hass):
+    """Test templates iterating over all states are rate limited."""
+    runs = []
+    template = Template("{{ states | count }}", hass)
+
+    @ha.callback
+    def result_callback(event, last_result, result):
+        runs.append(result)
+
+    async_track_template_result(hass, template, result_callback)
+
+    hass.states.async_set("sensor.one", "1")
+    hass.states.async_set("switch.one", "on")
+    await hass.async_block_till_done()
+    assert runs == []
+
+    async_fire_time_changed(
+        hass, dt_util.utcnow() + timedelta(seconds=ALL_STATES_RATE_LIMIT + 1)
+    )
+    await hass.async_block_till_done()
+    assert runs == ["2"]
+
+
+async def test_track_template_result_no_states(hass):
+    """Test templates using no states are only tracked when asked for."""
+    runs = []
+    fallback_runs = []
+    template = Template("{{ now().year > 0 }}", hass)
+
+    @ha.callback
+    def result_callback(event, last_result, result):
+        runs.append(result)
+
+    @ha.callback
+    def fallback_callback(event, last_result, result):
+        fallback_runs.append(result)
+
+    async_track_template_result(hass, template, result_callback)
+    async_track_template_result(
+        hass, template, fallback_callback, match_all_fallback=True
+    )
+
+    hass.states.async_set("sensor.test", "5")
+    await hass.async_block_till_done()
+    assert runs == []
+    assert fallback_runs == ["True"]
+
+
+async def test_track_template_result_error(hass):
+    """Test errors rendering a template are passed as result."""
+    runs = []
+    template = Template("{{ states('sensor.test') ~ missing.attribute }}", hass)
+
+    @ha.callback
+    def result_callback(event, last_result, result):
+        runs.append(result)
+
+    info = async_track_template_result(hass, template, result_callback)
+    assert isinstance(info.last_result, TemplateError)
+
+    hass.states.async_set("sensor.test", "5")
+    await hass.async_block_till_done()
+    assert len(runs) == 1
+    assert isinstance(runs[0], TemplateError)
+
+
 async def test_track_same_state_simple_trigger(hass):
     """Test track_same_change with trigger simple."""
     thread_runs = []
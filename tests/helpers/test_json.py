@@ -1,10 +1,14 @@
 """Test Home Assistant remote methods and classes."""
+import json
+
 import pytest
 
 from homeassistant import core
 from homeassistant.helpers.json import JSONEncoder
 from homeassistant.util import dt as dt_util
 
+from tests.async_mock import patch
+
 
 def test_json_encoder(hass):
     """Test the JSON Encoder."""
@@ -19,3 +23,24 @@ def test_json_encoder(hass):
 
     now = dt_util.utcnow()
     assert ha_json_enc.default(now) == now.isoformat()
+
+
+def test_json_encoder_reuses_cached_json(hass):
+    """Test the JSON Encoder reuses the cached JSON of states."""
+    states = [core.State("test.one", "on"), core.State("test.two", "off")]
+
+    with patch.object(
+        core.State, "as_json", autospec=True, side_effect=core.State.as_json
+    ) as mock_as_json:
+        dumped = json.dumps(states, cls=JSONEncoder)
+
+    assert len(mock_as_json.mock_calls) == 2
+    assert json.loads(dumped) == json.loads(
+        json.dumps([state.as_dict() for state in states], cls=JSONEncoder)
+    )
+
+    # NaN is only encoded when the encoder allows it
+    state = core.State("test.nan", "on", {"value": float("nan")})
+    assert "NaN" in json.dumps(state, cls=JSONEncoder)
+    with pytest.raises(ValueError):
+        json.dumps(state, cls=JSONEncoder, allow_nan=False)
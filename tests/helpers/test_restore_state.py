@@ -1,5 +1,5 @@
 """The tests for the Restore component."""
-from datetime import datetime
+from datetime import datetime, timedelta
 
 from homeassistant.const import EVENT_HOMEASSISTANT_START
 from homeassistant.core import CoreState, State
@@ -268,3 +268,96 @@ async def test_restoring_invalid_entity_id(hass, hass_storage):
 
     state = await entity.async_get_last_state()
     assert state is None
+
+
+async def test_dump_changed_states_to_journal(hass, hass_storage):
+    """Test only the states that changed are appended to the journal."""
+    for entity_id in ("input_boolean.b0", "input_boolean.b1"):
+        entity = RestoreEntity()
+        entity.hass = hass
+        entity.entity_id = entity_id
+        await entity.async_internal_added_to_hass()
+        hass.states.async_set(entity_id, "on")
+
+    data = await RestoreStateData.async_get_instance(hass)
+    await hass.async_block_till_done()
+    await data.async_dump_states()
+
+    assert len(hass_storage[STORAGE_KEY]["data"]) == 2
+    assert f"{STORAGE_KEY}.journal" not in hass_storage
+
+    hass.states.async_set("input_boolean.b1", "off")
+    await data.async_dump_states()
+    # Nothing changed since the last dump
+    await data.async_dump_states()
+
+    journal = hass_storage[f"{STORAGE_KEY}.journal"]
+    assert len(journal) == 1
+    assert journal[0]["state"]["entity_id"] == "input_boolean.b1"
+    assert journal[0]["state"]["state"] == "off"
+
+    # All states are saved once the journal holds as many states
+    hass.states.async_set("input_boolean.b0", "off")
+    await data.async_dump_states()
+
+    assert [item["state"]["state"] for item in hass_storage[STORAGE_KEY]["data"]] == [
+        "off",
+        "off",
+    ]
+    assert f"{STORAGE_KEY}.journal" not in hass_storage
+
+
+async def test_dump_changed_states_retried_after_journal_error(hass, hass_storage):
+    """Test changed states are appended again when the journal write failed."""
+    for entity_id in ("input_boolean.b0", "input_boolean.b1"):
+        entity = RestoreEntity()
+        entity.hass = hass
+        entity.entity_id = entity_id
+        await entity.async_internal_added_to_hass()
+        hass.states.async_set(entity_id, "on")
+
+    data = await RestoreStateData.async_get_instance(hass)
+    await hass.async_block_till_done()
+    await data.async_dump_states()
+
+    hass.states.async_set("input_boolean.b1", "off")
+    with patch(
+        "homeassistant.helpers.storage.Store._append_journal",
+        side_effect=HomeAssistantError,
+    ):
+        await data.async_dump_states()
+
+    assert f"{STORAGE_KEY}.journal" not in hass_storage
+
+    await data.async_dump_states()
+
+    journal = hass_storage[f"{STORAGE_KEY}.journal"]
+    assert len(journal) == 1
+    assert journal[0]["state"]["entity_id"] == "input_boolean.b1"
+    assert journal[0]["state"]["state"] == "off"
+
+
+async def test_load_replays_journal(hass, hass_storage):
+    """Test the journal is replayed over the saved states."""
+    saved = dt_util.utcnow()
+
+    def stored_state(state, last_seen):
+        return StoredState(State("input_boolean.b1", state), last_seen).as_dict()
+
+    hass_storage[STORAGE_KEY] = {
+        "version": 1,
+        "key": STORAGE_KEY,
+        "data": [stored_state("off", saved)],
+    }
+    hass_storage[f"{STORAGE_KEY}.journal"] = [
+        # Appended before the states were saved
+        stored_state("unknown", saved - timedelta(minutes=15)),
+        stored_state("on", saved + timedelta(minutes=15)),
+    ]
+
+    entity = RestoreEntity()
+    entity.hass = hass
+    entity.entity_id = "input_boolean.b1"
+
+    state = await entity.async_get_last_state()
+    assert state.state == "on"
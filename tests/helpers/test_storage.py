@@ -236,3 +236,42 @@ async def test_migrator_transforming_config(hass, store, hass_storage):
         "version": MOCK_VERSION,
         "data": data,
     }
+
+
+async def test_journal(tmp_path):
+    """Test appending records to the journal and loading them."""
+    store = storage.Store(Mock(), MOCK_VERSION, MOCK_KEY)
+    path = str(tmp_path / ".storage" / f"{MOCK_KEY}.journal")
+
+    store._append_journal(path, [MOCK_DATA])
+    store._append_journal(path, [MOCK_DATA2])
+    assert store._load_journal(path) == [MOCK_DATA, MOCK_DATA2]
+
+    # A record cut short when writing ends the journal
+    with open(path, "a") as fobj:
+        fobj.write('{"hello": ')
+    assert store._load_journal(path) == [MOCK_DATA, MOCK_DATA2]
+
+    assert store._load_journal(str(tmp_path / "missing")) == []
+
+
+async def test_append_journal_error(hass, store):
+    """Test errors appending to the journal are raised."""
+    with patch(
+        "homeassistant.helpers.storage.Store._append_journal",
+        side_effect=storage.json_util.WriteError,
+    ), pytest.raises(storage.json_util.WriteError):
+        await store.async_append_journal([MOCK_DATA])
+
+
+async def test_write_metrics(tmp_path):
+    """Test the duration and size of writes are recorded."""
+    store = storage.Store(Mock(), MOCK_VERSION, MOCK_KEY, compact=True)
+    path = str(tmp_path / ".storage" / MOCK_KEY)
+
+    store._write_data(path, {"version": MOCK_VERSION, "data": MOCK_DATA})
+
+    with open(path) as fobj:
+        assert json.load(fobj) == {"version": MOCK_VERSION, "data": MOCK_DATA}
+    assert store.last_write_size == len('{"data":{"hello":"world"},"version":1}')
+    assert store.last_write_duration >= 0
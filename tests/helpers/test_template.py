@@ -80,6 +80,40 @@ def test_template_equality():
         template.Template(["{{ template_one }}"])
 
 
+def test_static_template(hass):
+    """Test strings without Jinja code are not compiled."""
+    tmpl = template.Template(" ON ", hass)
+    assert tmpl.is_static
+
+    with patch.object(template, "_compile") as mock_compile:
+        tmpl.ensure_valid()
+        assert tmpl.async_render() == "ON"
+        assert tmpl.async_render_with_possible_json_value("OFF") == "ON"
+
+    assert not mock_compile.called
+    assert not template.Template("{{ value }}", hass).is_static
+
+
+def test_compiled_code_shared(hass):
+    """Test templates with the same source share their compiled code."""
+    with patch.dict(template._COMPILED_CACHE, clear=True), patch.object(
+        template, "COMPILED_CACHE_SIZE", 2
+    ):
+        first = template.Template("{{ value_json.one }}", hass)
+        second = template.Template("{{ value_json.one }}", hass)
+        first.ensure_valid()
+        second.ensure_valid()
+        assert first._compiled_code is second._compiled_code
+        assert second.async_render_with_possible_json_value('{"one": 1}') == "1"
+
+        template.Template("{{ value_json.two }}", hass).ensure_valid()
+        template.Template("{{ value_json.three }}", hass).ensure_valid()
+        assert list(template._COMPILED_CACHE) == [
+            (True, "{{ value_json.two }}"),
+            (True, "{{ value_json.three }}"),
+        ]
+
+
 def test_invalid_template(hass):
     """Invalid template raises error."""
     tmpl = template.Template("{{", hass)
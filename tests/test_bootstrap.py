@@ -1,6 +1,7 @@
 """Test the bootstrapping."""
 # pylint: disable=protected-access
 import asyncio
+import json
 import logging
 import os
 from unittest.mock import Mock
@@ -290,6 +291,41 @@ async def test_setup_hass(
     assert len(mock_process_ha_config_upgrade.mock_calls) == 1
 
 
+async def test_setup_hass_writes_setup_timings(
+    mock_enable_logging,
+    mock_is_virtual_env,
+    mock_mount_local_lib_path,
+    mock_ensure_config_exists,
+    mock_process_ha_config_upgrade,
+    tmpdir,
+):
+    """Test the setup timings are written in the Chrome trace format."""
+    timings_file = str(tmpdir.join("setup_timings.json"))
+
+    with patch(
+        "homeassistant.config.async_hass_config_yaml",
+        return_value={"browser": {}, "frontend": {}},
+    ):
+        await bootstrap.async_setup_hass(
+            config_dir=get_test_config_dir(),
+            verbose=False,
+            log_rotate_days=None,
+            log_file=None,
+            log_no_color=False,
+            skip_pip=True,
+            safe_mode=False,
+            setup_timings_file=timings_file,
+        )
+
+    with open(timings_file) as fil:
+        data = json.load(fil)
+
+    assert "setup" in data["integrations"]["browser"]
+    assert {
+        event["args"]["name"] for event in data["traceEvents"] if event["ph"] == "M"
+    } >= {"browser", "frontend"}
+
+
 async def test_setup_hass_takes_longer_than_log_slow_startup(
     mock_enable_logging,
     mock_is_virtual_env,
@@ -3,6 +3,7 @@
 import asyncio
 from datetime import datetime, timedelta
 import functools
+import json
 import logging
 import os
 from tempfile import TemporaryDirectory
@@ -32,6 +33,7 @@ from homeassistant.const import (
 )
 import homeassistant.core as ha
 from homeassistant.exceptions import InvalidEntityFormatError, InvalidStateError
+from homeassistant.helpers.json import JSONEncoder
 import homeassistant.util.dt as dt_util
 from homeassistant.util.unit_system import METRIC_SYSTEM
 
@@ -332,6 +334,40 @@ class TestEvent(unittest.TestCase):
         }
         assert expected == event.as_dict()
 
+        # The dict is a copy that can be modified
+        event.as_dict()["data"]["some"] = "other"
+        assert expected == event.as_dict()
+
+        # The read only dict is cached and shared
+        assert expected == event.as_read_only_dict()
+        assert event.as_read_only_dict() is event.as_read_only_dict()
+        with pytest.raises(RuntimeError):
+            event.as_read_only_dict()["data"]["some"] = "other"
+
+    def test_as_json(self):
+        """Test the event is encoded as JSON once and reuses the JSON of states."""
+        state = ha.State("light.kitchen", "on", {"brightness": 100})
+        event = ha.Event(
+            "state_changed",
+            {"entity_id": "light.kitchen", "old_state": None, "new_state": state},
+        )
+
+        assert event.as_json() == json.dumps(event, cls=JSONEncoder)
+        assert event.data_as_json() == json.dumps(event.data, cls=JSONEncoder)
+        assert state.as_json() == json.dumps(state, cls=JSONEncoder)
+
+        with patch("homeassistant.core._json_dumps") as mock_dumps:
+            assert event.as_json() == json.dumps(event, cls=JSONEncoder)
+            assert state.attributes_as_json() == '{"brightness": 100}'
+        assert not mock_dumps.called
+
+    def test_as_json_not_serializable(self):
+        """Test encoding an event that is not valid JSON raises."""
+        event = ha.Event("some_type", {"value": float("nan")})
+
+        with pytest.raises(ValueError):
+            event.as_json()
+
 
 class TestEventBus(unittest.TestCase):
     """Test EventBus methods."""
@@ -518,6 +554,19 @@ def test_state_dict_conversion():
     assert state == ha.State.from_dict(state.as_dict())
 
 
+def test_state_as_read_only_dict():
+    """Test the read only dict of a state is cached and can not be modified."""
+    state = ha.State("domain.hello", "world", {"some": "attr"})
+    assert state.as_read_only_dict() == state.as_dict()
+    assert state.as_read_only_dict() is state.as_read_only_dict()
+
+    with pytest.raises(RuntimeError):
+        state.as_read_only_dict()["attributes"]["some"] = "other"
+
+    state.as_dict()["attributes"]["some"] = "other"
+    assert state.attributes["some"] == "attr"
+
+
 def test_state_dict_conversion_with_wrong_data():
     """Test conversion with wrong data."""
     assert ha.State.from_dict(None) is None
@@ -1,12 +1,23 @@
 """Test to verify that we can load components."""
+from datetime import timedelta
+import os
+import pathlib
+
 import pytest
 
 from homeassistant.components import http, hue
 from homeassistant.components.hue import light as hue_light
 import homeassistant.loader as loader
+import homeassistant.util.dt as dt_util
 
 from tests.async_mock import ANY, patch
-from tests.common import MockModule, async_mock_service, mock_integration
+from tests.common import (
+    MockModule,
+    async_fire_time_changed,
+    async_mock_service,
+    get_test_config_dir,
+    mock_integration,
+)
 
 
 async def test_component_dependencies(hass):
@@ -189,6 +200,52 @@ async def test_get_custom_components_internal(hass):
     assert integrations == {"test": ANY, "test_package": ANY}
 
 
+async def test_get_custom_components_index(hass, hass_storage):
+    """Test unchanged custom manifests are read from the index."""
+    manifest_path = get_test_config_dir(
+        "custom_components", "test_package", "manifest.json"
+    )
+    mtime = os.stat(manifest_path).st_mtime
+    hass_storage[loader.STORAGE_KEY] = {
+        "version": loader.STORAGE_VERSION,
+        "key": loader.STORAGE_KEY,
+        "data": {
+            manifest_path: {
+                "name": "test_package",
+                "mtime": mtime,
+                "manifest": {"domain": "test_package", "name": "Indexed Package"},
+            }
+        },
+    }
+
+    # pylint: disable=protected-access
+    integrations = await loader._async_get_custom_components(hass)
+    assert integrations["test_package"].name == "Indexed Package"
+
+    async_fire_time_changed(
+        hass, dt_util.utcnow() + timedelta(seconds=loader.STORAGE_SAVE_DELAY)
+    )
+    await hass.async_block_till_done()
+
+    index = hass_storage[loader.STORAGE_KEY]["data"]
+    assert {info["name"] for info in index.values()} == {"test", "test_package"}
+
+    index[manifest_path]["mtime"] = mtime - 1
+
+    integrations = await loader._async_get_custom_components(hass)
+    assert integrations["test_package"].name == "Test Package"
+
+
+async def test_get_integration_from_index(hass):
+    """Test built-in integrations are resolved without reading manifests."""
+    with patch.object(loader.Integration, "resolve_from_root") as mock_resolve:
+        integration = await loader.async_get_integration(hass, "hue")
+
+    assert not mock_resolve.called
+    assert integration.domain == "hue"
+    assert integration.file_path == pathlib.Path(hue.__file__).parent
+
+
 def _get_test_integration(hass, name, config_flow):
     """Return a generated test integration."""
     return loader.Integration(
@@ -10,7 +10,11 @@ import voluptuous as vol
 
 from homeassistant import config_entries, setup
 import homeassistant.config as config_util
-from homeassistant.const import EVENT_COMPONENT_LOADED, EVENT_HOMEASSISTANT_START
+from homeassistant.const import (
+    EVENT_COMPONENT_LOADED,
+    EVENT_HOMEASSISTANT_START,
+    EVENT_HOMEASSISTANT_STARTED,
+)
 from homeassistant.core import callback
 from homeassistant.helpers import discovery
 from homeassistant.helpers.config_validation import (
@@ -19,7 +23,7 @@ from homeassistant.helpers.config_validation import (
 )
 import homeassistant.util.dt as dt_util
 
-from tests.async_mock import Mock, patch
+from tests.async_mock import AsyncMock, Mock, patch
 from tests.common import (
     MockConfigEntry,
     MockModule,
@@ -589,3 +593,57 @@ async def test_parallel_entry_setup(hass):
     await setup.async_setup_component(hass, "comp", {})
 
     assert calls == [1, 2, 1, 2]
+
+
+async def test_setup_timings(hass):
+    """Test the time spent in each phase of a setup is recorded."""
+    MockConfigEntry(domain="comp", title="Entry").add_to_hass(hass)
+
+    mock_integration(
+        hass,
+        MockModule(
+            "comp",
+            dependencies=["dep"],
+            async_setup_entry=AsyncMock(return_value=True),
+        ),
+    )
+    mock_integration(hass, MockModule("dep"))
+    mock_entity_platform(hass, "config_flow.comp", None)
+
+    assert await setup.async_setup_component(hass, "comp", {})
+
+    timings = setup.async_get_setup_timings(hass)
+    assert set(timings["comp"]) == {
+        setup.PHASE_DEPENDENCIES,
+        setup.PHASE_IMPORT,
+        setup.PHASE_SETUP,
+        setup.PHASE_SETUP_ENTRY,
+    }
+    assert set(timings["dep"]) == {setup.PHASE_IMPORT, setup.PHASE_SETUP}
+    assert all(seconds >= 0 for seconds in timings["comp"].values())
+
+    trace = setup.async_get_setup_trace(hass)
+    threads = {
+        event["args"]["name"]: event["tid"] for event in trace if event["ph"] == "M"
+    }
+    assert set(threads) == {"comp", "dep"}
+
+    spans = [event for event in trace if event["ph"] == "X"]
+    assert len(spans) == 6
+    entry_span = next(span for span in spans if span["cat"] == setup.PHASE_SETUP_ENTRY)
+    assert entry_span["name"] == "Entry"
+    assert entry_span["tid"] == threads["comp"]
+    assert min(span["ts"] for span in spans) == 0
+
+
+async def test_setup_timings_stop_after_started(hass):
+    """Test setups after Home Assistant has started are not recorded."""
+    mock_integration(hass, MockModule("comp"))
+    mock_integration(hass, MockModule("later"))
+
+    assert await setup.async_setup_component(hass, "comp", {})
+    hass.bus.async_fire(EVENT_HOMEASSISTANT_STARTED)
+    await hass.async_block_till_done()
+
+    assert await setup.async_setup_component(hass, "later", {})
+    assert set(setup.async_get_setup_timings(hass)) == {"comp"}
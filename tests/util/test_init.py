@@ -1,4 +1,5 @@
 """Test Home Assistant util methods."""
+import copy
 from datetime import datetime, timedelta
 
 import pytest
@@ -111,6 +112,27 @@ def test_ordered_enum():
         TestEnum.FIRST >= 1
 
 
+def test_read_only_dict():
+    """Test a read only dict can be read and copied but not modified."""
+    data = util.ReadOnlyDict({"hello": "world"})
+
+    for method, args in (
+        ("__setitem__", ("hello", "there")),
+        ("__delitem__", ("hello",)),
+        ("pop", ("hello",)),
+        ("popitem", ()),
+        ("clear", ()),
+        ("update", ({"hello": "there"},)),
+        ("setdefault", ("new", "value")),
+    ):
+        with pytest.raises(RuntimeError):
+            getattr(data, method)(*args)
+
+    assert data == {"hello": "world"}
+    assert copy.deepcopy(data) == data
+    assert isinstance(copy.copy(data), util.ReadOnlyDict)
+
+
 def test_throttle():
     """Test the add cooldown decorator."""
     calls1 = []
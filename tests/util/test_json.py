@@ -54,6 +54,16 @@ def test_save_and_load():
     assert data == TEST_JSON_A
 
 
+def test_save_and_load_compact():
+    """Test saving compact JSON and loading it back."""
+    fname = _path_for("test_compact")
+    size = save_json(fname, TEST_JSON_A, compact=True)
+    with open(fname) as fdesc:
+        assert "\n" not in fdesc.read()
+    assert os.path.getsize(fname) == size
+    assert load_json(fname) == TEST_JSON_A
+
+
 # Skipped on Windows
 @unittest.skipIf(
     sys.platform.startswith("win"), "private permissions not supported on Windows"